@@ -0,0 +1,198 @@
+import hashlib
+import io
+import os
+import re
+import tempfile
+from collections import OrderedDict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+import anyio
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow is optional; without it only originals are stored
+    Image = None
+
+ROOT_DIR = Path(__file__).parent
+
+ASSET_STORE_DIR = Path(os.environ.get('ASSET_STORE_DIR', str(ROOT_DIR / 'data' / 'assets')))
+ASSET_MAX_UPLOAD_BYTES = int(os.environ.get('ASSET_MAX_UPLOAD_BYTES', str(10 * 1024 * 1024)))
+# Widths precomputed at upload time; requests are served the closest one at or above what they ask for
+ASSET_VARIANT_WIDTHS = sorted(
+    int(width) for width in os.environ.get('ASSET_VARIANT_WIDTHS', '320,640,1280').split(',') if width.strip()
+)
+ASSET_METADATA_CACHE_SIZE = 1024
+
+ALLOWED_CONTENT_TYPES = {"image/jpeg", "image/png", "image/webp", "image/gif", "image/avif", "image/svg+xml"}
+# Pillow format name -> media type, for sniffing uploads rather than trusting the client
+PIL_CONTENT_TYPES = {"JPEG": "image/jpeg", "PNG": "image/png", "WEBP": "image/webp", "GIF": "image/gif"}
+VARIANT_SAVE_OPTIONS = {"JPEG": {"quality": 85, "optimize": True, "progressive": True}, "PNG": {"optimize": True}, "WEBP": {"quality": 80}}
+
+# Content-addressed blobs never change, so clients may keep them forever
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+RANGE_CHUNK_SIZE = 64 * 1024
+
+ASSET_ID_RE = re.compile(r"^[0-9a-f]{64}$")
+
+
+class AssetError(Exception):
+    """Raised for uploads that cannot be stored"""
+
+
+class RangeNotSatisfiable(Exception):
+    pass
+
+
+def blob_path(digest: str, root: Path = ASSET_STORE_DIR) -> Path:
+    # Two levels of fan-out keep directories small
+    return root / digest[:2] / digest[2:4] / digest
+
+
+def write_blob(data: bytes, root: Path = ASSET_STORE_DIR) -> Tuple[str, Path]:
+    """Store bytes under their sha256; an existing blob is left as it is"""
+    digest = hashlib.sha256(data).hexdigest()
+    path = blob_path(digest, root)
+    if not path.exists():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # A unique name per write, so concurrent uploads of the same bytes never share one
+        with tempfile.NamedTemporaryFile(dir=path.parent, prefix=f".{digest}.", suffix=".tmp", delete=False) as temporary:
+            temporary.write(data)
+        try:
+            # Temporary files are created owner-only; blobs are as readable as any other file
+            os.chmod(temporary.name, 0o644)
+            os.replace(temporary.name, path)
+        except OSError:
+            os.unlink(temporary.name)
+            raise
+    return digest, path
+
+
+def _sniff(data: bytes, declared_type: Optional[str]):
+    """Work out the media type and, for raster formats Pillow reads, the opened image"""
+    if Image is not None:
+        try:
+            image = Image.open(io.BytesIO(data))
+            image.load()
+        except Exception:
+            image = None
+        if image is not None and image.format in PIL_CONTENT_TYPES:
+            return PIL_CONTENT_TYPES[image.format], image
+    if declared_type in ALLOWED_CONTENT_TYPES and (Image is None or declared_type in ("image/svg+xml", "image/avif")):
+        return declared_type, None
+    raise AssetError("Unsupported image type")
+
+
+def _render_variants(image, image_format: str, root: Path) -> List[Dict[str, Any]]:
+    # Animated images would lose their frames
+    if getattr(image, "is_animated", False):
+        return []
+
+    variants = []
+    for width in ASSET_VARIANT_WIDTHS:
+        if width >= image.width:
+            break
+        height = max(1, round(image.height * width / image.width))
+        resized = image.resize((width, height), Image.LANCZOS)
+        if image_format == "JPEG" and resized.mode not in ("RGB", "L"):
+            resized = resized.convert("RGB")
+        buffer = io.BytesIO()
+        resized.save(buffer, format=image_format, **VARIANT_SAVE_OPTIONS.get(image_format, {}))
+        digest, _ = write_blob(buffer.getvalue(), root)
+        variants.append({"width": width, "height": height, "size": buffer.tell(), "sha256": digest})
+    return variants
+
+
+def store_asset(data: bytes, filename: Optional[str], declared_type: Optional[str], root: Path = ASSET_STORE_DIR) -> Dict[str, Any]:
+    """Write an upload and its width variants to disk and return its metadata document
+
+    CPU- and disk-bound, so callers run it in a worker thread.
+    """
+    if not data:
+        raise AssetError("Empty upload")
+    content_type, image = _sniff(data, declared_type)
+    digest, _ = write_blob(data, root)
+
+    document = {
+        "id": digest,
+        "contentType": content_type,
+        "size": len(data),
+        "filename": filename,
+        "width": image.width if image is not None else None,
+        "height": image.height if image is not None else None,
+        "variants": _render_variants(image, image.format, root) if image is not None else [],
+        "createdAt": datetime.utcnow(),
+    }
+    return document
+
+
+def select_blob(asset: Dict[str, Any], width: Optional[int]) -> Tuple[str, int]:
+    """Smallest stored rendition at least `width` wide, falling back to the original"""
+    if width:
+        for variant in asset.get("variants", []):
+            if variant["width"] >= width:
+                return variant["sha256"], variant["size"]
+    return asset["id"], asset["size"]
+
+
+def parse_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """Parse a single `bytes=` range into inclusive (start, end)
+
+    Returns None when the whole file should be sent: no header, a unit we do not
+    know, or a multi-range request (which may be answered in full).
+    """
+    if not header:
+        return None
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    first, _, last = spec.strip().partition("-")
+    try:
+        if first == "":
+            suffix = int(last)
+            if suffix <= 0:
+                raise RangeNotSatisfiable()
+            return max(size - suffix, 0), size - 1
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+    except ValueError:
+        return None
+    if start >= size or start > end:
+        raise RangeNotSatisfiable()
+    return start, end
+
+
+async def read_range(path: Path, start: int, end: int) -> AsyncIterator[bytes]:
+    async with await anyio.open_file(path, "rb") as file:
+        await file.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = await file.read(min(RANGE_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+class AssetMetadataCache:
+    """LRU of asset metadata; documents are immutable once written, so entries never go stale"""
+
+    def __init__(self, size: int = ASSET_METADATA_CACHE_SIZE):
+        self.size = size
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+    def get(self, asset_id: str) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(asset_id)
+        if entry is not None:
+            self._entries.move_to_end(asset_id)
+        return entry
+
+    def set(self, asset_id: str, asset: Dict[str, Any]) -> None:
+        self._entries[asset_id] = asset
+        self._entries.move_to_end(asset_id)
+        if len(self._entries) > self.size:
+            self._entries.popitem(last=False)
+
+
+asset_metadata = AssetMetadataCache()
@@ -0,0 +1,561 @@
+#!/usr/bin/env python3
+"""Concurrent load and latency benchmark for the Portfolio API.
+
+By default the app runs in-process (httpx ASGI transport, lifespan included) against
+an in-memory Mongo stand-in (mongomock-motor), so no deployment is needed:
+
+    python benchmarks/load.py --workload read-heavy --concurrency 32 --duration 10
+    python benchmarks/load.py --workload mixed --output run.json
+    python benchmarks/load.py --workload mixed --baseline run.json --tolerance 0.2
+
+Use --mongo-url to run against a real local mongod, or --base-url to drive an
+already running server over HTTP. The result is the only thing written to
+stdout, as JSON (seeding and app output go to stderr), so it can be piped to jq.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import logging
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# Weighted operation mixes. "mixed" covers every route except the maintenance
+# endpoints (counter and rollup rebuilds) and tenant deletion.
+WORKLOADS: Dict[str, List[Tuple[str, float]]] = {
+    "read-heavy": [
+        ("get_portfolio", 70), ("get_portfolio_revalidate", 15), ("get_portfolio_section", 10),
+        ("health", 3), ("submit_contact", 2),
+    ],
+    "contact-burst": [
+        ("submit_contact", 95), ("get_portfolio", 5),
+    ],
+    "admin-paging": [
+        ("page_contacts", 50), ("list_contacts_legacy", 20), ("update_contact_status", 20),
+        ("contact_buffer_stats", 10),
+    ],
+    "tenants": [
+        ("get_tenant_portfolio", 60), ("get_tenant_section", 25), ("submit_tenant_contact", 10),
+        ("update_tenant_portfolio", 3), ("list_tenant_contacts", 2),
+    ],
+    "mixed": [
+        ("get_portfolio", 40), ("get_portfolio_revalidate", 10), ("get_portfolio_section", 10),
+        ("search_portfolio", 3), ("submit_contact", 10), ("page_contacts", 8), ("list_contacts_legacy", 4),
+        ("update_contact_status", 4), ("bulk_update_contact_status", 1), ("export_contacts", 0.5),
+        ("contact_stats", 1), ("contact_events", 0.5), ("contact_admin_stats", 1), ("create_status", 5),
+        ("list_status", 3), ("status_rollups", 1), ("health", 3), ("metrics", 0.5), ("update_portfolio", 1),
+        ("create_portfolio", 1), ("add_portfolio_item", 0.5), ("update_portfolio_item", 0.5),
+        ("delete_portfolio_item", 0.5), ("upload_asset", 0.5), ("get_asset", 3), ("get_asset_info", 1),
+        ("create_tenant_portfolio", 0.2), ("get_tenant_portfolio", 4), ("get_tenant_section", 2),
+        ("update_tenant_portfolio", 0.5), ("submit_tenant_contact", 1), ("list_tenant_contacts", 0.5),
+    ],
+}
+
+SECTIONS = ["personal", "skills", "projects", "experience", "certifications", "achievements", "codingProfiles"]
+STATUSES = ["new", "read", "responded"]
+SEARCH_TERMS = ["react", "python", "api", "machine learning", "cloud", "data"]
+TENANTS = [f"bench-{n}" for n in range(5)]
+
+
+class State:
+    """Shared data the operations draw from (ids, cursors, validators)"""
+
+    def __init__(self, rng: random.Random):
+        self.rng = rng
+        self.etag: Optional[str] = None
+        self.portfolio: Optional[dict] = None
+        self.submission_ids: List[str] = []
+        self.cursor: str = ""
+        self.item_ids: List[int] = []
+        self.asset_ids: List[str] = []
+        self.tenants: List[str] = []
+        # Set when running in-process, where streams are driven over raw ASGI
+        self.app = None
+
+
+async def op_get_portfolio(client, state):
+    response = await client.get("/api/portfolio", headers={"Accept-Encoding": "gzip, br"})
+    if response.status_code == 200:
+        state.etag = response.headers.get("etag")
+    return response
+
+
+async def op_get_portfolio_revalidate(client, state):
+    headers = {"Accept-Encoding": "gzip, br"}
+    if state.etag:
+        headers["If-None-Match"] = state.etag
+    return await client.get("/api/portfolio", headers=headers)
+
+
+async def op_get_portfolio_section(client, state):
+    return await client.get(f"/api/portfolio/{state.rng.choice(SECTIONS)}")
+
+
+async def op_health(client, state):
+    return await client.get("/api/")
+
+
+async def op_submit_contact(client, state):
+    n = state.rng.randrange(1_000_000)
+    response = await client.post("/api/contact", json={
+        "name": f"Load Tester {n}",
+        "email": f"load{n}@example.com",
+        "subject": "Benchmark",
+        "message": f"Benchmark message {n} " * 5,
+    })
+    if response.status_code == 200:
+        state.submission_ids.append(response.json()["id"])
+    return response
+
+
+async def op_page_contacts(client, state):
+    response = await client.get("/api/contact", params={"cursor": state.cursor, "limit": 50})
+    if response.status_code == 200:
+        # Walk forward and wrap around at the end
+        state.cursor = response.json().get("next_cursor") or ""
+    return response
+
+
+async def op_list_contacts_legacy(client, state):
+    skip = state.rng.randrange(0, max(len(state.submission_ids), 1))
+    return await client.get("/api/contact", params={"limit": 50, "skip": skip})
+
+
+async def op_update_contact_status(client, state):
+    if not state.submission_ids:
+        return await op_submit_contact(client, state)
+    submission_id = state.rng.choice(state.submission_ids)
+    return await client.put(f"/api/contact/{submission_id}", params={"status": state.rng.choice(STATUSES)})
+
+
+async def op_contact_buffer_stats(client, state):
+    return await client.get("/api/contact/buffer")
+
+
+async def op_create_status(client, state):
+    return await client.post("/api/status", json={"client_name": f"probe-{state.rng.randrange(10)}"})
+
+
+async def op_list_status(client, state):
+    return await client.get("/api/status")
+
+
+async def op_update_portfolio(client, state):
+    tagline = f"Benchmark tagline {state.rng.randrange(1_000_000)}"
+    personal = dict(state.portfolio["personal"], tagline=tagline)
+    return await client.put("/api/portfolio", json={"personal": personal})
+
+
+async def op_create_portfolio(client, state):
+    payload = {key: state.portfolio[key] for key in ["personal", "socialLinks"] + SECTIONS if key in state.portfolio}
+    response = await client.post("/api/portfolio", json=payload)
+    if response.status_code == 200:
+        # The new version is built from the seed, without the items added since
+        state.item_ids.clear()
+    return response
+
+
+async def op_search_portfolio(client, state):
+    return await client.get("/api/portfolio/search", params={"q": state.rng.choice(SEARCH_TERMS)})
+
+
+async def op_bulk_update_contact_status(client, state):
+    if not state.submission_ids:
+        return await op_submit_contact(client, state)
+    ids = state.rng.sample(state.submission_ids, min(20, len(state.submission_ids)))
+    return await client.post("/api/contact/bulk-status", json={
+        "updates": [{"id": submission_id, "status": state.rng.choice(STATUSES)} for submission_id in ids]
+    })
+
+
+async def op_export_contacts(client, state):
+    # The whole export is read, as a real download would be
+    return await client.get("/api/contact/export", params={"format": state.rng.choice(["ndjson", "csv"])})
+
+
+async def op_contact_stats(client, state):
+    return await client.get("/api/contact/stats", params={"granularity": state.rng.choice(["day", "hour"])})
+
+
+async def op_contact_admin_stats(client, state):
+    path = state.rng.choice(["buffer", "dedupe", "limits", "events/stats"])
+    return await client.get(f"/api/contact/{path}")
+
+
+async def _open_event_stream_asgi(app, path: str) -> httpx.Response:
+    """Connect to an SSE route, wait for its first chunk and disconnect
+
+    httpx's ASGI transport only returns once the app finishes, which an event
+    stream never does, so the in-process run speaks ASGI directly.
+    """
+    first_chunk = asyncio.get_running_loop().create_future()
+    disconnected = asyncio.Event()
+    status = 500
+
+    async def receive():
+        await disconnected.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+        elif message["type"] == "http.response.body" and not first_chunk.done():
+            first_chunk.set_result(status)
+
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET", "scheme": "http",
+        "path": path, "raw_path": path.encode(), "root_path": "", "query_string": b"",
+        "headers": [(b"host", b"benchmark")], "client": ("127.0.0.1", 0), "server": ("benchmark", 80),
+    }
+    task = asyncio.create_task(app(scope, receive, send))
+    await asyncio.wait([first_chunk, task], return_when=asyncio.FIRST_COMPLETED)
+    disconnected.set()
+    await task
+    return httpx.Response(first_chunk.result() if first_chunk.done() else status)
+
+
+async def op_contact_events(client, state):
+    if state.app is not None:
+        return await _open_event_stream_asgi(state.app, "/api/contact/events")
+    async with client.stream("GET", "/api/contact/events") as response:
+        async for _ in response.aiter_bytes():
+            break
+        return response
+
+
+async def op_status_rollups(client, state):
+    return await client.get("/api/status/rollups", params={"granularity": state.rng.choice(["minute", "hour"])})
+
+
+async def op_metrics(client, state):
+    return await client.get("/api/metrics")
+
+
+def _project(item_id: int) -> dict:
+    return {
+        "id": item_id, "title": f"Benchmark project {item_id}", "description": "Benchmark",
+        "longDescription": "Benchmark project " * 10, "image": "https://example.com/project.png",
+        "tags": ["benchmark"], "liveUrl": "https://example.com", "githubUrl": "https://example.com", "featured": False,
+    }
+
+
+async def op_add_portfolio_item(client, state):
+    item_id = 1_000_000 + state.rng.randrange(1_000_000)
+    response = await client.post("/api/portfolio/projects/items", json=_project(item_id))
+    if response.status_code == 201:
+        state.item_ids.append(item_id)
+    return response
+
+
+async def op_update_portfolio_item(client, state):
+    if not state.item_ids:
+        return await op_add_portfolio_item(client, state)
+    item_id = state.rng.choice(state.item_ids)
+    return await client.patch(f"/api/portfolio/projects/items/{item_id}", json={"featured": state.rng.random() < 0.5})
+
+
+async def op_delete_portfolio_item(client, state):
+    if not state.item_ids:
+        return await op_add_portfolio_item(client, state)
+    item_id = state.item_ids.pop(state.rng.randrange(len(state.item_ids)))
+    return await client.delete(f"/api/portfolio/projects/items/{item_id}")
+
+
+def _svg(n: int) -> bytes:
+    return f'<svg xmlns="http://www.w3.org/2000/svg" width="64" height="64"><text y="32">{n}</text></svg>'.encode()
+
+
+async def op_upload_asset(client, state):
+    # A small pool of contents, so repeats exercise the already-stored path too
+    n = state.rng.randrange(50)
+    response = await client.post("/api/assets", files={"file": (f"bench-{n}.svg", _svg(n), "image/svg+xml")})
+    if response.status_code in (200, 201):
+        state.asset_ids.append(response.json()["id"])
+    return response
+
+
+async def op_get_asset(client, state):
+    if not state.asset_ids:
+        return await op_upload_asset(client, state)
+    asset_id = state.rng.choice(state.asset_ids)
+    headers = {"Range": "bytes=0-31"} if state.rng.random() < 0.2 else {}
+    return await client.get(f"/api/assets/{asset_id}", params={"w": state.rng.choice([320, 640])}, headers=headers)
+
+
+async def op_get_asset_info(client, state):
+    if not state.asset_ids:
+        return await op_upload_asset(client, state)
+    return await client.get(f"/api/assets/{state.rng.choice(state.asset_ids)}/info")
+
+
+def _tenant_payload(state, slug: str) -> dict:
+    payload = {key: state.portfolio[key] for key in ["personal", "socialLinks"] + SECTIONS if key in state.portfolio}
+    return {**payload, "slug": slug}
+
+
+async def op_create_tenant_portfolio(client, state):
+    slug = f"bench-new-{state.rng.randrange(1_000_000)}"
+    response = await client.post("/api/portfolios", json=_tenant_payload(state, slug))
+    if response.status_code == 201:
+        state.tenants.append(slug)
+    return response
+
+
+async def op_get_tenant_portfolio(client, state):
+    return await client.get(f"/api/portfolios/{state.rng.choice(state.tenants)}", headers={"Accept-Encoding": "gzip, br"})
+
+
+async def op_get_tenant_section(client, state):
+    return await client.get(f"/api/portfolios/{state.rng.choice(state.tenants)}/{state.rng.choice(SECTIONS)}")
+
+
+async def op_update_tenant_portfolio(client, state):
+    tagline = f"Benchmark tagline {state.rng.randrange(1_000_000)}"
+    personal = dict(state.portfolio["personal"], tagline=tagline)
+    return await client.put(f"/api/portfolios/{state.rng.choice(state.tenants)}", json={"personal": personal})
+
+
+async def op_submit_tenant_contact(client, state):
+    n = state.rng.randrange(1_000_000)
+    return await client.post(f"/api/portfolios/{state.rng.choice(state.tenants)}/contact", json={
+        "name": f"Load Tester {n}",
+        "email": f"load{n}@example.com",
+        "subject": "Benchmark",
+        "message": f"Benchmark message {n} " * 5,
+    })
+
+
+async def op_list_tenant_contacts(client, state):
+    return await client.get(f"/api/portfolios/{state.rng.choice(state.tenants)}/contact", params={"cursor": "", "limit": 50})
+
+
+OPERATIONS: Dict[str, Callable] = {
+    name[3:]: func for name, func in globals().items() if name.startswith("op_")
+}
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(int(round(pct / 100 * len(sorted_values) + 0.5)) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+def summarize(latencies: List[float], errors: int, elapsed: float) -> Dict[str, Any]:
+    values = sorted(latencies)
+    return {
+        "requests": len(values),
+        "errors": errors,
+        "throughput_rps": round(len(values) / elapsed, 2) if elapsed else 0.0,
+        "mean_ms": round(sum(values) / len(values) * 1000, 3) if values else 0.0,
+        "p50_ms": round(percentile(values, 50) * 1000, 3),
+        "p95_ms": round(percentile(values, 95) * 1000, 3),
+        "p99_ms": round(percentile(values, 99) * 1000, 3),
+        "max_ms": round(values[-1] * 1000, 3) if values else 0.0,
+    }
+
+
+async def seed_tenants(client: httpx.AsyncClient, state: State) -> None:
+    """Make sure the benchmark tenant portfolios exist"""
+    for slug in TENANTS:
+        response = await client.post("/api/portfolios", json=_tenant_payload(state, slug))
+        if response.status_code not in (201, 409):
+            response.raise_for_status()
+        state.tenants.append(slug)
+
+
+async def seed(client: httpx.AsyncClient, state: State, submissions: int) -> None:
+    """Make sure portfolios exist and pre-populate contact submissions for paging"""
+    response = await client.get("/api/portfolio")
+    if response.status_code == 404:
+        import seed_data
+        await seed_data.seed_portfolio_data()
+        response = await client.get("/api/portfolio")
+    response.raise_for_status()
+    state.portfolio = response.json()
+    state.etag = response.headers.get("etag")
+
+    from database import get_database
+    db = await get_database()
+    now = datetime.utcnow()
+    docs = [
+        {
+            "id": f"bench-{i}",
+            "name": f"Seeded {i}",
+            "email": f"seeded{i}@example.com",
+            "subject": "Seeded",
+            "message": "Seeded message",
+            "submittedAt": now - timedelta(seconds=i),
+            "status": STATUSES[i % 3],
+        }
+        for i in range(submissions)
+    ]
+    for start in range(0, len(docs), 1000):
+        await db.contact_submissions.insert_many(docs[start:start + 1000])
+    state.submission_ids.extend(doc["id"] for doc in docs)
+    await seed_tenants(client, state)
+
+
+async def run_workload(
+    client: httpx.AsyncClient,
+    state: State,
+    workload: str,
+    concurrency: int,
+    duration: float,
+    max_requests: Optional[int],
+) -> Dict[str, Any]:
+    names, weights = zip(*WORKLOADS[workload])
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    errors: Dict[str, int] = defaultdict(int)
+    issued = 0
+    deadline = time.perf_counter() + duration
+
+    async def worker() -> None:
+        nonlocal issued
+        while time.perf_counter() < deadline and (max_requests is None or issued < max_requests):
+            issued += 1
+            name = state.rng.choices(names, weights)[0]
+            started = time.perf_counter()
+            try:
+                response = await OPERATIONS[name](client, state)
+                failed = response.status_code >= 400
+            except httpx.HTTPError:
+                failed = True
+            latencies[name].append(time.perf_counter() - started)
+            if failed:
+                errors[name] += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    all_latencies = [value for values in latencies.values() for value in values]
+    return {
+        "workload": workload,
+        "concurrency": concurrency,
+        "elapsed_s": round(elapsed, 3),
+        "overall": summarize(all_latencies, sum(errors.values()), elapsed),
+        "operations": {name: summarize(latencies[name], errors[name], elapsed) for name in sorted(latencies)},
+    }
+
+
+@asynccontextmanager
+async def in_process_client(mongo_url: Optional[str], db_name: str):
+    """Run the app in-process with its lifespan, backed by mongomock or a local mongod"""
+    if mongo_url is not None:
+        os.environ["MONGO_URL"] = mongo_url
+    os.environ["DB_NAME"] = db_name
+    # Every request comes from one client here; measure the app, not the rate limiter
+    os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+    # Uploaded benchmark assets are thrown away afterwards
+    asset_dir = tempfile.mkdtemp(prefix="portfolio-benchmark-assets-")
+    os.environ.setdefault("ASSET_STORE_DIR", asset_dir)
+
+    import database
+    if mongo_url is None:
+        from mongomock_motor import AsyncMongoMockClient
+        database.connect(AsyncMongoMockClient())
+    else:
+        database.connect()
+
+    from server import app
+    try:
+        async with app.router.lifespan_context(app):
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+                yield client
+            if mongo_url is not None:
+                await database.client.drop_database(db_name)
+    finally:
+        shutil.rmtree(asset_dir, ignore_errors=True)
+
+
+def compare_to_baseline(result: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """List p95/p99 regressions beyond the tolerance (e.g. 0.2 = 20% slower)"""
+    regressions = []
+    for name, current in [("overall", result["overall"])] + list(result["operations"].items()):
+        previous = baseline["overall"] if name == "overall" else baseline.get("operations", {}).get(name)
+        if not previous:
+            continue
+        for metric in ("p95_ms", "p99_ms"):
+            if previous[metric] and current[metric] > previous[metric] * (1 + tolerance):
+                regressions.append(f"{name} {metric}: {previous[metric]} -> {current[metric]}")
+    return regressions
+
+
+async def main(args: argparse.Namespace) -> int:
+    # Per-request client logging would dominate the measurement
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    state = State(random.Random(args.seed))
+
+    if args.base_url:
+        client_context = httpx.AsyncClient(base_url=args.base_url, timeout=30)
+    else:
+        client_context = in_process_client(args.mongo_url, args.db_name)
+
+    # Keep stdout for the JSON result; seeding and the app may print along the way
+    with contextlib.redirect_stdout(sys.stderr):
+        async with client_context as client:
+            if args.base_url:
+                response = await client.get("/api/portfolio")
+                response.raise_for_status()
+                state.portfolio = response.json()
+                await seed_tenants(client, state)
+            else:
+                from server import app
+                state.app = app
+                await seed(client, state, args.submissions)
+
+            if args.warmup:
+                await run_workload(client, state, args.workload, args.concurrency, args.warmup, None)
+            result = await run_workload(client, state, args.workload, args.concurrency, args.duration, args.requests)
+
+    result["target"] = args.base_url or ("mongomock" if args.mongo_url is None else args.mongo_url)
+    result["timestamp"] = datetime.utcnow().isoformat()
+
+    output = json.dumps(result, indent=2)
+    if args.output:
+        Path(args.output).write_text(output + "\n")
+    print(output)
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text())
+        regressions = compare_to_baseline(result, baseline, args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load and latency benchmark for the Portfolio API")
+    parser.add_argument("--workload", choices=sorted(WORKLOADS), default="read-heavy")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds to run the measured phase")
+    parser.add_argument("--warmup", type=float, default=1.0, help="seconds of unmeasured warm-up")
+    parser.add_argument("--requests", type=int, default=None, help="stop after this many requests")
+    parser.add_argument("--submissions", type=int, default=5000, help="contact submissions to pre-seed")
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--mongo-url", default=None, help="use a real mongod instead of mongomock")
+    parser.add_argument("--db-name", default="portfolio_benchmark")
+    parser.add_argument("--base-url", default=None, help="benchmark a running server instead of in-process")
+    parser.add_argument("--output", default=None, help="also write the JSON result to this file")
+    parser.add_argument("--baseline", default=None, help="previous JSON result to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    sys.exit(asyncio.run(main(parser.parse_args())))
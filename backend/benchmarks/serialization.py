@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""Microbenchmark: per-request CPU of the old response_model path vs pre-serialized bytes.
+
+Run from the backend directory:
+
+    python benchmarks/serialization.py --projects 50 --submissions 100
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from cache import CachedPortfolio
+from models.portfolio import ContactSubmission, PortfolioData
+from serialization import json_response, to_json_bytes
+
+
+def sample_portfolio_doc(projects: int) -> dict:
+    """Build a Mongo-shaped portfolio document with the given number of projects"""
+    portfolio = PortfolioData(
+        personal={
+            "name": "Benchmark User", "title": "Engineer", "tagline": "Fast things",
+            "description": "A portfolio used for benchmarking " * 4, "email": "bench@example.com",
+            "phone": "+1 555 0100", "location": "Earth", "avatar": "https://example.com/avatar.png",
+        },
+        socialLinks={
+            "github": "https://github.com/bench", "linkedin": "https://linkedin.com/in/bench",
+            "geeksforgeeks": "https://geeksforgeeks.org/user/bench", "leetcode": "https://leetcode.com/bench",
+        },
+        skills=[
+            {"category": f"Category {c}", "items": [{"name": f"Skill {c}.{i}", "level": 80, "icon": "*"} for i in range(8)]}
+            for c in range(4)
+        ],
+        projects=[
+            {
+                "id": i, "title": f"Project {i}", "description": "Short description " * 3,
+                "longDescription": "A much longer description of the project " * 8,
+                "image": f"https://example.com/{i}.png", "tags": ["Python", "React", "MongoDB"],
+                "liveUrl": "https://example.com", "githubUrl": "https://github.com/bench/x", "featured": i % 3 == 0,
+            }
+            for i in range(projects)
+        ],
+        experience=[
+            {
+                "id": i, "title": "Engineer", "company": f"Company {i}", "duration": "2020 - 2022",
+                "location": "Remote", "description": "Did things " * 5, "achievements": ["Shipped"] * 4,
+            }
+            for i in range(4)
+        ],
+        certifications=[
+            {"id": i, "title": f"Cert {i}", "issuer": "Issuer", "date": "2024", "image": "https://example.com/c.png", "credentialId": f"C-{i}"}
+            for i in range(6)
+        ],
+        achievements=[
+            {"id": i, "title": f"Achievement {i}", "description": "Won something", "icon": "*", "date": "2024"}
+            for i in range(6)
+        ],
+        codingProfiles=[
+            {"platform": "GitHub", "username": "bench", "stats": {"repositories": 50, "stars": 100}, "icon": "*", "url": "https://github.com/bench"}
+        ],
+    )
+    return portfolio.model_dump()
+
+
+def sample_submission_docs(count: int) -> List[dict]:
+    return [
+        ContactSubmission(name=f"Sender {i}", email=f"sender{i}@example.com", subject="Hello", message="Message body " * 10).model_dump()
+        for i in range(count)
+    ]
+
+
+def measure(label: str, func, iterations: int) -> float:
+    func()  # warm up
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    per_call_us = (time.perf_counter() - start) / iterations * 1e6
+    print(f"  {label:<44} {per_call_us:10.1f} us/request")
+    return per_call_us
+
+
+def compare(title: str, response_type, build, cached_body: bytes, iterations: int) -> None:
+    """Old path: build models, re-validate via response_model, render with stdlib JSON"""
+    field = create_response_field(name="response", type_=response_type)
+    loop = asyncio.new_event_loop()
+
+    def legacy():
+        content = loop.run_until_complete(serialize_response(field=field, response_content=build()))
+        return JSONResponse(content).body
+
+    def fast_uncached():
+        return json_response(to_json_bytes(build())).body
+
+    def fast_cached():
+        return json_response(cached_body).body
+
+    print(title)
+    legacy_us = measure("response_model + JSONResponse", legacy, iterations)
+    uncached_us = measure("validate once + to_json_bytes", fast_uncached, iterations)
+    cached_us = measure("cached bytes", fast_cached, iterations)
+    print(f"  saved per request: {legacy_us - uncached_us:.1f} us uncached, {legacy_us - cached_us:.1f} us cached")
+    loop.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--projects", type=int, default=20)
+    parser.add_argument("--submissions", type=int, default=100)
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    portfolio_doc = sample_portfolio_doc(args.projects)
+    cached = CachedPortfolio(PortfolioData(**portfolio_doc))
+    print(f"portfolio payload: {len(cached.body)} bytes")
+    compare("GET /api/portfolio", PortfolioData, lambda: PortfolioData(**portfolio_doc), cached.body, args.iterations)
+
+    submission_docs = sample_submission_docs(args.submissions)
+    compare(
+        f"GET /api/contact ({args.submissions} submissions)",
+        List[ContactSubmission],
+        lambda: [ContactSubmission(**doc) for doc in submission_docs],
+        to_json_bytes([ContactSubmission(**doc) for doc in submission_docs]),
+        max(args.iterations // 10, 1),
+    )
+
+
+if __name__ == "__main__":
+    main()
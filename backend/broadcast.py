@@ -0,0 +1,160 @@
+import asyncio
+import logging
+import os
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Deque, List, Optional, Set, Tuple
+
+from serialization import to_json_bytes
+
+logger = logging.getLogger(__name__)
+
+# Events buffered per subscriber before it is considered too slow and disconnected
+CONTACT_EVENTS_QUEUE_SIZE = int(os.environ.get('CONTACT_EVENTS_QUEUE_SIZE', '100'))
+# Recent events kept for clients resuming with Last-Event-ID
+CONTACT_EVENTS_HISTORY = int(os.environ.get('CONTACT_EVENTS_HISTORY', '500'))
+CONTACT_EVENTS_HEARTBEAT_SECONDS = float(os.environ.get('CONTACT_EVENTS_HEARTBEAT_SECONDS', '15'))
+CONTACT_EVENTS_MAX_SUBSCRIBERS = int(os.environ.get('CONTACT_EVENTS_MAX_SUBSCRIBERS', '100'))
+# Reconnect delay suggested to EventSource clients
+CONTACT_EVENTS_RETRY_MS = 3000
+
+_CLOSE = object()
+
+
+class TooManySubscribers(Exception):
+    pass
+
+
+def format_event(event_id: Optional[str], event: str, data: bytes) -> bytes:
+    lines = []
+    if event_id is not None:
+        lines.append(b"id: " + event_id.encode())
+    lines.append(b"event: " + event.encode())
+    lines.append(b"data: " + data)
+    return b"\n".join(lines) + b"\n\n"
+
+
+class Subscriber:
+    def __init__(self, queue_size: int):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+
+
+class EventBroadcaster:
+    """In-process fan-out of events to streaming subscribers
+
+    Each event is serialized once and put on every subscriber's bounded queue
+    without awaiting; a subscriber whose queue is full is disconnected instead of
+    buffering without limit, and picks up where it left off when it reconnects
+    with Last-Event-ID. Event ids carry a per-process epoch, so an id from before
+    a restart (or from another worker) is answered with a `reset` event telling
+    the client to reload.
+    """
+
+    def __init__(
+        self,
+        queue_size: int = CONTACT_EVENTS_QUEUE_SIZE,
+        history: int = CONTACT_EVENTS_HISTORY,
+        heartbeat_seconds: float = CONTACT_EVENTS_HEARTBEAT_SECONDS,
+        max_subscribers: int = CONTACT_EVENTS_MAX_SUBSCRIBERS,
+    ):
+        self.queue_size = queue_size
+        self.heartbeat_seconds = heartbeat_seconds
+        self.max_subscribers = max_subscribers
+        self.epoch = str(int(time.time() * 1000))
+        self._sequence = 0
+        self._history: Deque[Tuple[int, bytes]] = deque(maxlen=history)
+        self._subscribers: Set[Subscriber] = set()
+        self.published = 0
+        self.dropped = 0
+        self.resumed = 0
+        self.resets = 0
+
+    def publish(self, event: str, data: Any) -> None:
+        """Send an event to every subscriber; never blocks the publisher"""
+        self._sequence += 1
+        message = format_event(f"{self.epoch}-{self._sequence}", event, to_json_bytes(data))
+        self._history.append((self._sequence, message))
+        self.published += 1
+
+        for subscriber in list(self._subscribers):
+            try:
+                subscriber.queue.put_nowait(message)
+            except asyncio.QueueFull:
+                self._drop(subscriber)
+
+    def _drop(self, subscriber: Subscriber) -> None:
+        # Make room for the close marker; the client resumes from history on reconnect
+        self._subscribers.discard(subscriber)
+        self.dropped += 1
+        while not subscriber.queue.empty():
+            subscriber.queue.get_nowait()
+        subscriber.queue.put_nowait(_CLOSE)
+
+    def _backlog(self, last_event_id: Optional[str]) -> Tuple[List[bytes], bool]:
+        """Events after `last_event_id`, or a reset when they are no longer all available"""
+        if not last_event_id:
+            return [], False
+        epoch, _, sequence = last_event_id.partition("-")
+        try:
+            sequence = int(sequence)
+        except ValueError:
+            return [], True
+        if epoch != self.epoch or sequence > self._sequence:
+            return [], True
+        oldest = self._history[0][0] if self._history else self._sequence + 1
+        if sequence + 1 < oldest:
+            return [], True
+        return [message for event_sequence, message in self._history if event_sequence > sequence], False
+
+    def subscribe(self, last_event_id: Optional[str] = None) -> Tuple[Subscriber, List[bytes]]:
+        """Register a subscriber along with what it missed; no await in between, so nothing slips through
+
+        A subscriber left behind by a client that never started reading is
+        cleaned up the first time its queue overflows.
+        """
+        if len(self._subscribers) >= self.max_subscribers:
+            raise TooManySubscribers()
+        backlog, reset = self._backlog(last_event_id)
+        if reset:
+            self.resets += 1
+            backlog = [format_event(f"{self.epoch}-{self._sequence}", "reset", b"{}")]
+        elif backlog:
+            self.resumed += 1
+        subscriber = Subscriber(self.queue_size)
+        self._subscribers.add(subscriber)
+        return subscriber, backlog
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        self._subscribers.discard(subscriber)
+
+    async def stream(self, subscriber: Subscriber, backlog: List[bytes]) -> AsyncIterator[bytes]:
+        """SSE body for one subscription: missed events, then live ones with heartbeats in between"""
+        try:
+            yield f"retry: {CONTACT_EVENTS_RETRY_MS}\n\n".encode()
+            for message in backlog:
+                yield message
+            while True:
+                try:
+                    message = await asyncio.wait_for(subscriber.queue.get(), self.heartbeat_seconds)
+                except asyncio.TimeoutError:
+                    # Comment line keeps proxies from timing out an idle stream
+                    yield b": heartbeat\n\n"
+                    continue
+                if message is _CLOSE:
+                    return
+                yield message
+        finally:
+            self.unsubscribe(subscriber)
+
+    def stats(self):
+        return {
+            "subscribers": len(self._subscribers),
+            "published": self.published,
+            "dropped": self.dropped,
+            "resumed": self.resumed,
+            "resets": self.resets,
+            "lastEventId": f"{self.epoch}-{self._sequence}",
+        }
+
+
+contact_events = EventBroadcaster()
@@ -0,0 +1,259 @@
+import asyncio
+import os
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+from compression import SUPPORTED_ENCODINGS, compress
+from conditional import http_date, make_etag
+from models.portfolio import PORTFOLIO_SECTIONS, PortfolioData
+from serialization import to_json_bytes
+
+# Safety net for changes made outside this process (other workers, manual edits)
+PORTFOLIO_CACHE_TTL_SECONDS = float(os.environ.get('PORTFOLIO_CACHE_TTL_SECONDS', '30'))
+# Bounds on the tenant portfolio LRU; bytes count the serialized and compressed payloads held
+TENANT_CACHE_MAX_ENTRIES = int(os.environ.get('TENANT_CACHE_MAX_ENTRIES', '1000'))
+TENANT_CACHE_MAX_BYTES = int(os.environ.get('TENANT_CACHE_MAX_BYTES', str(64 * 1024 * 1024)))
+
+
+def portfolio_version(updated_at: datetime) -> datetime:
+    """Normalize an updatedAt timestamp to the millisecond precision Mongo stores"""
+    return updated_at.replace(microsecond=updated_at.microsecond // 1000 * 1000)
+
+
+class CachedPortfolio:
+    __slots__ = ("portfolio", "version", "etag", "last_modified", "body", "section_bodies", "encoded_bodies", "loaded_at", "size", "_precompressing")
+
+    def __init__(self, portfolio: PortfolioData):
+        self.portfolio = portfolio
+        self.version = portfolio_version(portfolio.updatedAt)
+        self.etag = make_etag(portfolio.id, self.version)
+        self.last_modified = http_date(self.version)
+        # Serialized once per version and served as-is on every hit
+        self.body = to_json_bytes(portfolio)
+        self.section_bodies: Dict[str, bytes] = {}
+        self.encoded_bodies: Dict[Tuple[Optional[str], str], bytes] = {}
+        self.loaded_at = time.monotonic()
+        # Bytes of payload held, growing as section and compressed variants are built
+        self.size = len(self.body)
+        self._precompressing: Optional[asyncio.Future] = None
+
+    def section_body(self, section: str) -> bytes:
+        body = self.section_bodies.get(section)
+        if body is None:
+            body = self.section_bodies[section] = to_json_bytes(getattr(self.portfolio, section))
+            self.size += len(body)
+        return body
+
+    def encoded_body(self, encoding: str, section: Optional[str] = None) -> bytes:
+        """Compressed variant of the full payload or a section
+
+        Served from the best-ratio variants once `precompress` has built them;
+        until then a variant is built on demand at the per-request level, which
+        costs about what the compression middleware would.
+        """
+        key = (section, encoding)
+        body = self.encoded_bodies.get(key)
+        if body is None:
+            raw = self.body if section is None else self.section_body(section)
+            body = self._store_variant(key, compress(raw, encoding))
+        return body
+
+    def precompress(self) -> asyncio.Future:
+        """Build the best-ratio variant of every payload in a worker thread, once per entry
+
+        Maximum-quality brotli takes seconds on a large portfolio, so it must never
+        run on the event loop. Await the result when the variants are needed now.
+        """
+        if self._precompressing is None:
+            self._precompressing = asyncio.ensure_future(self._precompress())
+        return self._precompressing
+
+    async def _precompress(self) -> None:
+        raw_bodies = {None: self.body, **{section: self.section_body(section) for section in PORTFOLIO_SECTIONS}}
+        variants = await asyncio.to_thread(_compress_variants, raw_bodies)
+        for key, body in variants.items():
+            self._store_variant(key, body)
+
+    def _store_variant(self, key: Tuple[Optional[str], str], body: bytes) -> bytes:
+        previous = self.encoded_bodies.get(key)
+        self.encoded_bodies[key] = body
+        self.size += len(body) - (len(previous) if previous is not None else 0)
+        return body
+
+
+def _compress_variants(raw_bodies: Dict[Optional[str], bytes]) -> Dict[Tuple[Optional[str], str], bytes]:
+    return {
+        (section, encoding): compress(raw, encoding, precompressed=True)
+        for section, raw in raw_bodies.items()
+        for encoding in SUPPORTED_ENCODINGS
+    }
+
+
+class PortfolioCache:
+    """In-process cache of the latest portfolio document, keyed by its updatedAt version"""
+
+    def __init__(self, ttl_seconds: float = PORTFOLIO_CACHE_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self.lock = asyncio.Lock()
+        self._entry: Optional[CachedPortfolio] = None
+        # Pinned entries (served from a static snapshot) never expire into a Mongo read
+        self.pinned = False
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0
+
+    def get(self) -> Optional[CachedPortfolio]:
+        """Return the cached entry if it is still within its TTL"""
+        entry = self._entry
+        if entry is not None and (self.pinned or time.monotonic() - entry.loaded_at < self.ttl_seconds):
+            self.hits += 1
+            return entry
+        return None
+
+    def peek(self) -> Optional[CachedPortfolio]:
+        """Return the cached entry regardless of its age"""
+        return self._entry
+
+    def set(self, portfolio: PortfolioData) -> CachedPortfolio:
+        entry = CachedPortfolio(portfolio)
+        if self.enabled or self.pinned:
+            self._entry = entry
+            entry.precompress()
+        return entry
+
+    def pin(self, entry: CachedPortfolio) -> None:
+        """Serve this entry until the next write replaces it, without TTL revalidation"""
+        self.pinned = True
+        self._entry = entry
+
+    def touch(self, entry: CachedPortfolio) -> None:
+        """Mark an expired entry as fresh again after its version was confirmed"""
+        self.revalidations += 1
+        entry.loaded_at = time.monotonic()
+
+    def invalidate(self) -> None:
+        self.invalidations += 1
+        self._entry = None
+
+    def stats(self) -> Dict[str, Any]:
+        entry = self._entry
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "revalidations": self.revalidations,
+            "invalidations": self.invalidations,
+            "version": entry.version.isoformat() if entry else None,
+            "ttlSeconds": self.ttl_seconds,
+            "pinned": self.pinned,
+        }
+
+
+class TenantPortfolioCache:
+    """LRU of tenant portfolios keyed by slug, bounded by entry count and payload bytes
+
+    Entries are CachedPortfolio objects like the default portfolio's, so a hit
+    serves pre-serialized bytes. An entry grows as its variants are built; it is
+    re-measured whenever it is hit, so the byte budget holds without rescanning.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = TENANT_CACHE_MAX_ENTRIES,
+        max_bytes: int = TENANT_CACHE_MAX_BYTES,
+        ttl_seconds: float = PORTFOLIO_CACHE_TTL_SECONDS,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, CachedPortfolio]" = OrderedDict()
+        self._sizes: Dict[str, int] = {}
+        self.bytes = 0
+        # One database read per slug at a time; concurrent misses wait on it
+        self.loading: Dict[str, asyncio.Task] = {}
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.invalidations = 0
+        self.evictions = 0
+        self.evicted_bytes = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0 and self.max_entries > 0
+
+    def get(self, slug: str) -> Optional[CachedPortfolio]:
+        """Return the tenant's entry if it is still within its TTL"""
+        entry = self._entries.get(slug)
+        if entry is None or time.monotonic() - entry.loaded_at >= self.ttl_seconds:
+            return None
+        self.hits += 1
+        self._entries.move_to_end(slug)
+        self._account(slug, entry)
+        return entry
+
+    def peek(self, slug: str) -> Optional[CachedPortfolio]:
+        """Return the tenant's entry regardless of its age"""
+        return self._entries.get(slug)
+
+    def set(self, portfolio: PortfolioData) -> CachedPortfolio:
+        entry = CachedPortfolio(portfolio)
+        slug = portfolio.slug
+        if self.enabled and entry.size <= self.max_bytes:
+            self._remove(slug)
+            self._entries[slug] = entry
+            self._sizes[slug] = 0
+            self._account(slug, entry)
+            entry.precompress()
+        return entry
+
+    def touch(self, entry: CachedPortfolio) -> None:
+        """Mark an expired entry as fresh again after its version was confirmed"""
+        self.revalidations += 1
+        entry.loaded_at = time.monotonic()
+
+    def invalidate(self, slug: str) -> None:
+        if self._remove(slug):
+            self.invalidations += 1
+
+    def _remove(self, slug: str) -> bool:
+        if self._entries.pop(slug, None) is None:
+            return False
+        self.bytes -= self._sizes.pop(slug)
+        return True
+
+    def _account(self, slug: str, entry: CachedPortfolio) -> None:
+        self.bytes += entry.size - self._sizes[slug]
+        self._sizes[slug] = entry.size
+        # The entry just used is most recent, so it is evicted last
+        while len(self._entries) > 1 and (len(self._entries) > self.max_entries or self.bytes > self.max_bytes):
+            evicted, _ = self._entries.popitem(last=False)
+            size = self._sizes.pop(evicted)
+            self.bytes -= size
+            self.evictions += 1
+            self.evicted_bytes += size
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._entries),
+            "bytes": self.bytes,
+            "maxEntries": self.max_entries,
+            "maxBytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "revalidations": self.revalidations,
+            "invalidations": self.invalidations,
+            "evictions": self.evictions,
+            "evictedBytes": self.evicted_bytes,
+            "ttlSeconds": self.ttl_seconds,
+        }
+
+
+portfolio_cache = PortfolioCache()
+tenant_cache = TenantPortfolioCache()
@@ -0,0 +1,135 @@
+import gzip
+import os
+from typing import Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+# Responses smaller than this are not worth the compression CPU
+COMPRESSION_MINIMUM_SIZE = int(os.environ.get('COMPRESSION_MINIMUM_SIZE', '1024'))
+
+# Precompressed payloads are compressed once per version, so they get the best ratio
+PRECOMPRESS_GZIP_LEVEL = 9
+PRECOMPRESS_BROTLI_QUALITY = 11
+# Per-request compression favours speed
+DYNAMIC_GZIP_LEVEL = 6
+DYNAMIC_BROTLI_QUALITY = 4
+
+SUPPORTED_ENCODINGS = ("br", "gzip") if brotli is not None else ("gzip",)
+
+# Streams must reach the client as they are produced; media is already compressed
+_UNCOMPRESSED_MEDIA_TYPES = ("text/event-stream", "image/", "video/", "audio/")
+
+
+def negotiate_encoding(accept_encoding: Optional[str], size: int, minimum_size: int = COMPRESSION_MINIMUM_SIZE) -> Optional[str]:
+    """Pick the best supported content-coding for a body of the given size"""
+    if not accept_encoding or size < minimum_size:
+        return None
+
+    accepted = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[coding.strip().lower()] = quality
+
+    for encoding in SUPPORTED_ENCODINGS:
+        if accepted.get(encoding, accepted.get("*", 0.0)) > 0:
+            return encoding
+    return None
+
+
+def compress(body: bytes, encoding: str, precompressed: bool = False) -> bytes:
+    if encoding == "br":
+        quality = PRECOMPRESS_BROTLI_QUALITY if precompressed else DYNAMIC_BROTLI_QUALITY
+        return brotli.compress(body, quality=quality)
+    level = PRECOMPRESS_GZIP_LEVEL if precompressed else DYNAMIC_GZIP_LEVEL
+    # A fixed mtime keeps the output identical across processes
+    return gzip.compress(body, compresslevel=level, mtime=0)
+
+
+class CompressionMiddleware:
+    """Compress complete responses above a size threshold
+
+    Responses that already carry a Content-Encoding (such as precompressed
+    portfolio payloads) and streaming responses are passed through untouched.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = COMPRESSION_MINIMUM_SIZE) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        accept_encoding = Headers(scope=scope).get("accept-encoding")
+        if not accept_encoding:
+            await self.app(scope, receive, send)
+            return
+
+        start_message: Optional[Message] = None
+        passthrough = False
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start_message, passthrough
+
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                content_type = headers.get("content-type", "")
+                passthrough = (
+                    "content-encoding" in headers
+                    or "content-range" in headers
+                    or content_type.startswith(_UNCOMPRESSED_MEDIA_TYPES)
+                )
+                if passthrough:
+                    await send(message)
+                else:
+                    start_message = message
+                return
+
+            if passthrough or message["type"] != "http.response.body":
+                # e.g. http.response.pathsend, which must still follow the start message
+                if start_message is not None:
+                    initial, start_message = start_message, None
+                    await send(initial)
+                await send(message)
+                return
+
+            if start_message is not None:
+                body = message.get("body", b"")
+                initial, start_message = start_message, None
+
+                if message.get("more_body", False):
+                    # Streaming body: send as-is
+                    passthrough = True
+                    await send(initial)
+                    await send(message)
+                    return
+
+                encoding = negotiate_encoding(accept_encoding, len(body), self.minimum_size)
+                if encoding:
+                    body = compress(body, encoding)
+                    headers = MutableHeaders(raw=initial["headers"])
+                    headers["Content-Encoding"] = encoding
+                    headers["Content-Length"] = str(len(body))
+                    headers.add_vary_header("Accept-Encoding")
+                    message = {**message, "body": body}
+                await send(initial)
+                await send(message)
+                return
+
+            await send(message)
+
+        await self.app(scope, receive, send_compressed)
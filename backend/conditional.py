@@ -0,0 +1,100 @@
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Dict, Optional, Tuple
+
+from starlette.datastructures import Headers
+
+ENCODING_SUFFIXES = ("gzip", "br")
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+def make_etag(resource_id: str, version: datetime) -> str:
+    """Build a strong ETag from a resource id and its millisecond updatedAt version"""
+    millis = int(version.replace(tzinfo=timezone.utc).timestamp() * 1000)
+    return f'"{resource_id}-{millis}"'
+
+
+def parse_etag(etag: str) -> Optional[Tuple[str, datetime]]:
+    """Recover (resource id, version) from an ETag built by make_etag; None if it is not one"""
+    etag = strip_encoding_suffix(etag.strip())
+    if len(etag) < 2 or not (etag.startswith('"') and etag.endswith('"')):
+        return None
+    resource_id, _, millis = etag[1:-1].rpartition("-")
+    if not resource_id or not millis.isdigit():
+        return None
+    return resource_id, _EPOCH + timedelta(milliseconds=int(millis))
+
+
+def encoded_etag(etag: str, encoding: Optional[str]) -> str:
+    """Strong ETags must differ per content-coding, so compressed variants get a suffix"""
+    if not encoding:
+        return etag
+    return f'{etag[:-1]}-{encoding}"'
+
+
+def strip_encoding_suffix(etag: str) -> str:
+    for encoding in ENCODING_SUFFIXES:
+        suffix = f'-{encoding}"'
+        if etag.endswith(suffix):
+            return etag[:-len(suffix)] + '"'
+    return etag
+
+
+def http_date(value: datetime) -> str:
+    return format_datetime(value.replace(tzinfo=timezone.utc, microsecond=0), usegmt=True)
+
+
+def validator_headers(etag: str, last_modified: str, encoding: Optional[str] = None) -> Dict[str, str]:
+    """Headers that let clients revalidate instead of re-downloading"""
+    headers = {
+        "ETag": encoded_etag(etag, encoding),
+        "Last-Modified": last_modified,
+        "Cache-Control": "no-cache",
+        "Vary": "Accept-Encoding",
+    }
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    return headers
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Match uses the weak comparison function
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        # Any content-coding of the current version is still current
+        if strip_encoding_suffix(candidate) == etag:
+            return True
+    return False
+
+
+def _parse_http_date(value: str) -> Optional[datetime]:
+    try:
+        parsed = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def is_not_modified(headers: Headers, etag: str, version: datetime) -> bool:
+    """Evaluate If-None-Match / If-Modified-Since against the current representation"""
+    if_none_match = headers.get("if-none-match")
+    if if_none_match is not None:
+        # If-Modified-Since is ignored when If-None-Match is present (RFC 9110 13.1.3)
+        return _etag_matches(if_none_match, etag)
+
+    if_modified_since = headers.get("if-modified-since")
+    if if_modified_since is not None:
+        since = _parse_http_date(if_modified_since)
+        if since is None:
+            return False
+        last_modified = version.replace(tzinfo=timezone.utc, microsecond=0)
+        return last_modified <= since
+
+    return False
@@ -0,0 +1,239 @@
+import asyncio
+import logging
+import os
+import time
+from typing import Any, Dict, List, Optional, Set
+
+from pymongo.errors import BulkWriteError
+
+from contact_stats import record_submissions
+from broadcast import contact_events
+from dedupe import contact_dedupe
+
+logger = logging.getLogger(__name__)
+
+CONTACT_WRITE_BEHIND = os.environ.get('CONTACT_WRITE_BEHIND', 'false').lower() == 'true'
+CONTACT_WRITE_BATCH_SIZE = int(os.environ.get('CONTACT_WRITE_BATCH_SIZE', '100'))
+CONTACT_WRITE_FLUSH_INTERVAL_MS = int(os.environ.get('CONTACT_WRITE_FLUSH_INTERVAL_MS', '50'))
+CONTACT_WRITE_QUEUE_SIZE = int(os.environ.get('CONTACT_WRITE_QUEUE_SIZE', '10000'))
+CONTACT_WRITE_ENQUEUE_TIMEOUT_MS = int(os.environ.get('CONTACT_WRITE_ENQUEUE_TIMEOUT_MS', '100'))
+CONTACT_WRITE_MAX_RETRIES = 3
+
+_STOP = object()
+
+
+class ContactBufferFull(Exception):
+    """Raised when the write-behind queue stays full for longer than the enqueue timeout"""
+
+
+class ContactWriteBuffer:
+    """Write-behind queue that batches contact submissions into insert_many calls
+
+    Submissions are flushed when a batch fills up or when the flush interval passes
+    after the first queued item, whichever comes first.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = CONTACT_WRITE_BEHIND,
+        batch_size: int = CONTACT_WRITE_BATCH_SIZE,
+        flush_interval_ms: int = CONTACT_WRITE_FLUSH_INTERVAL_MS,
+        queue_size: int = CONTACT_WRITE_QUEUE_SIZE,
+        enqueue_timeout_ms: int = CONTACT_WRITE_ENQUEUE_TIMEOUT_MS,
+    ):
+        self.enabled = enabled
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval_ms / 1000
+        self.queue_size = queue_size
+        self.enqueue_timeout = enqueue_timeout_ms / 1000
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._db = None
+        self._collection = None
+        self._closed = False
+        self.enqueued = 0
+        self.rejected = 0
+        self.flushes = 0
+        self.flushed = 0
+        self.failed = 0
+        self.duplicates = 0
+        self.last_flush_seconds = 0.0
+        self.max_flush_seconds = 0.0
+        self.total_flush_seconds = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._closed
+
+    @property
+    def depth(self) -> int:
+        return self._queue.qsize() if self._queue else 0
+
+    def start(self, db) -> None:
+        if not self.enabled or self._task is not None:
+            return
+        self._db = db
+        self._collection = db.contact_submissions
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._closed = False
+        self._task = asyncio.create_task(self._run())
+        logger.info(f"Contact write-behind enabled (batch={self.batch_size}, interval={self.flush_interval}s)")
+
+    async def stop(self) -> None:
+        """Stop accepting submissions and flush everything still queued"""
+        if self._task is None:
+            return
+        self._closed = True
+        await self._queue.put(_STOP)
+        await self._task
+        self._task = None
+
+    async def enqueue(self, submission: Dict[str, Any]) -> None:
+        """Queue a validated submission, waiting briefly for room when the queue is full"""
+        if not self.running:
+            raise ContactBufferFull("Contact write buffer is not running")
+        try:
+            await asyncio.wait_for(self._queue.put(submission), timeout=self.enqueue_timeout)
+        except asyncio.TimeoutError:
+            self.rejected += 1
+            raise ContactBufferFull("Contact write buffer is full")
+        self.enqueued += 1
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        stopping = False
+
+        while not stopping:
+            item = await self._queue.get()
+            if item is _STOP:
+                break
+
+            batch = [item]
+            deadline = loop.time() + self.flush_interval
+            while len(batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout=timeout)
+                except asyncio.TimeoutError:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            await self._flush(batch)
+
+        # Drain anything that was queued behind the stop marker
+        remaining = []
+        while not self._queue.empty():
+            item = self._queue.get_nowait()
+            if item is not _STOP:
+                remaining.append(item)
+        for start in range(0, len(remaining), self.batch_size):
+            await self._flush(remaining[start:start + self.batch_size])
+
+    async def _flush(self, batch: List[Dict[str, Any]]) -> None:
+        started = time.perf_counter()
+        for attempt in range(1, CONTACT_WRITE_MAX_RETRIES + 1):
+            try:
+                await self._collection.insert_many(batch, ordered=False)
+                break
+            except BulkWriteError as e:
+                write_errors = e.details.get("writeErrors", [])
+                # Repeats of a message stored within the dedupe window are dropped, not retried
+                repeats = await self._repeats(batch, write_errors)
+                if repeats:
+                    self.duplicates += len(repeats)
+                    write_errors = [error for error in write_errors if batch[error["index"]]["id"] not in repeats]
+                failed_ids = {batch[error["index"]]["id"] for error in write_errors}
+                batch = [submission for submission in batch if submission["id"] not in repeats]
+                if not write_errors:
+                    break
+                # insert_many assigns _id in place, so a retry only trips over rows that already landed
+                if attempt > 1 and all(error.get("code") == 11000 for error in write_errors):
+                    break
+                if attempt == CONTACT_WRITE_MAX_RETRIES:
+                    self.failed += len(write_errors)
+                    logger.error(f"Failed to write {len(write_errors)} of {len(batch)} contact submissions: {str(e)}")
+                    self._forget([submission for submission in batch if submission["id"] in failed_ids])
+                    await self._landed([submission for submission in batch if submission["id"] not in failed_ids])
+                    return
+                logger.warning(f"Contact flush attempt {attempt} failed: {str(e)}")
+                await asyncio.sleep(0.1 * attempt)
+            except Exception as e:
+                if attempt == CONTACT_WRITE_MAX_RETRIES:
+                    self.failed += len(batch)
+                    failed_ids = ", ".join(submission["id"] for submission in batch)
+                    logger.error(f"Dropping {len(batch)} contact submissions after failed flush ({str(e)}): {failed_ids}")
+                    self._forget(batch)
+                    return
+                logger.warning(f"Contact flush attempt {attempt} failed: {str(e)}")
+                await asyncio.sleep(0.1 * attempt)
+
+        await self._landed(batch)
+
+        elapsed = time.perf_counter() - started
+        self.flushes += 1
+        self.flushed += len(batch)
+        self.last_flush_seconds = elapsed
+        self.max_flush_seconds = max(self.max_flush_seconds, elapsed)
+        self.total_flush_seconds += elapsed
+
+    async def _repeats(self, batch: List[Dict[str, Any]], write_errors: List[Dict[str, Any]]) -> Set[str]:
+        """Ids of submissions refused because a different one with their dedupe key is stored
+
+        A key held by the submission itself means it landed on an earlier attempt.
+        """
+        keys = {
+            batch[error["index"]]["dedupeKey"]: batch[error["index"]]["id"]
+            for error in write_errors
+            if error.get("code") == 11000 and batch[error["index"]].get("dedupeKey")
+        }
+        if not keys:
+            return set()
+        try:
+            stored = {
+                document["dedupeKey"]: document["id"]
+                async for document in self._collection.find({"dedupeKey": {"$in": list(keys)}}, {"dedupeKey": 1, "id": 1, "_id": 0})
+            }
+        except Exception as e:
+            logger.warning(f"Could not look up duplicate contact submissions: {str(e)}")
+            return set()
+        return {submission_id for key, submission_id in keys.items() if stored.get(key, submission_id) != submission_id}
+
+    def _forget(self, submissions: List[Dict[str, Any]]) -> None:
+        # Dropped submissions were never stored, so resending them must not count as a repeat
+        for submission in submissions:
+            contact_dedupe.release_stored(submission)
+
+    async def _landed(self, submissions: List[Dict[str, Any]]) -> None:
+        """Bookkeeping for submissions that are now in Mongo"""
+        await record_submissions(self._db, submissions)
+        for submission in submissions:
+            # The admin event stream is the default portfolio's
+            if submission.get("tenant") is not None:
+                continue
+            # insert_many added an ObjectId _id to each document; the dedupe key is internal
+            contact_events.publish("contact.created", {key: value for key, value in submission.items() if key not in ("_id", "dedupeKey")})
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "running": self.running,
+            "depth": self.depth,
+            "capacity": self.queue_size,
+            "enqueued": self.enqueued,
+            "rejected": self.rejected,
+            "flushes": self.flushes,
+            "flushed": self.flushed,
+            "failed": self.failed,
+            "duplicates": self.duplicates,
+            "lastFlushSeconds": self.last_flush_seconds,
+            "maxFlushSeconds": self.max_flush_seconds,
+            "avgFlushSeconds": self.total_flush_seconds / self.flushes if self.flushes else 0.0,
+        }
+
+
+contact_write_buffer = ContactWriteBuffer()
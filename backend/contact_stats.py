@@ -0,0 +1,225 @@
+import logging
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Literal, Optional
+
+from pymongo import DeleteMany, ReplaceOne, UpdateOne
+
+from database import claim_startup_task, release_startup_task
+
+logger = logging.getLogger(__name__)
+
+TOTALS_ID = "totals"
+DAY_ID_PREFIX = "day:"
+
+# Counters and stats cover the default portfolio; hosted portfolios' submissions carry a tenant
+DEFAULT_TENANT_FILTER = {"tenant": None}
+
+Granularity = Literal["day", "hour"]
+
+BUCKET_FORMATS = {"day": "%Y-%m-%d", "hour": "%Y-%m-%dT%H:00"}
+
+
+def _day_id(day: str) -> str:
+    return f"{DAY_ID_PREFIX}{day}"
+
+
+def _window_start(days: int, now: datetime) -> datetime:
+    """Midnight UTC at the start of a window of `days` days ending today"""
+    start = now - timedelta(days=days - 1)
+    return start.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+async def record_submissions(db, submissions: Iterable[Dict[str, Any]]) -> None:
+    """Count newly stored submissions to the default portfolio into the totals and per-day counter documents
+
+    Submissions to hosted portfolios are skipped. Counters are best-effort: the
+    submissions are already stored, so a failure is logged and left for
+    `rebuild_counters` to correct.
+    """
+    totals: Counter = Counter()
+    days: Dict[str, Counter] = {}
+    for submission in submissions:
+        if submission.get("tenant") is not None:
+            continue
+        submitted_at = submission["submittedAt"]
+        day = submitted_at.strftime(BUCKET_FORMATS["day"])
+        totals["total"] += 1
+        totals[f"status.{submission.get('status', 'new')}"] += 1
+        day_counts = days.setdefault(day, Counter())
+        day_counts["total"] += 1
+        day_counts[f"hours.{submitted_at.hour:02d}"] += 1
+
+    if not totals:
+        return
+
+    operations = [UpdateOne({"_id": TOTALS_ID}, {"$inc": dict(totals)}, upsert=True)]
+    operations.extend(
+        UpdateOne({"_id": _day_id(day)}, {"$inc": dict(counts), "$setOnInsert": {"day": day}}, upsert=True)
+        for day, counts in days.items()
+    )
+    try:
+        await db.contact_stats.bulk_write(operations, ordered=False)
+    except Exception as e:
+        logger.error(f"Failed to update contact counters: {str(e)}")
+
+
+async def record_status_changes(db, changes: Dict[str, Dict[str, int]]) -> None:
+    """Move counts between statuses; `changes` maps old status -> {new status: count}"""
+    increments: Counter = Counter()
+    for old_status, targets in changes.items():
+        for new_status, count in targets.items():
+            if old_status == new_status or not count:
+                continue
+            increments[f"status.{old_status}"] -= count
+            increments[f"status.{new_status}"] += count
+
+    increments = {field: value for field, value in increments.items() if value}
+    if not increments:
+        return
+    try:
+        await db.contact_stats.update_one({"_id": TOTALS_ID}, {"$inc": increments}, upsert=True)
+    except Exception as e:
+        logger.error(f"Failed to update contact counters: {str(e)}")
+
+
+async def _backlog(db, now: datetime) -> Dict[str, Any]:
+    # Walks the (tenant, status, submittedAt) index from its oldest end
+    oldest = await db.contact_submissions.find_one(
+        {"status": "new", **DEFAULT_TENANT_FILTER},
+        {"submittedAt": 1, "_id": 0},
+        sort=[("tenant", 1), ("status", 1), ("submittedAt", 1)]
+    )
+    oldest_at = oldest["submittedAt"] if oldest else None
+    return {
+        "oldestSubmittedAt": oldest_at,
+        "ageSeconds": (now - oldest_at).total_seconds() if oldest_at else 0.0,
+    }
+
+
+async def read_counters(db, days: int = 30, granularity: Granularity = "day", now: Optional[datetime] = None) -> Optional[Dict[str, Any]]:
+    """Stats from the materialized counters; None until the counters exist"""
+    now = now or datetime.utcnow()
+    totals = await db.contact_stats.find_one({"_id": TOTALS_ID})
+    if totals is None:
+        return None
+
+    first_day = _window_start(days, now).strftime(BUCKET_FORMATS["day"])
+    last_day = now.strftime(BUCKET_FORMATS["day"])
+    day_docs = await db.contact_stats.find(
+        {"_id": {"$gte": _day_id(first_day), "$lte": _day_id(last_day)}}
+    ).sort("_id", 1).to_list(None)
+
+    buckets = []
+    for day_doc in day_docs:
+        if granularity == "day":
+            buckets.append({"period": day_doc["day"], "count": day_doc.get("total", 0)})
+            continue
+        for hour, count in sorted(day_doc.get("hours", {}).items()):
+            if count:
+                buckets.append({"period": f"{day_doc['day']}T{hour}:00", "count": count})
+
+    by_status = {status: count for status, count in totals.get("status", {}).items() if count}
+    backlog = await _backlog(db, now)
+    return {
+        "source": "counters",
+        "total": totals.get("total", 0),
+        "byStatus": by_status,
+        "granularity": granularity,
+        "buckets": buckets,
+        "backlog": {"count": by_status.get("new", 0), **backlog},
+    }
+
+
+async def aggregate_stats(db, days: int = 30, granularity: Granularity = "day", now: Optional[datetime] = None) -> Dict[str, Any]:
+    """Stats for the default portfolio computed from contact_submissions with one aggregation round-trip"""
+    now = now or datetime.utcnow()
+    since = _window_start(days, now)
+    pipeline = [
+        {"$match": DEFAULT_TENANT_FILTER},
+        {"$facet": {
+            "byStatus": [
+                {"$group": {"_id": "$status", "count": {"$sum": 1}}},
+            ],
+            "buckets": [
+                {"$match": {"submittedAt": {"$gte": since}}},
+                {"$group": {
+                    "_id": {"$dateToString": {"format": BUCKET_FORMATS[granularity], "date": "$submittedAt"}},
+                    "count": {"$sum": 1},
+                }},
+                {"$sort": {"_id": 1}},
+            ],
+            "backlog": [
+                {"$match": {"status": "new"}},
+                {"$group": {"_id": None, "count": {"$sum": 1}, "oldest": {"$min": "$submittedAt"}}},
+            ],
+        }},
+    ]
+    result = (await db.contact_submissions.aggregate(pipeline).to_list(1))[0]
+
+    by_status = {group["_id"]: group["count"] for group in result["byStatus"]}
+    backlog = result["backlog"][0] if result["backlog"] else {"count": 0, "oldest": None}
+    oldest_at = backlog["oldest"]
+    return {
+        "source": "aggregate",
+        "total": sum(by_status.values()),
+        "byStatus": by_status,
+        "granularity": granularity,
+        "buckets": [{"period": bucket["_id"], "count": bucket["count"]} for bucket in result["buckets"]],
+        "backlog": {
+            "count": backlog["count"],
+            "oldestSubmittedAt": oldest_at,
+            "ageSeconds": (now - oldest_at).total_seconds() if oldest_at else 0.0,
+        },
+    }
+
+
+async def rebuild_counters(db) -> Dict[str, int]:
+    """Recompute every counter document from the default portfolio's contact_submissions"""
+    status_groups = await db.contact_submissions.aggregate([
+        {"$match": DEFAULT_TENANT_FILTER},
+        {"$group": {"_id": "$status", "count": {"$sum": 1}}},
+    ]).to_list(None)
+    hour_groups = await db.contact_submissions.aggregate([
+        {"$match": DEFAULT_TENANT_FILTER},
+        {"$group": {
+            "_id": {"$dateToString": {"format": BUCKET_FORMATS["hour"], "date": "$submittedAt"}},
+            "count": {"$sum": 1},
+        }},
+    ]).to_list(None)
+
+    by_status = {group["_id"]: group["count"] for group in status_groups}
+    day_docs: Dict[str, Dict[str, Any]] = {}
+    for group in hour_groups:
+        day, _, hour = group["_id"].partition("T")
+        day_doc = day_docs.setdefault(day, {"_id": _day_id(day), "day": day, "total": 0, "hours": {}})
+        day_doc["total"] += group["count"]
+        day_doc["hours"][hour[:2]] = group["count"]
+
+    documents: List[Dict[str, Any]] = [{"_id": TOTALS_ID, "total": sum(by_status.values()), "status": by_status}]
+    documents.extend(day_docs.values())
+
+    # Replaced in place rather than deleted and re-inserted, so a concurrent
+    # rebuild or upserting $inc cannot collide with it on _id
+    operations = [ReplaceOne({"_id": document["_id"]}, document, upsert=True) for document in documents]
+    operations.append(DeleteMany({"_id": {"$nin": [document["_id"] for document in documents]}}))
+    await db.contact_stats.bulk_write(operations, ordered=False)
+    return {"total": documents[0]["total"], "days": len(day_docs)}
+
+
+async def bootstrap_counters(db) -> None:
+    """Backfill the counters on first start so they cover submissions made before they existed
+
+    Only the worker that claims the task rebuilds; the others start serving and
+    count into the counters as usual.
+    """
+    if await db.contact_stats.find_one({"_id": TOTALS_ID}, {"_id": 1}) is not None:
+        return
+    if not await claim_startup_task(db, "contact_counters"):
+        return
+    try:
+        report = await rebuild_counters(db)
+    except Exception:
+        await release_startup_task(db, "contact_counters")
+        raise
+    logger.info(f"Built contact counters from {report['total']} submissions")
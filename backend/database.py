@@ -1,10 +1,87 @@
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo.errors import DuplicateKeyError
+from typing import Any, Dict, Optional
+from datetime import datetime
+import asyncio
+import logging
 import os
 
-# MongoDB connection
-mongo_url = os.environ.get('MONGO_URL')
-client = AsyncIOMotorClient(mongo_url)
-db = client[os.environ.get('DB_NAME', 'portfolio_db')]
+from metrics import mongo_command_metrics, mongo_pool_metrics
+from ratelimit import mongo_latency
+
+logger = logging.getLogger(__name__)
+
+# Env var -> (MongoClient option, parser); only options that are set get passed on
+CLIENT_OPTION_ENV = {
+    'MONGO_MAX_POOL_SIZE': ('maxPoolSize', int),
+    'MONGO_MIN_POOL_SIZE': ('minPoolSize', int),
+    'MONGO_MAX_IDLE_TIME_MS': ('maxIdleTimeMS', int),
+    'MONGO_WAIT_QUEUE_TIMEOUT_MS': ('waitQueueTimeoutMS', int),
+    'MONGO_CONNECT_TIMEOUT_MS': ('connectTimeoutMS', int),
+    'MONGO_SOCKET_TIMEOUT_MS': ('socketTimeoutMS', int),
+    'MONGO_SERVER_SELECTION_TIMEOUT_MS': ('serverSelectionTimeoutMS', int),
+    'MONGO_COMPRESSORS': ('compressors', str),
+    'MONGO_ZLIB_COMPRESSION_LEVEL': ('zlibCompressionLevel', int),
+    'MONGO_APP_NAME': ('appname', str),
+}
+
+# MongoDB connection, shared by the whole process
+client: Optional[AsyncIOMotorClient] = None
+db = None
+
+def client_options() -> Dict[str, Any]:
+    """MongoClient keyword options taken from the environment"""
+    options = {}
+    for env_name, (option, parse) in CLIENT_OPTION_ENV.items():
+        value = os.environ.get(env_name)
+        if value:
+            options[option] = parse(value)
+    return options
+
+def connect(mongo_client: Optional[AsyncIOMotorClient] = None):
+    """Create the process-wide client (or adopt the given one) and return the database"""
+    global client, db
+    if client is None:
+        # The latency monitor drives overload shedding of contact writes; the others feed /api/metrics
+        client = mongo_client or AsyncIOMotorClient(
+            os.environ.get('MONGO_URL'),
+            event_listeners=[mongo_latency, mongo_command_metrics, mongo_pool_metrics],
+            **client_options()
+        )
+        db = client[os.environ.get('DB_NAME', 'portfolio_db')]
+    return db
+
+async def warm_up(connections: Optional[int] = None) -> None:
+    """Ping the server and pre-open pool connections so early requests skip the handshake"""
+    if connections is None:
+        connections = int(os.environ.get('MONGO_WARMUP_CONNECTIONS', os.environ.get('MONGO_MIN_POOL_SIZE', '1') or '1'))
+    # Concurrent pings each check out their own connection
+    await asyncio.gather(*(client.admin.command('ping') for _ in range(max(connections, 1))))
+    logger.info(f"MongoDB warm-up complete ({max(connections, 1)} connections)")
+
+async def claim_startup_task(db, name: str) -> bool:
+    """Claim a one-off startup task, so only one of several starting workers runs it
+
+    The claim is a marker document whose _id is the task name; release it if the
+    task fails so the next start tries again.
+    """
+    try:
+        await db.startup_tasks.insert_one({"_id": name, "claimedAt": datetime.utcnow()})
+    except DuplicateKeyError:
+        return False
+    return True
+
+async def release_startup_task(db, name: str) -> None:
+    await db.startup_tasks.delete_one({"_id": name})
+
+def close() -> None:
+    global client, db
+    if client is not None:
+        client.close()
+    client = None
+    db = None
 
 async def get_database():
-    return db
\ No newline at end of file
+    if db is None:
+        return connect()
+    return db
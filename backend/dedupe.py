@@ -0,0 +1,146 @@
+import hashlib
+import os
+import re
+import time
+import unicodedata
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, Tuple
+
+CONTACT_DEDUPE_ENABLED = os.environ.get('CONTACT_DEDUPE_ENABLED', 'true').lower() == 'true'
+# Identical submissions within this window are treated as one
+CONTACT_DEDUPE_WINDOW_SECONDS = int(os.environ.get('CONTACT_DEDUPE_WINDOW_SECONDS', '600'))
+# "merge" answers a duplicate with the original submission, "reject" with 409
+CONTACT_DEDUPE_POLICY = os.environ.get('CONTACT_DEDUPE_POLICY', 'merge').lower()
+CONTACT_DEDUPE_CACHE_SIZE = int(os.environ.get('CONTACT_DEDUPE_CACHE_SIZE', '10000'))
+
+DEDUPE_POLICIES = ("merge", "reject")
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def _normalize(value: str) -> str:
+    # Case, Unicode compatibility forms and whitespace runs do not make a message different
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFKC", value).casefold()).strip()
+
+
+def fingerprint(email: str, subject: str, message: str, tenant: Optional[str] = None) -> str:
+    """sha256 over the normalized (email, subject, message), scoped to the tenant if there is one"""
+    parts = (_normalize(email), _normalize(subject), _normalize(message))
+    if tenant is not None:
+        parts += (tenant,)
+    return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+class RecentFingerprints:
+    """LRU of fingerprints seen within the window, mapped to the submission they belong to"""
+
+    def __init__(self, size: int, window_seconds: float):
+        self.size = size
+        self.window = window_seconds
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, original = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        return original
+
+    def add(self, key: str, original: Dict[str, Any], expires_at: Optional[float] = None) -> None:
+        self._entries[key] = (expires_at or time.monotonic() + self.window, original)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.size:
+            self._entries.popitem(last=False)
+
+    def discard(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class ContactDeduplicator:
+    """Suppresses repeated contact submissions by content fingerprint
+
+    Repeats seen by this process are answered from memory without touching Mongo.
+    Each stored submission also carries a `dedupeKey`, its fingerprint plus the
+    window it falls in, under a sparse unique index. A repeat that reaches another
+    worker is then refused by the same insert that would have stored it, buffered
+    or not, so the request path does no extra round-trip.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = CONTACT_DEDUPE_ENABLED,
+        window_seconds: int = CONTACT_DEDUPE_WINDOW_SECONDS,
+        policy: str = CONTACT_DEDUPE_POLICY,
+        cache_size: int = CONTACT_DEDUPE_CACHE_SIZE,
+    ):
+        if policy not in DEDUPE_POLICIES:
+            raise ValueError(f"CONTACT_DEDUPE_POLICY must be one of {', '.join(DEDUPE_POLICIES)}")
+        self.enabled = enabled
+        self.window_seconds = window_seconds
+        self.policy = policy
+        self.recent = RecentFingerprints(cache_size, window_seconds)
+        self.checked = 0
+        self.suppressed_memory = 0
+        self.suppressed_database = 0
+
+    def claim(self, key: str, submission: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Record `submission` as the first with this fingerprint in this process
+
+        Returns the original's id and submittedAt if the fingerprint was already taken.
+        """
+        self.checked += 1
+        original = self.recent.get(key)
+        if original is not None:
+            self.suppressed_memory += 1
+            return original
+        self.recent.add(key, {"id": submission["id"], "submittedAt": submission["submittedAt"]})
+        return None
+
+    def storage_key(self, key: str, submitted_at: datetime) -> str:
+        """Key stored on the submission; repeats within the same window share it
+
+        Windows are fixed intervals, so across workers a repeat straddling a
+        window boundary gets through; within one process the window slides.
+        """
+        window = int(submitted_at.replace(tzinfo=timezone.utc).timestamp() // self.window_seconds)
+        return f"{key}:{window}"
+
+    async def stored_original(self, db, storage_key: str) -> Optional[Dict[str, Any]]:
+        """The stored submission that an insert refused under `storage_key` repeats"""
+        original = await db.contact_submissions.find_one({"dedupeKey": storage_key}, {"_id": 0, "id": 1, "submittedAt": 1})
+        if original is not None:
+            self.suppressed_database += 1
+            remaining = self.window_seconds - (datetime.utcnow() - original["submittedAt"]).total_seconds()
+            self.recent.add(storage_key.rpartition(":")[0], original, time.monotonic() + max(remaining, 0))
+        return original
+
+    def release(self, key: str) -> None:
+        """Forget a claim whose submission was not stored, so a retry is accepted"""
+        self.recent.discard(key)
+
+    def release_stored(self, submission: Dict[str, Any]) -> None:
+        """Forget the claim of a submission document that could not be written"""
+        if submission.get("dedupeKey"):
+            self.release(submission["dedupeKey"].rpartition(":")[0])
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "policy": self.policy,
+            "windowSeconds": self.window_seconds,
+            "cached": len(self.recent),
+            "checked": self.checked,
+            "suppressed": self.suppressed_memory + self.suppressed_database,
+            "suppressedMemory": self.suppressed_memory,
+            "suppressedDatabase": self.suppressed_database,
+        }
+
+
+contact_dedupe = ContactDeduplicator()
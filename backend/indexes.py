@@ -0,0 +1,157 @@
+import argparse
+import asyncio
+import logging
+import os
+from typing import Any, Dict, List
+
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.errors import OperationFailure
+
+from database import get_database
+from status_rollups import STATUS_CHECK_TTL_SECONDS
+
+logger = logging.getLogger(__name__)
+
+# Options that make two indexes with the same key pattern different
+_INDEX_OPTIONS = ("unique", "sparse", "expireAfterSeconds", "partialFilterExpression")
+
+# Declared indexes per collection; names are used to reconcile against the server
+INDEXES: Dict[str, List[IndexModel]] = {
+    "portfolio": [
+        # Default portfolio versions are found with {slug: null} sorted by updatedAt
+        IndexModel([("slug", ASCENDING), ("updatedAt", DESCENDING)], name="slug_updatedAt_desc"),
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        # One document per tenant; the default portfolio's versions are stored without a slug
+        IndexModel([("slug", ASCENDING)], name="slug_unique", unique=True, sparse=True),
+    ],
+    "contact_submissions": [
+        # (submittedAt, id) is the keyset used for cursor pagination; every status
+        # query is scoped to one tenant (null for the default portfolio), so it leads
+        IndexModel([("tenant", ASCENDING), ("status", ASCENDING), ("submittedAt", DESCENDING), ("id", DESCENDING)], name="tenant_status_submittedAt_id"),
+        IndexModel([("submittedAt", DESCENDING), ("id", DESCENDING)], name="submittedAt_id_desc"),
+        IndexModel([("tenant", ASCENDING), ("submittedAt", DESCENDING), ("id", DESCENDING)], name="tenant_submittedAt_id"),
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        # One submission per fingerprint and dedupe window; submissions stored without a key are not indexed
+        IndexModel([("dedupeKey", ASCENDING)], name="dedupeKey_unique", unique=True, sparse=True),
+    ],
+    "status_checks": [
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+        # (timestamp, id) is the keyset for range queries, optionally per client
+        IndexModel([("client_name", ASCENDING), ("timestamp", DESCENDING), ("id", DESCENDING)], name="client_timestamp_id"),
+        IndexModel([("timestamp", DESCENDING), ("id", DESCENDING)], name="timestamp_id_desc"),
+    ] + ([
+        IndexModel([("timestamp", ASCENDING)], name="timestamp_ttl", expireAfterSeconds=STATUS_CHECK_TTL_SECONDS),
+    ] if STATUS_CHECK_TTL_SECONDS else []),
+    "status_rollups": [
+        # Rollups are upserted by _id; these serve range queries with (bucket, client_name) as the keyset
+        IndexModel([("granularity", ASCENDING), ("client_name", ASCENDING), ("bucket", DESCENDING)], name="granularity_client_bucket"),
+        IndexModel([("granularity", ASCENDING), ("bucket", DESCENDING), ("client_name", DESCENDING)], name="granularity_bucket_client"),
+        IndexModel([("expireAt", ASCENDING)], name="expireAt_ttl", expireAfterSeconds=0),
+    ],
+    "assets": [
+        # id is the sha256 of the original upload
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True),
+    ],
+}
+
+
+def _spec(index: Dict[str, Any]) -> Dict[str, Any]:
+    """Comparable form of an index document or an index_information() entry"""
+    spec = {"key": [(field, direction) for field, direction in dict(index["key"]).items()]}
+    for option in _INDEX_OPTIONS:
+        if index.get(option) is not None:
+            spec[option] = index[option]
+    return spec
+
+
+async def ensure_indexes(db, create: bool = True, drop_extra: bool = False) -> Dict[str, Dict[str, List[str]]]:
+    """Create missing declared indexes and report missing, conflicting and undeclared ones
+
+    Safe to run on every startup: indexes that already match are left untouched.
+    """
+    report: Dict[str, Dict[str, List[str]]] = {}
+
+    for collection_name, declared in INDEXES.items():
+        collection = db[collection_name]
+        existing = await collection.index_information()
+        existing_by_key = {tuple(_spec(info)["key"]): name for name, info in existing.items()}
+        result = {"created": [], "missing": [], "conflicting": [], "extra": [], "dropped": []}
+        to_create = []
+
+        for index in declared:
+            document = index.document
+            name = document["name"]
+            spec = _spec(document)
+            current = existing.get(name) or existing.get(existing_by_key.get(tuple(spec["key"])))
+
+            if current is None:
+                to_create.append(index)
+            elif _spec(current) != spec:
+                result["conflicting"].append(name)
+
+        for index in to_create:
+            name = index.document["name"]
+            if not create:
+                result["missing"].append(name)
+                continue
+            try:
+                await collection.create_indexes([index])
+                result["created"].append(name)
+            except OperationFailure as e:
+                # e.g. duplicate values under a unique index; keep serving and report it
+                logger.error(f"Failed to create index {collection_name}.{name}: {str(e)}")
+                result["missing"].append(name)
+
+        declared_keys = {tuple(_spec(index.document)["key"]) for index in declared}
+        declared_names = {index.document["name"] for index in declared}
+        for name, info in existing.items():
+            if name == "_id_" or name in declared_names or tuple(_spec(info)["key"]) in declared_keys:
+                continue
+            if drop_extra and create:
+                await collection.drop_index(name)
+                result["dropped"].append(name)
+            else:
+                result["extra"].append(name)
+
+        report[collection_name] = result
+
+    return report
+
+
+def log_index_report(report: Dict[str, Dict[str, List[str]]]) -> None:
+    for collection_name, result in report.items():
+        if result["created"]:
+            logger.info(f"Created indexes on {collection_name}: {', '.join(result['created'])}")
+        if result["dropped"]:
+            logger.info(f"Dropped undeclared indexes on {collection_name}: {', '.join(result['dropped'])}")
+        if result["missing"]:
+            logger.warning(f"Missing indexes on {collection_name}: {', '.join(result['missing'])}")
+        if result["conflicting"]:
+            logger.warning(f"Indexes on {collection_name} differ from their declaration: {', '.join(result['conflicting'])}")
+        if result["extra"]:
+            logger.warning(f"Undeclared indexes on {collection_name}: {', '.join(result['extra'])}")
+
+
+async def bootstrap_indexes(db) -> Dict[str, Dict[str, List[str]]]:
+    """Startup hook: reconcile declared indexes and log what changed"""
+    drop_extra = os.environ.get('MONGO_DROP_UNDECLARED_INDEXES', 'false').lower() == 'true'
+    report = await ensure_indexes(db, drop_extra=drop_extra)
+    log_index_report(report)
+    return report
+
+
+async def main(check_only: bool) -> None:
+    db = await get_database()
+    report = await ensure_indexes(db, create=not check_only)
+    for collection_name, result in report.items():
+        print(collection_name)
+        for state, names in result.items():
+            if names:
+                print(f"  {state}: {', '.join(names)}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Reconcile MongoDB indexes with their declarations")
+    parser.add_argument("--check", action="store_true", help="report differences without creating indexes")
+    args = parser.parse_args()
+    asyncio.run(main(args.check))
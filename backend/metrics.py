@@ -0,0 +1,253 @@
+import bisect
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from pymongo import monitoring
+
+# Seconds; shared by request and Mongo histograms so they line up on a dashboard
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+Labels = Tuple[str, ...]
+
+
+class Histogram:
+    """Fixed-bucket histogram; observing is a bisect and two additions, no locks
+
+    Counts are preallocated per bucket (plus +Inf) and made cumulative only when
+    rendered. Updates from pymongo worker threads can, very rarely, lose an
+    increment to a race; that is the price of keeping locks off the hot path.
+    """
+
+    __slots__ = ("bounds", "counts", "total")
+
+    def __init__(self, bounds: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.total = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.total += value
+
+
+class HistogramFamily:
+    """Histograms sharing a name, one per label combination"""
+
+    def __init__(self, name: str, help_text: str, label_names: Labels, bounds: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self.bounds = bounds
+        self.children: Dict[Labels, Histogram] = {}
+
+    def labels(self, *values: str) -> Histogram:
+        child = self.children.get(values)
+        if child is None:
+            child = self.children.setdefault(values, Histogram(self.bounds))
+        return child
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        for values, child in list(self.children.items()):
+            labels = _format_labels(self.label_names, values)
+            cumulative = 0
+            for bound, count in zip(self.bounds + (float("inf"),), list(child.counts)):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f'{self.name}_bucket{{{labels}{"," if labels else ""}le="{le}"}} {cumulative}')
+            label_set = f"{{{labels}}}" if labels else ""
+            lines.append(f"{self.name}_sum{label_set} {child.total}")
+            lines.append(f"{self.name}_count{label_set} {cumulative}")
+        return lines
+
+
+class CounterFamily:
+    def __init__(self, name: str, help_text: str, label_names: Labels):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self.values: Dict[Labels, int] = {}
+
+    def inc(self, *values: str) -> None:
+        self.values[values] = self.values.get(values, 0) + 1
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        for values, count in list(self.values.items()):
+            lines.append(f"{self.name}{{{_format_labels(self.label_names, values)}}} {count}")
+        return lines
+
+
+class Gauge:
+    __slots__ = ("name", "help_text", "value")
+
+    def __init__(self, name: str, help_text: str):
+        self.name = name
+        self.help_text = help_text
+        self.value = 0
+
+    def render(self) -> List[str]:
+        return render_samples(self.name, self.help_text, [({}, self.value)])
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Labels, values: Labels) -> str:
+    return ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+
+
+def render_samples(name: str, help_text: str, samples: Iterable[Tuple[Dict[str, str], float]], metric_type: str = "gauge") -> List[str]:
+    """Render (labels, value) samples read at scrape time"""
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} {metric_type}"]
+    for labels, value in samples:
+        label_text = _format_labels(tuple(labels), tuple(labels.values()))
+        lines.append(f"{name}{{{label_text}}} {float(value)}" if label_text else f"{name} {float(value)}")
+    return lines
+
+
+request_duration = HistogramFamily(
+    "http_request_duration_seconds", "Time from request start to the last response byte", ("method", "route", "status")
+)
+mongo_command_duration = HistogramFamily(
+    "mongo_command_duration_seconds", "MongoDB command round-trip time", ("command", "collection", "outcome")
+)
+mongo_pool_wait = HistogramFamily(
+    "mongo_pool_wait_seconds", "Time spent waiting to check a connection out of the pool", ("outcome",)
+)
+mongo_pool_events = CounterFamily("mongo_pool_events_total", "Connection pool events", ("event",))
+in_flight_requests = Gauge("http_requests_in_flight", "Requests currently being handled")
+
+
+class MetricsMiddleware:
+    """Pure ASGI timing middleware; records per-route, per-status latency and in-flight requests"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = 500
+        in_flight_requests.value += 1
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            in_flight_requests.value -= 1
+            # The router fills in the matched route, so paths are templates, not raw URLs
+            route = scope.get("route")
+            path = getattr(route, "path", None) or "unmatched"
+            request_duration.labels(scope["method"], path, str(status)).observe(time.perf_counter() - started)
+
+
+def _command_collection(event) -> str:
+    if event.command_name == "getMore":
+        return event.command.get("collection", "")
+    target = event.command.get(event.command_name)
+    return target if isinstance(target, str) else ""
+
+
+class MongoCommandMetrics(monitoring.CommandListener):
+    """Per-command, per-collection durations from pymongo command events"""
+
+    def __init__(self):
+        # started -> succeeded/failed carry the same request and connection ids
+        self._pending: Dict[Tuple[int, object], Tuple[str, str]] = {}
+
+    def started(self, event) -> None:
+        self._pending[(event.request_id, event.connection_id)] = (event.command_name, _command_collection(event))
+
+    def succeeded(self, event) -> None:
+        self._finish(event, "success")
+
+    def failed(self, event) -> None:
+        self._finish(event, "failure")
+
+    def _finish(self, event, outcome: str) -> None:
+        command, collection = self._pending.pop((event.request_id, event.connection_id), (event.command_name, ""))
+        mongo_command_duration.labels(command, collection, outcome).observe(event.duration_micros / 1_000_000)
+
+
+class MongoPoolMetrics(monitoring.ConnectionPoolListener):
+    """Pool checkout wait time and connection counts
+
+    Checkout start and finish are reported on the thread doing the checkout, so
+    the start time is kept thread-local.
+    """
+
+    def __init__(self):
+        self._checkout = threading.local()
+        self.open_connections = 0
+        self.checked_out = 0
+
+    def _wait(self) -> Optional[float]:
+        started = getattr(self._checkout, "started", None)
+        self._checkout.started = None
+        return None if started is None else time.perf_counter() - started
+
+    def connection_check_out_started(self, event) -> None:
+        self._checkout.started = time.perf_counter()
+
+    def connection_checked_out(self, event) -> None:
+        self.checked_out += 1
+        wait = self._wait()
+        if wait is not None:
+            mongo_pool_wait.labels("success").observe(wait)
+
+    def connection_check_out_failed(self, event) -> None:
+        mongo_pool_events.inc("check_out_failed")
+        wait = self._wait()
+        if wait is not None:
+            mongo_pool_wait.labels("failure").observe(wait)
+
+    def connection_checked_in(self, event) -> None:
+        self.checked_out -= 1
+
+    def connection_created(self, event) -> None:
+        self.open_connections += 1
+        mongo_pool_events.inc("connection_created")
+
+    def connection_ready(self, event) -> None:
+        pass
+
+    def connection_closed(self, event) -> None:
+        self.open_connections -= 1
+        mongo_pool_events.inc("connection_closed")
+
+    def pool_created(self, event) -> None:
+        pass
+
+    def pool_ready(self, event) -> None:
+        pass
+
+    def pool_cleared(self, event) -> None:
+        mongo_pool_events.inc("pool_cleared")
+
+    def pool_closed(self, event) -> None:
+        pass
+
+
+mongo_command_metrics = MongoCommandMetrics()
+mongo_pool_metrics = MongoPoolMetrics()
+
+
+def render_metrics(extra_lines: Iterable[str] = ()) -> str:
+    lines: List[str] = in_flight_requests.render()
+    for family in (request_duration, mongo_command_duration, mongo_pool_wait, mongo_pool_events):
+        lines.extend(family.render())
+    lines.extend(render_samples("mongo_pool_open_connections", "Open pool connections", [({}, mongo_pool_metrics.open_connections)]))
+    lines.extend(render_samples("mongo_pool_checked_out_connections", "Connections currently checked out", [({}, mongo_pool_metrics.checked_out)]))
+    lines.extend(extra_lines)
+    return "\n".join(lines) + "\n"
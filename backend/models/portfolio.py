@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Literal, Union
 from datetime import datetime
 import uuid
 
@@ -12,6 +12,8 @@ class PersonalInfo(BaseModel):
     phone: str
     location: str
     avatar: str
+    # Local asset ids; when set they take precedence over the hotlinked URLs
+    avatarAssetId: Optional[str] = None
 
 class SocialLinks(BaseModel):
     github: str
@@ -34,6 +36,7 @@ class Project(BaseModel):
     description: str
     longDescription: str
     image: str
+    imageAssetId: Optional[str] = None
     tags: List[str]
     liveUrl: str
     githubUrl: str
@@ -54,6 +57,7 @@ class Certification(BaseModel):
     issuer: str
     date: str
     image: str
+    imageAssetId: Optional[str] = None
     credentialId: str
 
 class Achievement(BaseModel):
@@ -81,8 +85,13 @@ class CodingProfile(BaseModel):
     icon: str
     url: str
 
+# Tenant slugs: lowercase letters, digits and inner hyphens
+SLUG_PATTERN = r"^[a-z0-9](?:[a-z0-9-]{0,62}[a-z0-9])?$"
+
 class PortfolioData(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    # Tenant key; None for the deployment's own (default) portfolio
+    slug: Optional[str] = Field(None, pattern=SLUG_PATTERN)
     personal: PersonalInfo
     socialLinks: SocialLinks
     skills: List[SkillCategory]
@@ -94,6 +103,33 @@ class PortfolioData(BaseModel):
     createdAt: datetime = Field(default_factory=datetime.utcnow)
     updatedAt: datetime = Field(default_factory=datetime.utcnow)
 
+# Selects the versioned default portfolio documents, which have no slug
+DEFAULT_PORTFOLIO_FILTER = {"slug": None}
+
+def portfolio_document(portfolio: "PortfolioData") -> Dict[str, Any]:
+    """Document to store for a portfolio; default portfolios leave `slug` out rather than storing null"""
+    return portfolio.dict(exclude={"slug"} if portfolio.slug is None else None)
+
+# Top-level portfolio fields that can be fetched on their own, with their types
+PORTFOLIO_SECTIONS = {
+    "personal": PersonalInfo,
+    "socialLinks": SocialLinks,
+    "skills": List[SkillCategory],
+    "projects": List[Project],
+    "experience": List[Experience],
+    "certifications": List[Certification],
+    "achievements": List[Achievement],
+    "codingProfiles": List[CodingProfile],
+}
+
+# Array sections whose entries are addressed by their integer id
+PORTFOLIO_ITEM_SECTIONS = {
+    "projects": Project,
+    "experience": Experience,
+    "certifications": Certification,
+    "achievements": Achievement,
+}
+
 class ContactSubmission(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     name: str
@@ -102,6 +138,88 @@ class ContactSubmission(BaseModel):
     message: str
     submittedAt: datetime = Field(default_factory=datetime.utcnow)
     status: str = "new"  # new, read, responded
+    # Slug of the portfolio the message was sent to; None for the default portfolio
+    tenant: Optional[str] = None
+
+# Lifecycle of a contact submission
+ContactStatus = Literal["new", "read", "responded"]
+
+class ContactStatusUpdate(BaseModel):
+    id: str
+    status: ContactStatus
+
+class ContactStatusFilter(BaseModel):
+    ids: Optional[List[str]] = None
+    status: Optional[ContactStatus] = None
+    submittedBefore: Optional[datetime] = None
+    submittedAfter: Optional[datetime] = None
+
+class ContactBulkStatusUpdate(BaseModel):
+    # Either explicit (id, status) pairs, or a filter plus the status to move matches to
+    updates: Optional[List[ContactStatusUpdate]] = None
+    filter: Optional[ContactStatusFilter] = None
+    status: Optional[ContactStatus] = None
+    # Slug of the portfolio whose submissions are updated; None for the default portfolio
+    tenant: Optional[str] = None
+
+class ContactStatusUpdateResult(BaseModel):
+    id: str
+    status: ContactStatus
+    matched: bool
+    modified: bool
+
+class ContactBulkStatusResult(BaseModel):
+    matched: int
+    modified: int
+    items: Optional[List[ContactStatusUpdateResult]] = None
+
+class ContactSubmissionPage(BaseModel):
+    items: List[ContactSubmission]
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
+
+class ContactStatsBucket(BaseModel):
+    period: str
+    count: int
+
+class ContactBacklog(BaseModel):
+    count: int
+    oldestSubmittedAt: Optional[datetime] = None
+    ageSeconds: float
+
+class ContactStats(BaseModel):
+    source: Literal["counters", "aggregate"]
+    total: int
+    byStatus: Dict[str, int]
+    granularity: Literal["day", "hour"]
+    buckets: List[ContactStatsBucket]
+    backlog: ContactBacklog
+
+class AssetVariant(BaseModel):
+    width: int
+    height: int
+    size: int
+    sha256: str
+
+class AssetInfo(BaseModel):
+    id: str
+    contentType: str
+    size: int
+    filename: Optional[str] = None
+    width: Optional[int] = None
+    height: Optional[int] = None
+    variants: List[AssetVariant] = []
+    createdAt: datetime
+
+class SearchHit(BaseModel):
+    section: str
+    id: Union[int, str]
+    title: str
+    score: float
+
+class SearchResults(BaseModel):
+    query: str
+    hits: List[SearchHit]
 
 class ContactSubmissionCreate(BaseModel):
     name: str
@@ -119,6 +237,9 @@ class PortfolioDataCreate(BaseModel):
     achievements: List[Achievement]
     codingProfiles: List[CodingProfile]
 
+class TenantPortfolioCreate(PortfolioDataCreate):
+    slug: str = Field(..., pattern=SLUG_PATTERN)
+
 class PortfolioDataUpdate(BaseModel):
     personal: Optional[PersonalInfo] = None
     socialLinks: Optional[SocialLinks] = None
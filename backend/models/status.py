@@ -0,0 +1,30 @@
+from pydantic import BaseModel, Field
+from datetime import datetime
+from typing import List, Optional
+import uuid
+
+class StatusCheck(BaseModel):
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    client_name: str
+    timestamp: datetime = Field(default_factory=datetime.utcnow)
+
+class StatusCheckCreate(BaseModel):
+    client_name: str
+
+class StatusCheckPage(BaseModel):
+    items: List[StatusCheck]
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
+
+class StatusRollup(BaseModel):
+    client_name: str
+    granularity: str
+    bucket: datetime
+    count: int
+    first: datetime
+    last: datetime
+
+class StatusRollupPage(BaseModel):
+    items: List[StatusRollup]
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
@@ -0,0 +1,82 @@
+import base64
+import json
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from fastapi import HTTPException
+
+NEXT = "next"
+PREV = "prev"
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+def encode_cursor(timestamp: datetime, item_id: str, direction: str) -> str:
+    """Opaque cursor pointing just past (timestamp, id) in the given direction"""
+    millis = (timestamp - _EPOCH) // timedelta(milliseconds=1)
+    payload = json.dumps({"t": millis, "id": item_id, "d": direction}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str, str]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        direction = payload["d"]
+        if direction not in (NEXT, PREV):
+            raise ValueError(direction)
+        return _EPOCH + timedelta(milliseconds=int(payload["t"])), str(payload["id"]), direction
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def keyset_query(
+    base_filter: Dict[str, Any],
+    time_field: str,
+    cursor: Optional[str],
+    id_field: str = "id",
+) -> Tuple[Dict[str, Any], List[Tuple[str, int]], str]:
+    """Build the filter and sort for one page of a newest-first (time_field, id_field) keyset
+
+    Returns the filter, the sort to run it with and the page direction. Pages going
+    back towards newer items are fetched in ascending order and must be reversed.
+    """
+    if not cursor:
+        return base_filter, [(time_field, -1), (id_field, -1)], NEXT
+
+    timestamp, item_id, direction = decode_cursor(cursor)
+    op = "$lt" if direction == NEXT else "$gt"
+    position = {"$or": [
+        {time_field: {op: timestamp}},
+        {time_field: timestamp, id_field: {op: item_id}},
+    ]}
+    query_filter = {"$and": [base_filter, position]} if base_filter else position
+    order = -1 if direction == NEXT else 1
+    return query_filter, [(time_field, order), (id_field, order)], direction
+
+
+def keyset_page(
+    docs: List[Dict[str, Any]],
+    limit: int,
+    time_field: str,
+    cursor: Optional[str],
+    direction: str,
+    id_field: str = "id",
+) -> Tuple[List[Dict[str, Any]], Optional[str], Optional[str]]:
+    """Trim a limit + 1 fetch to one newest-first page and compute its cursors"""
+    has_more = len(docs) > limit
+    docs = docs[:limit]
+
+    if direction == PREV:
+        docs.reverse()
+        has_newer, has_older = has_more, True
+    else:
+        has_newer, has_older = bool(cursor), has_more
+
+    if not docs:
+        return docs, None, None
+
+    first, last = docs[0], docs[-1]
+    next_cursor = encode_cursor(last[time_field], last[id_field], NEXT) if has_older else None
+    prev_cursor = encode_cursor(first[time_field], first[id_field], PREV) if has_newer else None
+    return docs, next_cursor, prev_cursor
@@ -0,0 +1,213 @@
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from fastapi import HTTPException, Request
+from pymongo import monitoring
+
+RATE_LIMIT_ENABLED = os.environ.get('RATE_LIMIT_ENABLED', 'true').lower() == 'true'
+# Buckets kept per limiter; the least recently used one is dropped past this
+RATE_LIMIT_MAX_CLIENTS = int(os.environ.get('RATE_LIMIT_MAX_CLIENTS', '10000'))
+# Reverse proxies in front of the app that append to X-Forwarded-For; the client is
+# the address the outermost of them saw. The default of 0 uses the peer address and
+# ignores the header, which anyone can set when nothing in front of the app rewrites it.
+RATE_LIMIT_TRUSTED_PROXIES = int(os.environ.get('RATE_LIMIT_TRUSTED_PROXIES', '0'))
+
+# Shed writes while the smoothed Mongo command latency is above this (0 disables)
+OVERLOAD_LATENCY_MS = float(os.environ.get('OVERLOAD_LATENCY_MS', '500'))
+OVERLOAD_EWMA_ALPHA = float(os.environ.get('OVERLOAD_EWMA_ALPHA', '0.2'))
+# Latency older than this no longer counts, so shedding ends once traffic stops
+OVERLOAD_SAMPLE_TTL_SECONDS = float(os.environ.get('OVERLOAD_SAMPLE_TTL_SECONDS', '5'))
+OVERLOAD_RETRY_AFTER_SECONDS = 2
+# Commands that are slow by nature (export batches, stats pipelines) rather than a sign of overload
+OVERLOAD_UNSAMPLED_COMMANDS = frozenset({"getMore", "aggregate"})
+
+
+def parse_limit(value: str) -> Optional[Tuple[float, float]]:
+    """Parse "count/seconds" into (tokens per second, burst capacity); "off" or "0" disables"""
+    value = value.strip().lower()
+    if value in ('', '0', 'off'):
+        return None
+    count, _, seconds = value.partition('/')
+    count, seconds = float(count), float(seconds or 1)
+    return count / seconds, count
+
+
+class TokenBucketLimiter:
+    """Token buckets keyed by client, kept in LRU order
+
+    Each bucket is just (tokens, last refill time); refilling happens lazily when
+    the key is next seen, so idle clients cost nothing until they are evicted.
+    An evicted bucket comes back full, which is what it would have refilled to.
+    """
+
+    def __init__(self, rate: float, capacity: float, max_keys: int = RATE_LIMIT_MAX_CLIENTS):
+        self.rate = rate
+        self.capacity = capacity
+        self.max_keys = max_keys
+        self.buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+        self.allowed = 0
+        self.limited = 0
+        self.evicted = 0
+
+    def acquire(self, key: str, now: Optional[float] = None) -> float:
+        """Take one token; returns 0 when allowed, otherwise seconds until a token is available"""
+        now = time.monotonic() if now is None else now
+        tokens, updated = self.buckets.pop(key, (self.capacity, now))
+        tokens = min(self.capacity, tokens + (now - updated) * self.rate)
+
+        wait = 0.0
+        if tokens >= 1:
+            tokens -= 1
+            self.allowed += 1
+        else:
+            wait = (1 - tokens) / self.rate
+            self.limited += 1
+
+        self.buckets[key] = (tokens, now)
+        if len(self.buckets) > self.max_keys:
+            self.buckets.popitem(last=False)
+            self.evicted += 1
+        return wait
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "rate": self.rate,
+            "capacity": self.capacity,
+            "tracked": len(self.buckets),
+            "allowed": self.allowed,
+            "limited": self.limited,
+            "evicted": self.evicted,
+        }
+
+
+class MongoLatencyMonitor(monitoring.CommandListener):
+    """Exponentially weighted moving average of Mongo command latency
+
+    Registered on the client as a command listener, so it sees every command the
+    app runs, except those in OVERLOAD_UNSAMPLED_COMMANDS: a long admin export
+    should not make contact writes look overloaded. pymongo calls it from worker
+    threads, hence the lock.
+    """
+
+    def __init__(self, alpha: float = OVERLOAD_EWMA_ALPHA, threshold_ms: float = OVERLOAD_LATENCY_MS):
+        self.alpha = alpha
+        self.threshold_ms = threshold_ms
+        self.ewma_ms = 0.0
+        self.last_sample = 0.0
+        self.samples = 0
+        self._lock = threading.Lock()
+
+    def observe(self, duration_ms: float) -> None:
+        with self._lock:
+            self.ewma_ms = duration_ms if not self.samples else self.alpha * duration_ms + (1 - self.alpha) * self.ewma_ms
+            self.samples += 1
+            self.last_sample = time.monotonic()
+
+    def started(self, event) -> None:
+        pass
+
+    def succeeded(self, event) -> None:
+        if event.command_name not in OVERLOAD_UNSAMPLED_COMMANDS:
+            self.observe(event.duration_micros / 1000)
+
+    def failed(self, event) -> None:
+        if event.command_name not in OVERLOAD_UNSAMPLED_COMMANDS:
+            self.observe(event.duration_micros / 1000)
+
+    @property
+    def overloaded(self) -> bool:
+        if self.threshold_ms <= 0 or not self.samples:
+            return False
+        if time.monotonic() - self.last_sample > OVERLOAD_SAMPLE_TTL_SECONDS:
+            return False
+        return self.ewma_ms > self.threshold_ms
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "ewmaMs": round(self.ewma_ms, 3),
+            "thresholdMs": self.threshold_ms,
+            "samples": self.samples,
+            "overloaded": self.overloaded,
+        }
+
+
+mongo_latency = MongoLatencyMonitor()
+
+
+def client_ip(request: Request, trusted_proxies: int = RATE_LIMIT_TRUSTED_PROXIES) -> str:
+    """Address of the client, as seen by the outermost trusted proxy
+
+    Each proxy appends the address it received the request from, so only the
+    rightmost `trusted_proxies` entries of X-Forwarded-For can be believed; the
+    ones to their left are whatever the client chose to send. With no trusted
+    proxies the header is ignored entirely.
+    """
+    peer = request.client.host if request.client else "unknown"
+    if trusted_proxies <= 0:
+        return peer
+    hops = [hop.strip() for hop in request.headers.get("x-forwarded-for", "").split(",") if hop.strip()]
+    if not hops:
+        return peer
+    return hops[-min(trusted_proxies, len(hops))]
+
+
+class RateLimit:
+    """FastAPI dependency enforcing per-client and global token buckets for one route
+
+    Limits default to the given "count/seconds" strings and can be overridden with
+    RATE_LIMIT_<NAME>_PER_IP and RATE_LIMIT_<NAME>_GLOBAL.
+    """
+
+    def __init__(self, name: str, per_ip: str, global_limit: str, shed_on_overload: bool = False):
+        self.name = name
+        self.shed_on_overload = shed_on_overload
+        self.shed = 0
+
+        env_prefix = f"RATE_LIMIT_{name.upper()}"
+        per_ip_limit = parse_limit(os.environ.get(f"{env_prefix}_PER_IP", per_ip))
+        global_bucket_limit = parse_limit(os.environ.get(f"{env_prefix}_GLOBAL", global_limit))
+        self.per_ip = TokenBucketLimiter(*per_ip_limit) if per_ip_limit else None
+        self.global_bucket = TokenBucketLimiter(*global_bucket_limit, max_keys=1) if global_bucket_limit else None
+
+    async def __call__(self, request: Request) -> None:
+        if not RATE_LIMIT_ENABLED:
+            return
+
+        if self.shed_on_overload and mongo_latency.overloaded:
+            self.shed += 1
+            raise HTTPException(
+                status_code=503,
+                detail="Service is overloaded, please retry shortly",
+                headers={"Retry-After": str(OVERLOAD_RETRY_AFTER_SECONDS)}
+            )
+
+        # A single noisy client is turned away before it can drain the global bucket
+        if self.per_ip:
+            self._check(self.per_ip.acquire(client_ip(request)))
+        if self.global_bucket:
+            self._check(self.global_bucket.acquire("*"))
+
+    def _check(self, wait: float) -> None:
+        if wait:
+            raise HTTPException(
+                status_code=429,
+                detail="Too many requests",
+                headers={"Retry-After": str(max(1, math.ceil(wait)))}
+            )
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "perIp": self.per_ip.stats() if self.per_ip else None,
+            "global": self.global_bucket.stats() if self.global_bucket else None,
+            "shed": self.shed,
+        }
+
+
+# Enough for a person re-sending a form, far below what a bot needs
+contact_rate_limit = RateLimit("contact", per_ip="5/60", global_limit="20/1", shed_on_overload=True)
+
+RATE_LIMITS = {contact_rate_limit.name: contact_rate_limit}
@@ -0,0 +1,132 @@
+from fastapi import APIRouter, HTTPException, Depends, File, Query, Request, UploadFile
+from fastapi.responses import FileResponse, Response, StreamingResponse
+from typing import Optional
+import asyncio
+import logging
+from pymongo.errors import DuplicateKeyError
+
+from models.portfolio import AssetInfo
+from database import get_database
+from serialization import json_response, to_json_bytes
+from assets import (
+    ASSET_ID_RE,
+    ASSET_MAX_UPLOAD_BYTES,
+    IMMUTABLE_CACHE_CONTROL,
+    AssetError,
+    RangeNotSatisfiable,
+    asset_metadata,
+    blob_path,
+    parse_range,
+    read_range,
+    select_blob,
+    store_asset,
+)
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+UPLOAD_READ_SIZE = 1024 * 1024
+
+async def _get_asset(asset_id: str, db) -> dict:
+    if not ASSET_ID_RE.match(asset_id):
+        raise HTTPException(status_code=404, detail="Asset not found")
+    asset = asset_metadata.get(asset_id)
+    if asset is None:
+        asset = await db.assets.find_one({"id": asset_id}, {"_id": 0})
+        if asset is None:
+            raise HTTPException(status_code=404, detail="Asset not found")
+        asset_metadata.set(asset_id, asset)
+    return asset
+
+@router.post("/assets", response_model=AssetInfo, status_code=201)
+async def upload_asset(file: UploadFile = File(...), db = Depends(get_database)):
+    """Upload an image; it is stored under its sha256 with precomputed width variants (admin endpoint)"""
+    try:
+        # Read in chunks so an oversized upload is rejected without holding all of it
+        chunks, size = [], 0
+        while chunk := await file.read(UPLOAD_READ_SIZE):
+            size += len(chunk)
+            if size > ASSET_MAX_UPLOAD_BYTES:
+                raise HTTPException(status_code=413, detail=f"Uploads are limited to {ASSET_MAX_UPLOAD_BYTES} bytes")
+            chunks.append(chunk)
+
+        try:
+            document = await asyncio.to_thread(store_asset, b"".join(chunks), file.filename, file.content_type)
+        except AssetError as e:
+            raise HTTPException(status_code=415, detail=str(e))
+
+        try:
+            await db.assets.insert_one(dict(document))
+        except DuplicateKeyError:
+            # Same bytes were uploaded before; the stored blob and metadata are reused
+            existing = await db.assets.find_one({"id": document["id"]}, {"_id": 0})
+            return json_response(to_json_bytes(AssetInfo(**existing)), status_code=200)
+
+        return json_response(to_json_bytes(AssetInfo(**document)), status_code=201)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error uploading asset: {str(e)}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+@router.get("/assets/{asset_id}/info", response_model=AssetInfo)
+async def get_asset_info(asset_id: str, db = Depends(get_database)):
+    """Get an asset's metadata and available widths"""
+    try:
+        return json_response(to_json_bytes(AssetInfo(**await _get_asset(asset_id, db))))
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error fetching asset {asset_id}: {str(e)}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+@router.api_route("/assets/{asset_id}", methods=["GET", "HEAD"])
+async def get_asset(
+    asset_id: str,
+    request: Request,
+    w: Optional[int] = Query(None, ge=1, le=10000),
+    db = Depends(get_database)
+):
+    """Serve an asset, or its closest width variant for `w`, with range support and immutable caching"""
+    try:
+        asset = await _get_asset(asset_id, db)
+        digest, size = select_blob(asset, w)
+        path = blob_path(digest)
+        etag = f'"{digest}"'
+        headers = {
+            "ETag": etag,
+            "Cache-Control": IMMUTABLE_CACHE_CONTROL,
+            "Accept-Ranges": "bytes",
+            "X-Content-Type-Options": "nosniff",
+        }
+        if asset["contentType"] == "image/svg+xml":
+            # SVG can carry script; never let it run in our origin
+            headers["Content-Security-Policy"] = "default-src 'none'; style-src 'unsafe-inline'; sandbox"
+
+        if request.headers.get("if-none-match") in (etag, f"W/{etag}"):
+            return Response(status_code=304, headers=headers)
+
+        # A stale If-Range means the client's partial copy is of something else: send it all
+        if_range = request.headers.get("if-range")
+        byte_range = None
+        if if_range is None or if_range == etag:
+            try:
+                byte_range = parse_range(request.headers.get("range"), size)
+            except RangeNotSatisfiable:
+                return Response(status_code=416, headers={**headers, "Content-Range": f"bytes */{size}"})
+
+        if byte_range is None:
+            # Uses http.response.pathsend (zero-copy) where the server supports it
+            return FileResponse(path, media_type=asset["contentType"], headers=headers)
+
+        start, end = byte_range
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+        headers["Content-Length"] = str(end - start + 1)
+        if request.method == "HEAD":
+            return Response(status_code=206, headers=headers, media_type=asset["contentType"])
+        return StreamingResponse(read_range(path, start, end), status_code=206, headers=headers, media_type=asset["contentType"])
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error serving asset {asset_id}: {str(e)}")
+        raise HTTPException(status_code=500, detail="Internal server error")
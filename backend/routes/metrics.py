@@ -0,0 +1,71 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from typing import List
+
+from metrics import render_samples, render_metrics
+from cache import portfolio_cache, tenant_cache
+from contact_buffer import contact_write_buffer
+from ratelimit import RATE_LIMITS, mongo_latency
+from search import search_index
+from snapshot import portfolio_snapshot
+from broadcast import contact_events
+from dedupe import contact_dedupe
+
+router = APIRouter()
+
+PROMETHEUS_MEDIA_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+def _app_state() -> List[str]:
+    """Samples read from the in-process caches, queues and limiters at scrape time"""
+    cache_stats = portfolio_cache.stats()
+    buffer_stats = contact_write_buffer.stats()
+    tenant_stats = tenant_cache.stats()
+
+    lines = []
+    lines += render_samples("portfolio_cache_events_total", "Portfolio cache lookups by outcome", [
+        ({"event": event}, cache_stats[event]) for event in ("hits", "misses", "revalidations", "invalidations")
+    ], "counter")
+    lines += render_samples("tenant_cache_events_total", "Tenant portfolio cache lookups and evictions by outcome", [
+        ({"event": event}, tenant_stats[event]) for event in ("hits", "misses", "revalidations", "invalidations", "evictions")
+    ], "counter")
+    lines += render_samples("tenant_cache_evicted_bytes_total", "Payload bytes evicted from the tenant portfolio cache", [({}, tenant_stats["evictedBytes"])], "counter")
+    lines += render_samples("tenant_cache_entries", "Tenant portfolios held in the cache", [({}, tenant_stats["entries"])])
+    lines += render_samples("tenant_cache_bytes", "Payload bytes held by the tenant portfolio cache", [({}, tenant_stats["bytes"])])
+    lines += render_samples("contact_buffer_depth", "Contact submissions waiting in the write-behind queue", [({}, buffer_stats["depth"])])
+    lines += render_samples("contact_buffer_submissions_total", "Contact submissions through the write-behind queue by outcome", [
+        ({"outcome": outcome}, buffer_stats[outcome]) for outcome in ("enqueued", "rejected", "flushed", "failed")
+    ], "counter")
+    lines += render_samples("rate_limit_decisions_total", "Rate limiter decisions by route, bucket and outcome", [
+        ({"route": name, "bucket": bucket, "outcome": outcome}, limiter_stats[outcome])
+        for name, limit in RATE_LIMITS.items()
+        for bucket, limiter_stats in limit.stats().items() if isinstance(limiter_stats, dict)
+        for outcome in ("allowed", "limited")
+    ], "counter")
+    lines += render_samples("rate_limit_shed_total", "Requests shed while Mongo was overloaded", [
+        ({"route": name}, limit.shed) for name, limit in RATE_LIMITS.items()
+    ], "counter")
+    lines += render_samples("mongo_latency_ewma_seconds", "Smoothed Mongo command latency used for load shedding", [
+        ({}, mongo_latency.ewma_ms / 1000)
+    ])
+    lines += render_samples("search_index_items", "Portfolio entries in the search index", [({}, len(search_index.items))])
+    snapshot_stats = portfolio_snapshot.stats()
+    lines += render_samples("portfolio_snapshot_events_total", "Portfolio snapshot writes and reloads by outcome", [
+        ({"event": event}, snapshot_stats[event]) for event in ("writes", "failures", "reloads")
+    ], "counter")
+    event_stats = contact_events.stats()
+    lines += render_samples("contact_events_subscribers", "Clients connected to the contact event stream", [({}, event_stats["subscribers"])])
+    lines += render_samples("contact_events_total", "Contact event stream activity by outcome", [
+        ({"event": event}, event_stats[event]) for event in ("published", "dropped", "resumed", "resets")
+    ], "counter")
+    dedupe_stats = contact_dedupe.stats()
+    lines += render_samples("contact_dedupe_checks_total", "Contact submissions checked for duplicates", [({}, dedupe_stats["checked"])], "counter")
+    lines += render_samples("contact_dedupe_suppressed_total", "Duplicate contact submissions suppressed, by where the repeat was caught", [
+        ({"source": "memory"}, dedupe_stats["suppressedMemory"]),
+        ({"source": "database"}, dedupe_stats["suppressedDatabase"]),
+    ], "counter")
+    return lines
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """Request, Mongo and in-process state metrics in Prometheus text format"""
+    return PlainTextResponse(render_metrics(_app_state()), media_type=PROMETHEUS_MEDIA_TYPE)
@@ -1,119 +1,550 @@
-from fastapi import APIRouter, HTTPException, Depends
-from typing import List, Optional
-from datetime import datetime
+from fastapi import APIRouter, HTTPException, Depends, Header, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from typing import AsyncIterator, List, Literal, Optional, Union
+from datetime import datetime, timezone
+import csv
+import io
 import logging
+from pydantic import TypeAdapter
+from pymongo import ReturnDocument, UpdateOne
+from pymongo.errors import DuplicateKeyError
 
 from models.portfolio import (
+    DEFAULT_PORTFOLIO_FILTER,
+    PORTFOLIO_SECTIONS,
+    portfolio_document,
     PortfolioData, 
     PortfolioDataCreate, 
     PortfolioDataUpdate,
     ContactSubmission,
-    ContactSubmissionCreate
+    ContactSubmissionCreate,
+    ContactSubmissionPage,
+    ContactStatus,
+    ContactBulkStatusUpdate,
+    ContactBulkStatusResult,
+    ContactStats,
+    ContactStatusUpdateResult,
+    SearchResults
 )
 from database import get_database
+from cache import CachedPortfolio, portfolio_cache, portfolio_version
+from conditional import http_date, is_not_modified, make_etag, parse_etag, validator_headers
+from compression import compress, negotiate_encoding
+from serialization import json_response, to_json_bytes
+from pagination import keyset_page, keyset_query
+from contact_buffer import ContactBufferFull, contact_write_buffer
+from search import search_index
+from snapshot import portfolio_snapshot
+from ratelimit import RATE_LIMITS, contact_rate_limit, mongo_latency
+from contact_stats import aggregate_stats, read_counters, rebuild_counters, record_status_changes, record_submissions
+from broadcast import TooManySubscribers, contact_events
+from dedupe import contact_dedupe, fingerprint
+
+# Upper bound on hits returned by one search
+MAX_SEARCH_RESULTS = 100
+# Upper bound on a single cursor page
+MAX_PAGE_SIZE = 1000
+# Upper bound on (id, status) pairs in one bulk status update
+MAX_BULK_STATUS_UPDATES = 1000
+
+CONTACT_EXPORT_FIELDS = list(ContactSubmission.model_fields)
+CONTACT_EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv; charset=utf-8"}
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+# Validators for single sections, so section reads skip the full PortfolioData model
+SECTION_ADAPTERS = {section: TypeAdapter(section_type) for section, section_type in PORTFOLIO_SECTIONS.items()}
+
+async def load_latest_portfolio(db) -> CachedPortfolio:
+    """Get the most recent portfolio, served from the in-process cache when possible"""
+    cached = portfolio_cache.get()
+    if cached:
+        return cached
+
+    # With caching off there is nothing to refill; concurrent reads go to Mongo side by side
+    if not portfolio_cache.enabled:
+        return await _read_latest_portfolio(db)
+
+    async with portfolio_cache.lock:
+        # Another request may have refreshed the cache while we waited
+        cached = portfolio_cache.get()
+        if cached:
+            return cached
+
+        # An expired entry is still good if its version matches the latest document
+        stale = portfolio_cache.peek()
+        if stale:
+            latest = await db.portfolio.find_one(DEFAULT_PORTFOLIO_FILTER, {"updatedAt": 1}, sort=[("updatedAt", -1)])
+            if latest and portfolio_version(latest["updatedAt"]) == stale.version:
+                portfolio_cache.touch(stale)
+                return stale
+
+        return await _read_latest_portfolio(db)
+
+async def _read_latest_portfolio(db) -> CachedPortfolio:
+    portfolio_cache.misses += 1
+    portfolio_data = await db.portfolio.find_one(DEFAULT_PORTFOLIO_FILTER, sort=[("updatedAt", -1)])
+
+    if not portfolio_data:
+        portfolio_cache.invalidate()
+        raise HTTPException(status_code=404, detail="Portfolio data not found")
+
+    return portfolio_cache.set(PortfolioData(**portfolio_data))
+
+def versioned_response(request: Request, etag: str, version: datetime, last_modified: str, body: bytes, encode) -> Response:
+    """Serve a versioned JSON payload with validators, 304 revalidation and compressed variants"""
+    encoding = negotiate_encoding(request.headers.get("accept-encoding"), len(body))
+    headers = validator_headers(etag, last_modified, encoding)
+
+    # Let clients holding the current version revalidate without a body
+    if is_not_modified(request.headers, etag, version):
+        headers.pop("Content-Encoding", None)
+        return Response(status_code=304, headers=headers)
+
+    return json_response(encode(encoding) if encoding else body, headers=headers)
+
 @router.get("/portfolio", response_model=PortfolioData)
-async def get_portfolio_data(db = Depends(get_database)):
+async def get_portfolio_data(request: Request, db = Depends(get_database)):
     """Get the current portfolio data"""
     try:
-        # Get the most recent portfolio data
-        portfolio_data = await db.portfolio.find_one({}, sort=[("updatedAt", -1)])
-        
-        if not portfolio_data:
-            raise HTTPException(status_code=404, detail="Portfolio data not found")
-        
-        return PortfolioData(**portfolio_data)
+        cached = await load_latest_portfolio(db)
+        # Compressed variants are built once per version and reused
+        return versioned_response(request, cached.etag, cached.version, cached.last_modified, cached.body, cached.encoded_body)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error fetching portfolio data: {str(e)}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
+@router.get("/portfolio/search", response_model=SearchResults)
+async def search_portfolio(
+    q: str = Query(..., min_length=1, max_length=200),
+    section: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=MAX_SEARCH_RESULTS),
+    db = Depends(get_database)
+):
+    """Search projects, experience, skills, certifications and achievements"""
+    try:
+        cached = await load_latest_portfolio(db)
+        # No-op unless the portfolio changed outside this process's write paths
+        search_index.sync(cached.portfolio, cached.version)
+        hits = search_index.search(q, limit=limit, section=section)
+        return json_response(to_json_bytes({"query": q, "hits": hits}))
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error searching portfolio: {str(e)}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+@router.get("/portfolio/{section}")
+async def get_portfolio_section(section: str, request: Request, db = Depends(get_database)):
+    """Get a single section of the current portfolio data"""
+    try:
+        adapter = SECTION_ADAPTERS.get(section)
+        if adapter is None:
+            raise HTTPException(status_code=404, detail="Portfolio section not found")
+
+        cached = portfolio_cache.get()
+        if cached:
+            portfolio_id, version = cached.portfolio.id, cached.version
+            section_body = cached.section_body(section)
+            encode = lambda encoding: cached.encoded_body(encoding, section)
+        else:
+            # Only pull the requested field out of the latest document
+            portfolio_data = await db.portfolio.find_one(
+                DEFAULT_PORTFOLIO_FILTER,
+                {section: 1, "id": 1, "updatedAt": 1, "_id": 0},
+                sort=[("updatedAt", -1)]
+            )
+
+            if not portfolio_data or section not in portfolio_data:
+                raise HTTPException(status_code=404, detail="Portfolio data not found")
+
+            portfolio_id, version = portfolio_data["id"], portfolio_version(portfolio_data["updatedAt"])
+            section_body = to_json_bytes(adapter.validate_python(portfolio_data[section]))
+            encode = lambda encoding: compress(section_body, encoding)
+
+        etag = make_etag(f"{portfolio_id}.{section}", version)
+        return versioned_response(request, etag, version, http_date(version), section_body, encode)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error fetching portfolio section {section}: {str(e)}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+async def publish_portfolio(cached: CachedPortfolio) -> None:
+    """Bring the search index and static snapshot up to date with a newly written version"""
+    search_index.sync(cached.portfolio, cached.version)
+    await portfolio_snapshot.publish(cached)
+
+def version_headers(cached: CachedPortfolio) -> dict:
+    """Validators for a freshly written version, usable as If-Match on the next edit"""
+    return {"ETag": cached.etag, "Last-Modified": cached.last_modified}
+
+async def latest_version_filter(db, if_match: Optional[str]) -> dict:
+    """Filter pinning a write to the latest default portfolio document
+
+    With If-Match the ETag must name the latest version: an older version that
+    still exists is stale too, and writing it would bump it back over newer ones.
+    The filter then also pins updatedAt, so a concurrent edit of the document
+    makes the write match nothing.
+    """
+    expected = None
+    if if_match is not None and if_match.strip() != "*":
+        expected = parse_etag(if_match)
+        if expected is None:
+            raise HTTPException(status_code=400, detail="Invalid If-Match header")
+
+    latest = await db.portfolio.find_one(DEFAULT_PORTFOLIO_FILTER, {"id": 1, "updatedAt": 1}, sort=[("updatedAt", -1)])
+    if not latest:
+        raise HTTPException(status_code=404, detail="Portfolio data not found")
+    if expected is None:
+        return {"_id": latest["_id"]}
+    if (latest["id"], portfolio_version(latest["updatedAt"])) != expected:
+        raise HTTPException(status_code=409, detail="Portfolio data was modified by another request")
+    return {"_id": latest["_id"], "updatedAt": latest["updatedAt"]}
+
 @router.post("/portfolio", response_model=PortfolioData)
 async def create_portfolio_data(portfolio_data: PortfolioDataCreate, db = Depends(get_database)):
     """Create or update portfolio data"""
     try:
-        # Create new portfolio data
+        # Create new portfolio data, with timestamps at the precision Mongo stores
         new_portfolio = PortfolioData(**portfolio_data.dict())
+        new_portfolio.createdAt = new_portfolio.updatedAt = portfolio_version(new_portfolio.updatedAt)
         
         # Insert into database
-        result = await db.portfolio.insert_one(new_portfolio.dict())
+        result = await db.portfolio.insert_one(portfolio_document(new_portfolio))
         
         if result.inserted_id:
-            return new_portfolio
+            # The new document is now the latest one
+            cached = portfolio_cache.set(new_portfolio)
+            await publish_portfolio(cached)
+            return json_response(cached.body, headers=version_headers(cached))
         else:
             raise HTTPException(status_code=500, detail="Failed to create portfolio data")
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error creating portfolio data: {str(e)}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
 @router.put("/portfolio", response_model=PortfolioData)
-async def update_portfolio_data(portfolio_update: PortfolioDataUpdate, db = Depends(get_database)):
-    """Update existing portfolio data"""
+async def update_portfolio_data(
+    portfolio_update: PortfolioDataUpdate,
+    if_match: Optional[str] = Header(None),
+    db = Depends(get_database)
+):
+    """Update existing portfolio data
+
+    Send the ETag of the version being edited as If-Match to get a 409 instead of
+    overwriting someone else's change.
+    """
     try:
-        # Get current portfolio data
-        current_portfolio = await db.portfolio.find_one({}, sort=[("updatedAt", -1)])
-        
-        if not current_portfolio:
-            raise HTTPException(status_code=404, detail="Portfolio data not found")
-        
+        # Only touch the version the client last saw, when it tells us which one that is;
+        # otherwise the sorted write below lands on the latest without a separate read
+        if if_match is not None and if_match.strip() != "*":
+            query_filter = await latest_version_filter(db, if_match)
+        else:
+            query_filter = dict(DEFAULT_PORTFOLIO_FILTER)
+
         # Update fields that are provided
         update_dict = portfolio_update.dict(exclude_unset=True)
-        update_dict["updatedAt"] = datetime.utcnow()
+        update_dict["updatedAt"] = portfolio_version(datetime.utcnow())
         
-        # Update the document
-        result = await db.portfolio.update_one(
-            {"_id": current_portfolio["_id"]},
-            {"$set": update_dict}
+        # Update the latest matching document and read it back in one round-trip
+        updated_portfolio = await db.portfolio.find_one_and_update(
+            query_filter,
+            {"$set": update_dict},
+            sort=[("updatedAt", -1)],
+            return_document=ReturnDocument.AFTER
         )
         
-        if result.modified_count > 0:
-            # Return updated data
-            updated_portfolio = await db.portfolio.find_one({"_id": current_portfolio["_id"]})
-            return PortfolioData(**updated_portfolio)
-        else:
-            raise HTTPException(status_code=500, detail="Failed to update portfolio data")
+        if not updated_portfolio:
+            # A pinned version that no longer matches was edited concurrently
+            if "updatedAt" in query_filter:
+                raise HTTPException(status_code=409, detail="Portfolio data was modified by another request")
+            raise HTTPException(status_code=404, detail="Portfolio data not found")
+
+        cached = portfolio_cache.set(PortfolioData(**updated_portfolio))
+        await publish_portfolio(cached)
+        return json_response(cached.body, headers=version_headers(cached))
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error updating portfolio data: {str(e)}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
-@router.post("/contact", response_model=ContactSubmission)
+def _duplicate_response(submission_doc: dict, original: dict) -> Response:
+    if contact_dedupe.policy == "reject":
+        raise HTTPException(status_code=409, detail="Duplicate submission")
+    return json_response(to_json_bytes(ContactSubmission(**{**submission_doc, **original})))
+
+async def _store_submission(new_submission: ContactSubmission, submission_doc: dict, db) -> Response:
+    # Hand off to the write-behind buffer; the id is known before the write lands
+    if contact_write_buffer.running:
+        try:
+            await contact_write_buffer.enqueue(submission_doc)
+        except ContactBufferFull:
+            raise HTTPException(
+                status_code=503,
+                detail="Contact form is busy, please retry shortly",
+                headers={"Retry-After": "1"}
+            )
+        return json_response(to_json_bytes(new_submission))
+
+    # Insert into database
+    result = await db.contact_submissions.insert_one(submission_doc)
+
+    if result.inserted_id:
+        await record_submissions(db, [submission_doc])
+        # The admin event stream is the default portfolio's
+        if new_submission.tenant is None:
+            contact_events.publish("contact.created", new_submission)
+        return json_response(to_json_bytes(new_submission))
+    else:
+        raise HTTPException(status_code=500, detail="Failed to submit contact form")
+
+async def accept_submission(new_submission: ContactSubmission, db) -> Response:
+    """Store a contact submission unless it repeats a recent one"""
+    submission_doc = new_submission.dict()
+
+    # Repeats within the dedupe window are answered without storing anything
+    fingerprint_key = None
+    if contact_dedupe.enabled:
+        fingerprint_key = fingerprint(new_submission.email, new_submission.subject, new_submission.message, new_submission.tenant)
+        original = contact_dedupe.claim(fingerprint_key, submission_doc)
+        if original is not None:
+            return _duplicate_response(submission_doc, original)
+        # Its unique index refuses repeats that reached other workers, when the submission is written
+        submission_doc["dedupeKey"] = contact_dedupe.storage_key(fingerprint_key, new_submission.submittedAt)
+
+    # Unless this submission or the one it repeats is stored, a retry must not be treated as a duplicate
+    release_claim = fingerprint_key is not None
+    try:
+        response = await _store_submission(new_submission, submission_doc, db)
+        release_claim = False
+        return response
+    except DuplicateKeyError:
+        # Another worker stored the same message within the dedupe window
+        original = await contact_dedupe.stored_original(db, submission_doc["dedupeKey"]) if fingerprint_key else None
+        if original is None:
+            raise
+        # The claim now points at the stored original
+        release_claim = False
+        return _duplicate_response(submission_doc, original)
+    finally:
+        if release_claim:
+            contact_dedupe.release(fingerprint_key)
+
+@router.post("/contact", response_model=ContactSubmission, dependencies=[Depends(contact_rate_limit)])
 async def submit_contact_form(contact_data: ContactSubmissionCreate, db = Depends(get_database)):
     """Submit a contact form"""
     try:
         # Create new contact submission
-        new_submission = ContactSubmission(**contact_data.dict())
-        
-        # Insert into database
-        result = await db.contact_submissions.insert_one(new_submission.dict())
-        
-        if result.inserted_id:
-            return new_submission
-        else:
-            raise HTTPException(status_code=500, detail="Failed to submit contact form")
+        return await accept_submission(ContactSubmission(**contact_data.dict()), db)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error submitting contact form: {str(e)}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
-@router.get("/contact", response_model=List[ContactSubmission])
+def _as_utc_naive(value: Optional[datetime]) -> Optional[datetime]:
+    """Mongo stores naive UTC datetimes; convert aware query parameters to match"""
+    if value is not None and value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+def _csv_chunk(rows: List[list]) -> bytes:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    return buffer.getvalue().encode("utf-8")
+
+async def _stream_contact_export(cursor, export_format: str, batch_size: int) -> AsyncIterator[bytes]:
+    """Encode submissions one cursor batch at a time so memory stays flat"""
+    if export_format == "csv":
+        yield _csv_chunk([CONTACT_EXPORT_FIELDS])
+
+    batch = []
+    try:
+        async for submission in cursor:
+            batch.append(submission)
+            if len(batch) >= batch_size:
+                yield _encode_export_batch(batch, export_format)
+                batch = []
+        if batch:
+            yield _encode_export_batch(batch, export_format)
+    except Exception as e:
+        # Headers are already sent, so the truncated stream is all we can signal
+        logger.error(f"Error streaming contact export: {str(e)}")
+        raise
+    finally:
+        await cursor.close()
+
+def _encode_export_batch(batch: List[dict], export_format: str) -> bytes:
+    if export_format == "csv":
+        return _csv_chunk([
+            [value.isoformat() if isinstance(value, datetime) else value for value in (submission.get(field) for field in CONTACT_EXPORT_FIELDS)]
+            for submission in batch
+        ])
+    return b"".join(to_json_bytes(submission) + b"\n" for submission in batch)
+
+@router.get("/contact/export")
+async def export_contact_submissions(
+    format: Literal["ndjson", "csv"] = "ndjson",
+    status: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    batch_size: int = Query(500, ge=1, le=10000),
+    tenant: Optional[str] = None,
+    db = Depends(get_database)
+):
+    """Stream all matching contact submissions as NDJSON or CSV (admin endpoint)
+
+    Covers the default portfolio unless `tenant` names a hosted one.
+    """
+    # Build query filter
+    query_filter = {"tenant": tenant}
+    if status:
+        query_filter["status"] = status
+    since, until = _as_utc_naive(since), _as_utc_naive(until)
+    if since or until:
+        query_filter["submittedAt"] = {}
+        if since:
+            query_filter["submittedAt"]["$gte"] = since
+        if until:
+            query_filter["submittedAt"]["$lt"] = until
+
+    projection = {field: 1 for field in CONTACT_EXPORT_FIELDS}
+    projection["_id"] = 0
+    cursor = db.contact_submissions.find(query_filter, projection).sort([("submittedAt", 1), ("id", 1)]).batch_size(batch_size)
+
+    return StreamingResponse(
+        _stream_contact_export(cursor, format, batch_size),
+        media_type=CONTACT_EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="contact_submissions.{format}"'}
+    )
+
+@router.get("/contact/buffer")
+async def get_contact_buffer_stats():
+    """Get write-behind queue depth and flush latency (admin endpoint)"""
+    return contact_write_buffer.stats()
+
+@router.get("/contact/dedupe")
+async def get_contact_dedupe_stats():
+    """Get duplicate suppression statistics"""
+    return contact_dedupe.stats()
+
+@router.get("/contact/limits")
+async def get_contact_rate_limits():
+    """Get rate limiter and overload shedding state (admin endpoint)"""
+    return {
+        "limits": {name: limit.stats() for name, limit in RATE_LIMITS.items()},
+        "mongoLatency": mongo_latency.stats()
+    }
+
+@router.get("/contact/stats", response_model=ContactStats)
+async def get_contact_stats(
+    days: int = Query(30, ge=1, le=366),
+    granularity: Literal["day", "hour"] = "day",
+    source: Literal["counters", "aggregate"] = "counters",
+    db = Depends(get_database)
+):
+    """Get the default portfolio's submission counts by status, per day or hour, and the age of the unread backlog (admin endpoint)
+
+    `counters` reads the materialized counters; `aggregate` recomputes everything
+    from contact_submissions and is the fallback until the counters exist.
+    """
+    try:
+        stats = None
+        if source == "counters":
+            stats = await read_counters(db, days, granularity)
+        if stats is None:
+            stats = await aggregate_stats(db, days, granularity)
+        return json_response(to_json_bytes(stats))
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error computing contact stats: {str(e)}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+@router.post("/contact/stats/rebuild")
+async def rebuild_contact_stats(db = Depends(get_database)):
+    """Recompute the materialized contact counters from the submissions (admin endpoint)"""
+    try:
+        return await rebuild_counters(db)
+    except Exception as e:
+        logger.error(f"Error rebuilding contact stats: {str(e)}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+@router.get("/contact/events")
+async def stream_contact_events(
+    last_event_id: Optional[str] = Header(None),
+    lastEventId: Optional[str] = None
+):
+    """Server-Sent Events stream of new and status-changed submissions to the default portfolio (admin endpoint)
+
+    Resumes after the `Last-Event-ID` header (or `lastEventId` query parameter);
+    a `reset` event means the gap could not be replayed and the list should be reloaded.
+    """
+    try:
+        subscriber, backlog = contact_events.subscribe(last_event_id or lastEventId)
+    except TooManySubscribers:
+        raise HTTPException(status_code=503, detail="Too many event subscribers", headers={"Retry-After": "5"})
+
+    return StreamingResponse(
+        contact_events.stream(subscriber, backlog),
+        media_type="text/event-stream",
+        # Stop reverse proxies from buffering the stream
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.get("/contact/events/stats")
+async def get_contact_event_stats():
+    """Get event stream subscriber and delivery statistics"""
+    return contact_events.stats()
+
+@router.get("/contact", response_model=Union[List[ContactSubmission], ContactSubmissionPage])
 async def get_contact_submissions(
     status: Optional[str] = None,
     limit: int = 100,
     skip: int = 0,
+    cursor: Optional[str] = None,
+    tenant: Optional[str] = None,
     db = Depends(get_database)
 ):
-    """Get contact form submissions (admin endpoint)"""
+    """Get contact form submissions (admin endpoint)
+
+    Passing `cursor` (empty for the first page) switches to keyset pagination over
+    (submittedAt, id) and returns a page with next/prev cursors. Without it the
+    legacy skip/limit list is returned. Lists the default portfolio's submissions
+    unless `tenant` names a hosted portfolio.
+    """
     try:
-        # Build query filter
-        query_filter = {}
+        # Build query filter; submissions to other portfolios never show up in this one's list
+        query_filter = {"tenant": tenant}
         if status:
             query_filter["status"] = status
-        
+
+        if cursor is not None:
+            limit = max(1, min(limit, MAX_PAGE_SIZE))
+            page_filter, sort, direction = keyset_query(query_filter, "submittedAt", cursor)
+            docs = await db.contact_submissions.find(page_filter).sort(sort).limit(limit + 1).to_list(limit + 1)
+            docs, next_cursor, prev_cursor = keyset_page(docs, limit, "submittedAt", cursor, direction)
+
+            page = ContactSubmissionPage(
+                items=[ContactSubmission(**submission) for submission in docs],
+                next_cursor=next_cursor,
+                prev_cursor=prev_cursor
+            )
+            return json_response(to_json_bytes(page))
+
         # Get submissions
-        submissions = await db.contact_submissions.find(query_filter).skip(skip).limit(limit).sort("submittedAt", -1).to_list(limit)
+        submissions = await db.contact_submissions.find(query_filter).sort([("submittedAt", -1), ("id", -1)]).skip(skip).limit(limit).to_list(limit)
         
-        return [ContactSubmission(**submission) for submission in submissions]
+        return json_response(to_json_bytes([ContactSubmission(**submission) for submission in submissions]))
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error fetching contact submissions: {str(e)}")
         raise HTTPException(status_code=500, detail="Internal server error")
@@ -121,21 +552,129 @@ async def get_contact_submissions(
 @router.put("/contact/{submission_id}")
 async def update_contact_submission_status(
     submission_id: str,
-    status: str,
+    status: ContactStatus,
     db = Depends(get_database)
 ):
     """Update contact submission status"""
     try:
-        # Update submission status
-        result = await db.contact_submissions.update_one(
+        # Update submission status, reading the previous one for the counters
+        previous = await db.contact_submissions.find_one_and_update(
             {"id": submission_id},
-            {"$set": {"status": status}}
+            {"$set": {"status": status}},
+            projection={"status": 1, "tenant": 1, "_id": 0},
+            return_document=ReturnDocument.BEFORE
         )
         
-        if result.modified_count > 0:
+        if previous is not None:
+            # Counters and events cover the default portfolio only
+            if previous.get("tenant") is not None:
+                return {"message": "Status updated successfully"}
+            await record_status_changes(db, {previous.get("status"): {status: 1}})
+            if previous.get("status") != status:
+                contact_events.publish("contact.status", {"id": submission_id, "status": status, "previousStatus": previous.get("status")})
             return {"message": "Status updated successfully"}
         else:
             raise HTTPException(status_code=404, detail="Submission not found")
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error updating submission status: {str(e)}")
-        raise HTTPException(status_code=500, detail="Internal server error")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+@router.post("/contact/bulk-status", response_model=ContactBulkStatusResult)
+async def bulk_update_contact_status(bulk_update: ContactBulkStatusUpdate, db = Depends(get_database)):
+    """Update the status of many contact submissions in one round-trip (admin endpoint)
+
+    Only submissions to the default portfolio are touched unless `tenant` names a hosted one.
+    """
+    try:
+        # Counters and the admin event stream cover the default portfolio only
+        default_portfolio = bulk_update.tenant is None
+        if bulk_update.updates is not None:
+            if bulk_update.filter is not None or bulk_update.status is not None:
+                raise HTTPException(status_code=400, detail="Provide either updates or filter with status, not both")
+            if len(bulk_update.updates) > MAX_BULK_STATUS_UPDATES:
+                raise HTTPException(status_code=400, detail=f"At most {MAX_BULK_STATUS_UPDATES} updates per request")
+
+            # The last update for an id wins
+            targets = {update.id: update.status for update in bulk_update.updates}
+            if not targets:
+                return ContactBulkStatusResult(matched=0, modified=0, items=[])
+
+            # Current statuses give per-item matched/modified, which bulk_write only reports in total
+            current = {
+                submission["id"]: submission["status"]
+                async for submission in db.contact_submissions.find(
+                    {"id": {"$in": list(targets)}, "tenant": bulk_update.tenant},
+                    {"id": 1, "status": 1, "_id": 0}
+                )
+            }
+
+            result = await db.contact_submissions.bulk_write(
+                [
+                    UpdateOne({"id": submission_id, "tenant": bulk_update.tenant}, {"$set": {"status": status}})
+                    for submission_id, status in targets.items()
+                ],
+                ordered=False
+            )
+
+            changes = {}
+            for submission_id, status in targets.items():
+                if submission_id in current:
+                    moves = changes.setdefault(current[submission_id], {})
+                    moves[status] = moves.get(status, 0) + 1
+            if default_portfolio:
+                await record_status_changes(db, changes)
+            for submission_id, status in targets.items():
+                if default_portfolio and submission_id in current and current[submission_id] != status:
+                    contact_events.publish("contact.status", {"id": submission_id, "status": status, "previousStatus": current[submission_id]})
+
+            items = [
+                ContactStatusUpdateResult(
+                    id=submission_id,
+                    status=status,
+                    matched=submission_id in current,
+                    modified=submission_id in current and current[submission_id] != status
+                )
+                for submission_id, status in targets.items()
+            ]
+            return ContactBulkStatusResult(matched=result.matched_count, modified=result.modified_count, items=items)
+
+        if bulk_update.filter is None or bulk_update.status is None:
+            raise HTTPException(status_code=400, detail="Provide either updates or filter with status")
+
+        # Build query filter
+        submission_filter = bulk_update.filter
+        query_filter = {}
+        if submission_filter.ids is not None:
+            query_filter["id"] = {"$in": submission_filter.ids}
+        if submission_filter.status is not None:
+            query_filter["status"] = submission_filter.status
+        if submission_filter.submittedAfter or submission_filter.submittedBefore:
+            query_filter["submittedAt"] = {}
+            if submission_filter.submittedAfter:
+                query_filter["submittedAt"]["$gte"] = submission_filter.submittedAfter
+            if submission_filter.submittedBefore:
+                query_filter["submittedAt"]["$lt"] = submission_filter.submittedBefore
+        if not query_filter:
+            raise HTTPException(status_code=400, detail="Filter must have at least one condition")
+        query_filter["tenant"] = bulk_update.tenant
+
+        # Counts per current status tell the counters what moved; close enough under concurrent edits
+        current_counts = await db.contact_submissions.aggregate([
+            {"$match": query_filter},
+            {"$group": {"_id": "$status", "count": {"$sum": 1}}}
+        ]).to_list(None)
+
+        result = await db.contact_submissions.update_many(query_filter, {"$set": {"status": bulk_update.status}})
+        if default_portfolio:
+            await record_status_changes(db, {group["_id"]: {bulk_update.status: group["count"]} for group in current_counts})
+        if default_portfolio and result.modified_count:
+            # Ids are not known without another read; clients reload the list instead
+            contact_events.publish("contact.bulk_status", {"status": bulk_update.status, "modified": result.modified_count})
+        return ContactBulkStatusResult(matched=result.matched_count, modified=result.modified_count)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error bulk updating submission statuses: {str(e)}")
+        raise HTTPException(status_code=500, detail="Internal server error")
@@ -0,0 +1,316 @@
+from fastapi import APIRouter, HTTPException, Depends, Header
+from typing import Any, Callable, Dict, List, Optional
+from datetime import datetime
+import logging
+from pydantic import BaseModel, TypeAdapter, ValidationError
+from pymongo import ReturnDocument
+
+from models.portfolio import PORTFOLIO_ITEM_SECTIONS, PortfolioData, SkillItem
+from database import get_database
+from cache import portfolio_cache, portfolio_version
+from conditional import http_date, make_etag
+from serialization import json_response, to_json_bytes
+from snapshot import portfolio_snapshot
+from routes.portfolio import latest_version_filter, load_latest_portfolio, publish_portfolio
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+# Per-field validators so a PATCH only has to carry the fields it changes
+FIELD_ADAPTERS = {
+    model: {name: TypeAdapter(field.annotation) for name, field in model.model_fields.items()}
+    for model in list(PORTFOLIO_ITEM_SECTIONS.values()) + [SkillItem]
+}
+
+def _item_model(section: str):
+    model = PORTFOLIO_ITEM_SECTIONS.get(section)
+    if model is None:
+        raise HTTPException(status_code=404, detail="Portfolio section not found")
+    return model
+
+def _validate_item(model, payload: Dict[str, Any]) -> BaseModel:
+    try:
+        return model(**payload)
+    except ValidationError as e:
+        raise HTTPException(status_code=422, detail=e.errors(include_url=False, include_context=False))
+
+def _validate_fields(model, changes: Dict[str, Any], immutable: Optional[str] = None) -> Dict[str, Any]:
+    """Validate only the fields present in a partial update"""
+    adapters = FIELD_ADAPTERS[model]
+    if not changes:
+        raise HTTPException(status_code=422, detail="No fields to update")
+    unknown = [name for name in changes if name not in adapters]
+    if unknown:
+        raise HTTPException(status_code=422, detail=f"Unknown fields: {', '.join(unknown)}")
+    if immutable in changes:
+        raise HTTPException(status_code=422, detail=f"Item {immutable} cannot be changed")
+    try:
+        return {name: adapters[name].validate_python(value) for name, value in changes.items()}
+    except ValidationError as e:
+        raise HTTPException(status_code=422, detail=e.errors(include_url=False, include_context=False))
+
+async def _target_portfolio(if_match: Optional[str], db) -> Dict[str, Any]:
+    """Filter selecting the latest portfolio document, pinned to its version when If-Match is sent
+
+    Read from Mongo rather than the cache, which can lag behind a newer version:
+    editing an older document would bump it back over the newer one. The write
+    needs the document pinned by _id, because its item condition could
+    otherwise match an older version that has the item when the latest does not.
+    """
+    return await latest_version_filter(db, if_match)
+
+async def _write_item(
+    db,
+    target: Dict[str, Any],
+    condition: Dict[str, Any],
+    update: Dict[str, Any],
+    apply_to_cache: Callable[[PortfolioData], None],
+    failure_status: int,
+    failure_detail: str,
+    array_filters: Optional[List[Dict[str, Any]]] = None,
+    projection: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """Run one array update against the latest portfolio and keep the cache in step
+
+    Returns the pre-update document with only `id`, `updatedAt` and whatever
+    `projection` asked for, plus the new version under `newVersion`.
+    """
+    new_version = portfolio_version(datetime.utcnow())
+    update.setdefault("$set", {})["updatedAt"] = new_version
+
+    before = await db.portfolio.find_one_and_update(
+        {**target, **condition},
+        update,
+        projection={"id": 1, "updatedAt": 1, "_id": 0, **(projection or {})},
+        array_filters=array_filters,
+        return_document=ReturnDocument.BEFORE
+    )
+
+    if before is None:
+        # Work out why only on the failure path
+        if await db.portfolio.find_one(target, {"_id": 1}) is None:
+            if "updatedAt" in target:
+                raise HTTPException(status_code=409, detail="Portfolio data was modified by another request")
+            raise HTTPException(status_code=404, detail="Portfolio data not found")
+        raise HTTPException(status_code=failure_status, detail=failure_detail)
+
+    # Patch the cached copy when it is exactly the version we just changed; otherwise drop it
+    cached = portfolio_cache.peek()
+    if cached and cached.portfolio.id == before["id"] and cached.version == portfolio_version(before["updatedAt"]):
+        portfolio = cached.portfolio.model_copy(deep=True)
+        apply_to_cache(portfolio)
+        portfolio.updatedAt = new_version
+        await publish_portfolio(portfolio_cache.set(portfolio))
+    else:
+        portfolio_cache.invalidate()
+        if portfolio_snapshot.enabled:
+            # The snapshot needs the whole document, which only a fresh read can give us now
+            await publish_portfolio(await load_latest_portfolio(db))
+
+    before["newVersion"] = new_version
+    return before
+
+def _version_headers(written: Dict[str, Any]) -> Dict[str, str]:
+    return {"ETag": make_etag(written["id"], written["newVersion"]), "Last-Modified": http_date(written["newVersion"])}
+
+@router.post("/portfolio/{section}/items")
+async def add_portfolio_item(
+    section: str,
+    payload: Dict[str, Any],
+    if_match: Optional[str] = Header(None),
+    db = Depends(get_database)
+):
+    """Append one entry to a portfolio section"""
+    try:
+        model = _item_model(section)
+        item = _validate_item(model, payload)
+        target = await _target_portfolio(if_match, db)
+
+        written = await _write_item(
+            db, target,
+            condition={f"{section}.id": {"$ne": item.id}},
+            update={"$push": {section: item.dict()}},
+            apply_to_cache=lambda portfolio: getattr(portfolio, section).append(item),
+            failure_status=409,
+            failure_detail=f"An item with id {item.id} already exists in {section}"
+        )
+        return json_response(to_json_bytes(item), status_code=201, headers=_version_headers(written))
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error adding {section} item: {str(e)}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+@router.patch("/portfolio/{section}/items/{item_id}")
+async def update_portfolio_item(
+    section: str,
+    item_id: int,
+    changes: Dict[str, Any],
+    if_match: Optional[str] = Header(None),
+    db = Depends(get_database)
+):
+    """Update fields of one entry in a portfolio section"""
+    try:
+        model = _item_model(section)
+        fields = _validate_fields(model, changes, "id")
+        target = await _target_portfolio(if_match, db)
+
+        def apply(portfolio: PortfolioData) -> None:
+            items = getattr(portfolio, section)
+            for index, existing in enumerate(items):
+                if existing.id == item_id:
+                    items[index] = existing.model_copy(update=fields)
+
+        written = await _write_item(
+            db, target,
+            condition={f"{section}.id": item_id},
+            # The positional operator targets the element matched by the condition
+            update={"$set": {f"{section}.$.{name}": value for name, value in fields.items()}},
+            apply_to_cache=apply,
+            failure_status=404,
+            failure_detail=f"Item {item_id} not found in {section}",
+            projection={section: {"$elemMatch": {"id": item_id}}}
+        )
+
+        item = model(**{**written[section][0], **fields})
+        return json_response(to_json_bytes(item), headers=_version_headers(written))
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error updating {section} item {item_id}: {str(e)}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+@router.delete("/portfolio/{section}/items/{item_id}")
+async def delete_portfolio_item(
+    section: str,
+    item_id: int,
+    if_match: Optional[str] = Header(None),
+    db = Depends(get_database)
+):
+    """Remove one entry from a portfolio section"""
+    try:
+        _item_model(section)
+        target = await _target_portfolio(if_match, db)
+
+        def apply(portfolio: PortfolioData) -> None:
+            setattr(portfolio, section, [existing for existing in getattr(portfolio, section) if existing.id != item_id])
+
+        written = await _write_item(
+            db, target,
+            condition={f"{section}.id": item_id},
+            update={"$pull": {section: {"id": item_id}}},
+            apply_to_cache=apply,
+            failure_status=404,
+            failure_detail=f"Item {item_id} not found in {section}"
+        )
+        return json_response(to_json_bytes({"message": "Item deleted successfully"}), headers=_version_headers(written))
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error deleting {section} item {item_id}: {str(e)}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+@router.post("/portfolio/skills/{category:path}/items")
+async def add_skill_item(
+    category: str,
+    payload: Dict[str, Any],
+    if_match: Optional[str] = Header(None),
+    db = Depends(get_database)
+):
+    """Add one skill to a skill category"""
+    try:
+        item = _validate_item(SkillItem, payload)
+        target = await _target_portfolio(if_match, db)
+
+        def apply(portfolio: PortfolioData) -> None:
+            for skill_category in portfolio.skills:
+                if skill_category.category == category:
+                    skill_category.items.append(item)
+
+        written = await _write_item(
+            db, target,
+            condition={"skills": {"$elemMatch": {"category": category, "items.name": {"$ne": item.name}}}},
+            update={"$push": {"skills.$.items": item.dict()}},
+            apply_to_cache=apply,
+            failure_status=409,
+            failure_detail=f"Skill category {category} not found or already has {item.name}"
+        )
+        return json_response(to_json_bytes(item), status_code=201, headers=_version_headers(written))
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error adding skill to {category}: {str(e)}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+@router.patch("/portfolio/skills/{category:path}/items/{name:path}")
+async def update_skill_item(
+    category: str,
+    name: str,
+    changes: Dict[str, Any],
+    if_match: Optional[str] = Header(None),
+    db = Depends(get_database)
+):
+    """Update fields of one skill in a skill category"""
+    try:
+        fields = _validate_fields(SkillItem, changes)
+        target = await _target_portfolio(if_match, db)
+
+        def apply(portfolio: PortfolioData) -> None:
+            for skill_category in portfolio.skills:
+                if skill_category.category == category:
+                    skill_category.items = [
+                        existing.model_copy(update=fields) if existing.name == name else existing
+                        for existing in skill_category.items
+                    ]
+
+        written = await _write_item(
+            db, target,
+            condition={"skills": {"$elemMatch": {"category": category, "items.name": name}}},
+            # $ is the category matched by the condition; the nested item needs an array filter
+            update={"$set": {f"skills.$.items.$[item].{field}": value for field, value in fields.items()}},
+            apply_to_cache=apply,
+            failure_status=404,
+            failure_detail=f"Skill {name} not found in {category}",
+            array_filters=[{"item.name": name}],
+            projection={"skills": {"$elemMatch": {"category": category}}}
+        )
+
+        previous = next(existing for existing in written["skills"][0]["items"] if existing["name"] == name)
+        item = SkillItem(**{**previous, **fields})
+        return json_response(to_json_bytes(item), headers=_version_headers(written))
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error updating skill {name} in {category}: {str(e)}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+@router.delete("/portfolio/skills/{category:path}/items/{name:path}")
+async def delete_skill_item(
+    category: str,
+    name: str,
+    if_match: Optional[str] = Header(None),
+    db = Depends(get_database)
+):
+    """Remove one skill from a skill category"""
+    try:
+        target = await _target_portfolio(if_match, db)
+
+        def apply(portfolio: PortfolioData) -> None:
+            for skill_category in portfolio.skills:
+                if skill_category.category == category:
+                    skill_category.items = [existing for existing in skill_category.items if existing.name != name]
+
+        written = await _write_item(
+            db, target,
+            condition={"skills": {"$elemMatch": {"category": category, "items.name": name}}},
+            update={"$pull": {"skills.$.items": {"name": name}}},
+            apply_to_cache=apply,
+            failure_status=404,
+            failure_detail=f"Skill {name} not found in {category}"
+        )
+        return json_response(to_json_bytes({"message": "Item deleted successfully"}), headers=_version_headers(written))
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error deleting skill {name} from {category}: {str(e)}")
+        raise HTTPException(status_code=500, detail="Internal server error")
@@ -0,0 +1,114 @@
+from fastapi import APIRouter, HTTPException, Depends, Query
+from typing import List, Optional, Union
+from datetime import datetime
+import logging
+
+from models.status import StatusCheck, StatusCheckCreate, StatusCheckPage, StatusRollup, StatusRollupPage
+from database import get_database
+from serialization import json_response, to_json_bytes
+from pagination import keyset_page, keyset_query
+from status_rollups import Granularity, rebuild_rollups, record_status_check
+from routes.portfolio import MAX_PAGE_SIZE, _as_utc_naive
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+def _range_filter(time_field: str, client_name: Optional[str], start: Optional[datetime], end: Optional[datetime]) -> dict:
+    """Filter for [start, end), optionally for one client"""
+    query_filter = {}
+    if client_name:
+        query_filter["client_name"] = client_name
+    start, end = _as_utc_naive(start), _as_utc_naive(end)
+    if start or end:
+        query_filter[time_field] = {}
+        if start:
+            query_filter[time_field]["$gte"] = start
+        if end:
+            query_filter[time_field]["$lt"] = end
+    return query_filter
+
+@router.post("/status", response_model=StatusCheck)
+async def create_status_check(input: StatusCheckCreate, db = Depends(get_database)):
+    status_dict = input.dict()
+    status_obj = StatusCheck(**status_dict)
+    status_doc = status_obj.dict()
+    _ = await db.status_checks.insert_one(status_doc)
+    await record_status_check(db, status_doc)
+    return json_response(to_json_bytes(status_obj))
+
+@router.get("/status", response_model=Union[List[StatusCheck], StatusCheckPage])
+async def get_status_checks(
+    client_name: Optional[str] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    limit: int = Query(1000, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    db = Depends(get_database)
+):
+    """Get raw status checks newest first, optionally between `start` and `end`
+
+    Passing `cursor` (empty for the first page) returns a page with next/prev
+    cursors over (timestamp, id). Raw checks expire after STATUS_CHECK_TTL_SECONDS;
+    use /status/rollups for longer ranges.
+    """
+    try:
+        query_filter = _range_filter("timestamp", client_name, start, end)
+
+        if cursor is not None:
+            page_filter, sort, direction = keyset_query(query_filter, "timestamp", cursor)
+            docs = await db.status_checks.find(page_filter, {"_id": 0}).sort(sort).limit(limit + 1).to_list(limit + 1)
+            docs, next_cursor, prev_cursor = keyset_page(docs, limit, "timestamp", cursor, direction)
+            page = StatusCheckPage(
+                items=[StatusCheck(**status_check) for status_check in docs],
+                next_cursor=next_cursor,
+                prev_cursor=prev_cursor
+            )
+            return json_response(to_json_bytes(page))
+
+        status_checks = await db.status_checks.find(query_filter, {"_id": 0}).sort([("timestamp", -1), ("id", -1)]).limit(limit).to_list(limit)
+        return json_response(to_json_bytes([StatusCheck(**status_check) for status_check in status_checks]))
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error fetching status checks: {str(e)}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+@router.get("/status/rollups", response_model=StatusRollupPage)
+async def get_status_rollups(
+    granularity: Granularity = "hour",
+    client_name: Optional[str] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    limit: int = Query(500, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    db = Depends(get_database)
+):
+    """Get per-client check counts per minute or hour, newest bucket first
+
+    Buckets are selected by their start time; pages are keyed on (bucket, client_name).
+    """
+    try:
+        query_filter = {"granularity": granularity, **_range_filter("bucket", client_name, start, end)}
+        page_filter, sort, direction = keyset_query(query_filter, "bucket", cursor, id_field="client_name")
+        docs = await db.status_rollups.find(page_filter, {"_id": 0, "expireAt": 0}).sort(sort).limit(limit + 1).to_list(limit + 1)
+        docs, next_cursor, prev_cursor = keyset_page(docs, limit, "bucket", cursor, direction, id_field="client_name")
+        page = StatusRollupPage(
+            items=[StatusRollup(**rollup) for rollup in docs],
+            next_cursor=next_cursor,
+            prev_cursor=prev_cursor
+        )
+        return json_response(to_json_bytes(page))
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error fetching status rollups: {str(e)}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+@router.post("/status/rollups/rebuild")
+async def rebuild_status_rollups(db = Depends(get_database)):
+    """Recompute rollups for the hours still covered by raw status checks (admin endpoint)"""
+    try:
+        return await rebuild_rollups(db)
+    except Exception as e:
+        logger.error(f"Error rebuilding status rollups: {str(e)}")
+        raise HTTPException(status_code=500, detail="Internal server error")
@@ -0,0 +1,200 @@
+from fastapi import APIRouter, HTTPException, Depends, Header, Path, Request
+from typing import List, Optional, Union
+from datetime import datetime
+import asyncio
+import logging
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+from models.portfolio import (
+    SLUG_PATTERN,
+    PortfolioData,
+    PortfolioDataUpdate,
+    TenantPortfolioCreate,
+    ContactSubmission,
+    ContactSubmissionCreate,
+    ContactSubmissionPage,
+)
+from database import get_database
+from cache import CachedPortfolio, portfolio_version, tenant_cache
+from conditional import make_etag, parse_etag
+from serialization import json_response
+from ratelimit import contact_rate_limit
+from routes.portfolio import (
+    SECTION_ADAPTERS,
+    accept_submission,
+    get_contact_submissions,
+    version_headers,
+    versioned_response,
+)
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+Slug = Path(..., pattern=SLUG_PATTERN)
+
+async def _fetch_tenant_portfolio(db, slug: str) -> CachedPortfolio:
+    # An expired entry is still good if its version matches the stored document
+    stale = tenant_cache.peek(slug)
+    if stale:
+        latest = await db.portfolio.find_one({"slug": slug}, {"updatedAt": 1})
+        if latest and portfolio_version(latest["updatedAt"]) == stale.version:
+            tenant_cache.touch(stale)
+            return stale
+
+    tenant_cache.misses += 1
+    portfolio_data = await db.portfolio.find_one({"slug": slug})
+    if not portfolio_data:
+        tenant_cache.invalidate(slug)
+        raise HTTPException(status_code=404, detail="Portfolio not found")
+    return tenant_cache.set(PortfolioData(**portfolio_data))
+
+def _loaded(slug: str, task: asyncio.Task) -> None:
+    tenant_cache.loading.pop(slug, None)
+    # Waiters may all have gone away; don't leave the outcome unretrieved
+    if not task.cancelled():
+        task.exception()
+
+async def load_tenant_portfolio(db, slug: str) -> CachedPortfolio:
+    """Get a tenant's portfolio from the LRU, with concurrent misses sharing one read
+
+    One indexed lookup by slug at most, however many tenants there are.
+    """
+    cached = tenant_cache.get(slug)
+    if cached:
+        return cached
+
+    task = tenant_cache.loading.get(slug)
+    if task is None:
+        task = asyncio.ensure_future(_fetch_tenant_portfolio(db, slug))
+        tenant_cache.loading[slug] = task
+        task.add_done_callback(lambda done: _loaded(slug, done))
+    return await asyncio.shield(task)
+
+@router.post("/portfolios", response_model=PortfolioData, status_code=201)
+async def create_tenant_portfolio(portfolio_data: TenantPortfolioCreate, db = Depends(get_database)):
+    """Create a portfolio hosted under its own slug"""
+    try:
+        new_portfolio = PortfolioData(**portfolio_data.dict())
+        new_portfolio.createdAt = new_portfolio.updatedAt = portfolio_version(new_portfolio.updatedAt)
+
+        try:
+            await db.portfolio.insert_one(new_portfolio.dict())
+        except DuplicateKeyError:
+            raise HTTPException(status_code=409, detail="A portfolio with this slug already exists")
+
+        cached = tenant_cache.set(new_portfolio)
+        return json_response(cached.body, status_code=201, headers=version_headers(cached))
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error creating portfolio {portfolio_data.slug}: {str(e)}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+@router.get("/portfolios/{slug}", response_model=PortfolioData)
+async def get_tenant_portfolio(request: Request, slug: str = Slug, db = Depends(get_database)):
+    """Get a tenant's portfolio"""
+    try:
+        cached = await load_tenant_portfolio(db, slug)
+        return versioned_response(request, cached.etag, cached.version, cached.last_modified, cached.body, cached.encoded_body)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error fetching portfolio {slug}: {str(e)}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+@router.put("/portfolios/{slug}", response_model=PortfolioData)
+async def update_tenant_portfolio(
+    portfolio_update: PortfolioDataUpdate,
+    slug: str = Slug,
+    if_match: Optional[str] = Header(None),
+    db = Depends(get_database)
+):
+    """Update a tenant's portfolio; If-Match works as for PUT /portfolio"""
+    try:
+        query_filter = {"slug": slug}
+        if if_match is not None and if_match.strip() != "*":
+            expected = parse_etag(if_match)
+            if expected is None:
+                raise HTTPException(status_code=400, detail="Invalid If-Match header")
+            query_filter.update({"id": expected[0], "updatedAt": expected[1]})
+
+        update_dict = portfolio_update.dict(exclude_unset=True)
+        update_dict["updatedAt"] = portfolio_version(datetime.utcnow())
+
+        updated_portfolio = await db.portfolio.find_one_and_update(
+            query_filter,
+            {"$set": update_dict},
+            return_document=ReturnDocument.AFTER
+        )
+
+        if not updated_portfolio:
+            if "id" in query_filter and await db.portfolio.find_one({"slug": slug}, {"_id": 1}):
+                raise HTTPException(status_code=409, detail="Portfolio data was modified by another request")
+            raise HTTPException(status_code=404, detail="Portfolio not found")
+
+        cached = tenant_cache.set(PortfolioData(**updated_portfolio))
+        return json_response(cached.body, headers=version_headers(cached))
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error updating portfolio {slug}: {str(e)}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+@router.delete("/portfolios/{slug}")
+async def delete_tenant_portfolio(slug: str = Slug, db = Depends(get_database)):
+    """Delete a tenant's portfolio; its contact submissions are kept"""
+    try:
+        result = await db.portfolio.delete_one({"slug": slug})
+        tenant_cache.invalidate(slug)
+        if result.deleted_count == 0:
+            raise HTTPException(status_code=404, detail="Portfolio not found")
+        return {"message": "Portfolio deleted successfully"}
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error deleting portfolio {slug}: {str(e)}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+@router.post("/portfolios/{slug}/contact", response_model=ContactSubmission, dependencies=[Depends(contact_rate_limit)])
+async def submit_tenant_contact_form(contact_data: ContactSubmissionCreate, slug: str = Slug, db = Depends(get_database)):
+    """Submit a contact form to a tenant's portfolio"""
+    try:
+        # Only for portfolios that exist; usually answered from the cache
+        await load_tenant_portfolio(db, slug)
+        return await accept_submission(ContactSubmission(**contact_data.dict(), tenant=slug), db)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error submitting contact form for {slug}: {str(e)}")
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+@router.get("/portfolios/{slug}/contact", response_model=Union[List[ContactSubmission], ContactSubmissionPage])
+async def get_tenant_contact_submissions(
+    slug: str = Slug,
+    status: Optional[str] = None,
+    limit: int = 100,
+    skip: int = 0,
+    cursor: Optional[str] = None,
+    db = Depends(get_database)
+):
+    """Get a tenant's contact submissions; same paging as GET /contact (admin endpoint)"""
+    return await get_contact_submissions(status=status, limit=limit, skip=skip, cursor=cursor, tenant=slug, db=db)
+
+@router.get("/portfolios/{slug}/{section}")
+async def get_tenant_portfolio_section(request: Request, section: str, slug: str = Slug, db = Depends(get_database)):
+    """Get a single section of a tenant's portfolio"""
+    try:
+        if section not in SECTION_ADAPTERS:
+            raise HTTPException(status_code=404, detail="Portfolio section not found")
+
+        cached = await load_tenant_portfolio(db, slug)
+        section_body = cached.section_body(section)
+        etag = make_etag(f"{cached.portfolio.id}.{section}", cached.version)
+        encode = lambda encoding: cached.encoded_body(encoding, section)
+        return versioned_response(request, etag, cached.version, cached.last_modified, section_body, encode)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error fetching portfolio {slug} section {section}: {str(e)}")
+        raise HTTPException(status_code=500, detail="Internal server error")
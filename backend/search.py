@@ -0,0 +1,176 @@
+import bisect
+import math
+import re
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+from models.portfolio import PortfolioData
+
+# Keeps tokens like "c++", "c#" and "node.js" intact
+TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#.]*")
+
+# How much a match in each field counts towards an item's score
+FIELD_WEIGHTS = {
+    "title": 3.0,
+    "name": 3.0,
+    "tags": 2.5,
+    "category": 1.5,
+    "company": 1.5,
+    "issuer": 1.5,
+    "description": 1.0,
+    "achievements": 1.0,
+    "longDescription": 0.5,
+}
+
+# Shortest final query token that is also matched as a prefix (typeahead)
+MIN_PREFIX_LENGTH = 2
+
+ItemKey = Tuple[str, Union[int, str]]
+
+
+def tokenize(text: str) -> List[str]:
+    return [token.rstrip(".") for token in TOKEN_RE.findall(text.lower())]
+
+
+def _searchable_items(portfolio: PortfolioData) -> Iterator[Tuple[ItemKey, str, Dict[str, str]]]:
+    """Yield (key, display title, {field: text}) for every searchable portfolio entry"""
+    for project in portfolio.projects:
+        yield ("projects", project.id), project.title, {
+            "title": project.title,
+            "description": project.description,
+            "longDescription": project.longDescription,
+            "tags": " ".join(project.tags),
+        }
+    for experience in portfolio.experience:
+        yield ("experience", experience.id), experience.title, {
+            "title": experience.title,
+            "company": experience.company,
+            "description": experience.description,
+            "achievements": " ".join(experience.achievements),
+        }
+    for category in portfolio.skills:
+        for skill in category.items:
+            yield ("skills", skill.name), skill.name, {"name": skill.name, "category": category.category}
+    for certification in portfolio.certifications:
+        yield ("certifications", certification.id), certification.title, {
+            "title": certification.title,
+            "issuer": certification.issuer,
+        }
+    for achievement in portfolio.achievements:
+        yield ("achievements", achievement.id), achievement.title, {
+            "title": achievement.title,
+            "description": achievement.description,
+        }
+
+
+class PortfolioSearchIndex:
+    """In-memory inverted index over portfolio entries
+
+    `sync` diffs the portfolio against what is indexed and only re-tokenizes the
+    entries whose text changed, so writes update the index incrementally and
+    queries only touch posting lists.
+    """
+
+    def __init__(self):
+        self.postings: Dict[str, Dict[ItemKey, float]] = defaultdict(dict)
+        self.items: Dict[ItemKey, Tuple[Tuple[str, ...], Dict[str, float], str]] = {}
+        self.version: Optional[Tuple[str, datetime]] = None
+        self._vocabulary: Optional[List[str]] = None
+
+    def sync(self, portfolio: PortfolioData, version: datetime) -> None:
+        """Bring the index up to date with a portfolio version"""
+        if self.version == (portfolio.id, version):
+            return
+
+        seen = set()
+        for key, title, fields in _searchable_items(portfolio):
+            seen.add(key)
+            signature = tuple(fields.values())
+            current = self.items.get(key)
+            if current is not None and current[0] == signature:
+                continue
+            if current is not None:
+                self._remove(key)
+            self._add(key, title, signature, fields)
+
+        for key in [key for key in self.items if key not in seen]:
+            self._remove(key)
+
+        self.version = (portfolio.id, version)
+
+    def _add(self, key: ItemKey, title: str, signature: Tuple[str, ...], fields: Dict[str, str]) -> None:
+        weights: Dict[str, float] = defaultdict(float)
+        for field, text in fields.items():
+            for token in tokenize(text):
+                weights[token] += FIELD_WEIGHTS.get(field, 1.0)
+
+        for token, weight in weights.items():
+            if token not in self.postings:
+                self._vocabulary = None
+            self.postings[token][key] = weight
+        self.items[key] = (signature, dict(weights), title)
+
+    def _remove(self, key: ItemKey) -> None:
+        _, weights, _ = self.items.pop(key)
+        for token in weights:
+            posting = self.postings.get(token)
+            if posting is None:
+                continue
+            posting.pop(key, None)
+            if not posting:
+                del self.postings[token]
+                self._vocabulary = None
+
+    def _prefix_matches(self, prefix: str) -> List[str]:
+        if self._vocabulary is None:
+            self._vocabulary = sorted(self.postings)
+        start = bisect.bisect_left(self._vocabulary, prefix)
+        end = bisect.bisect_left(self._vocabulary, prefix + "\uffff")
+        return self._vocabulary[start:end]
+
+    def search(self, query: str, limit: int = 20, section: Optional[str] = None) -> List[dict]:
+        """Rank entries by weighted term matches, scaled by IDF and query coverage"""
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms or not self.items:
+            return []
+
+        total = len(self.items)
+        scores: Dict[ItemKey, float] = defaultdict(float)
+        matched_terms: Dict[ItemKey, int] = defaultdict(int)
+
+        for position, term in enumerate(terms):
+            candidates = [term]
+            if position == len(terms) - 1 and len(term) >= MIN_PREFIX_LENGTH:
+                candidates = self._prefix_matches(term) or candidates
+
+            term_scores: Dict[ItemKey, float] = {}
+            for token in candidates:
+                posting = self.postings.get(token)
+                if not posting:
+                    continue
+                idf = math.log(1 + total / len(posting))
+                # Exact matches outrank prefix completions
+                boost = 1.0 if token == term else 0.5
+                for key, weight in posting.items():
+                    term_scores[key] = max(term_scores.get(key, 0.0), weight * idf * boost)
+
+            for key, score in term_scores.items():
+                scores[key] += score
+                matched_terms[key] += 1
+
+        hits = [
+            {
+                "section": key[0],
+                "id": key[1],
+                "title": self.items[key][2],
+                "score": round(score * matched_terms[key] / len(terms), 4),
+            }
+            for key, score in scores.items()
+            if section is None or key[0] == section
+        ]
+        hits.sort(key=lambda hit: (-hit["score"], hit["section"], str(hit["id"])))
+        return hits[:limit]
+
+
+search_index = PortfolioSearchIndex()
@@ -1,13 +1,13 @@
 import asyncio
 from database import get_database
-from models.portfolio import PortfolioData, PersonalInfo, SocialLinks, SkillCategory, SkillItem, Project, Experience, Certification, Achievement, CodingProfile, CodingProfileStats
+from models.portfolio import DEFAULT_PORTFOLIO_FILTER, portfolio_document, PortfolioData, PersonalInfo, SocialLinks, SkillCategory, SkillItem, Project, Experience, Certification, Achievement, CodingProfile, CodingProfileStats
 
 async def seed_portfolio_data():
     """Seed initial portfolio data"""
     db = await get_database()
     
     # Check if portfolio data already exists
-    existing_data = await db.portfolio.find_one({})
+    existing_data = await db.portfolio.find_one(DEFAULT_PORTFOLIO_FILTER)
     if existing_data:
         print("Portfolio data already exists. Skipping seed.")
         return
@@ -300,7 +300,7 @@ async def seed_portfolio_data():
     )
     
     # Insert into database
-    result = await db.portfolio.insert_one(portfolio_data.dict())
+    result = await db.portfolio.insert_one(portfolio_document(portfolio_data))
     
     if result.inserted_id:
         print("Portfolio data seeded successfully!")
@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+"""Seed MongoDB with a synthetic dataset of configurable size.
+
+Everything is derived from --seed and --end, so the same arguments always produce
+the same documents, ids and timestamps:
+
+    python seed_synthetic.py --projects 5000 --contacts 100000 --status-checks 2000000
+    python seed_synthetic.py --drop --contacts 100000 --seed 7 --end 2025-01-01T00:00:00
+
+The portfolio is inserted as a new latest version; contact submissions and status
+checks are generated lazily and written with insert_many in batches.
+"""
+import argparse
+import asyncio
+import math
+import random
+import time
+import uuid
+from datetime import datetime, timedelta
+from itertools import accumulate
+from typing import Any, Dict, Iterator, List
+
+from bson import BSON
+
+from contact_stats import rebuild_counters
+from status_rollups import rebuild_rollups
+from database import get_database
+from models.portfolio import (
+    Achievement,
+    Certification,
+    CodingProfile,
+    CodingProfileStats,
+    ContactSubmission,
+    Experience,
+    PersonalInfo,
+    PortfolioData,
+    Project,
+    SkillCategory,
+    SkillItem,
+    SocialLinks,
+    portfolio_document,
+)
+from models.status import StatusCheck
+
+# MongoDB rejects documents above 16 MiB
+MAX_BSON_SIZE = 16 * 1024 * 1024
+
+TECHNOLOGIES = [
+    "Python", "FastAPI", "React", "TypeScript", "MongoDB", "PostgreSQL", "Redis", "Docker",
+    "Kubernetes", "TensorFlow", "PyTorch", "scikit-learn", "Pandas", "Node.js", "GraphQL",
+    "AWS", "GCP", "Terraform", "Go", "Rust", "Kafka", "Spark", "Tailwind", "Next.js",
+    "LangChain", "OpenCV", "NumPy", "Flask", "Django", "Elasticsearch",
+]
+ADJECTIVES = [
+    "Realtime", "Distributed", "Scalable", "Serverless", "Intelligent", "Collaborative",
+    "Secure", "Predictive", "Interactive", "Automated", "Lightweight", "Federated",
+]
+SUBJECTS = [
+    "Inventory", "Recommendation", "Chat", "Analytics", "Payments", "Search", "Monitoring",
+    "Scheduling", "Fraud Detection", "Image Tagging", "Forecasting", "Document QA",
+]
+PRODUCTS = ["Platform", "Dashboard", "Engine", "Service", "Pipeline", "Toolkit", "Assistant", "API"]
+COMPANIES = ["Acme Labs", "Globex", "Initech", "Umbrella AI", "Hooli", "Stark Analytics", "Wayne Data", "Soylent Cloud"]
+ROLES = ["Software Engineer", "ML Engineer", "Data Scientist", "Backend Developer", "Full-Stack Developer", "Research Intern"]
+ISSUERS = ["Coursera", "Google", "AWS", "Microsoft", "Meta", "DeepLearning.AI", "IBM"]
+VERBS = ["Built", "Designed", "Shipped", "Scaled", "Optimized", "Automated", "Migrated", "Led"]
+SKILL_CATEGORIES = ["Languages", "Frameworks", "Data & ML", "Cloud & DevOps", "Databases", "Tools"]
+FIRST_NAMES = ["Aarav", "Maya", "Liam", "Sofia", "Noah", "Zara", "Ethan", "Priya", "Lucas", "Amara"]
+LAST_NAMES = ["Sharma", "Garcia", "Kim", "Okafor", "Novak", "Silva", "Chen", "Patel", "Müller", "Haddad"]
+CONTACT_SUBJECTS = ["Job opportunity", "Collaboration", "Freelance project", "Question about a project", "Hello", "Speaking invitation"]
+
+# Relative contact volume per UTC hour: quiet at night, busiest in the evening
+HOUR_WEIGHTS = [2, 1, 1, 1, 1, 2, 3, 5, 7, 9, 10, 10, 9, 9, 10, 10, 11, 12, 13, 12, 10, 8, 5, 3]
+HOUR_CUM_WEIGHTS = list(accumulate(HOUR_WEIGHTS))
+
+
+def _uuid(rng: random.Random) -> str:
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+
+def _sentence(rng: random.Random) -> str:
+    return (
+        f"{rng.choice(VERBS)} a {rng.choice(ADJECTIVES).lower()} {rng.choice(SUBJECTS).lower()} "
+        f"{rng.choice(PRODUCTS).lower()} using {rng.choice(TECHNOLOGIES)} and {rng.choice(TECHNOLOGIES)}."
+    )
+
+
+def build_portfolio(
+    rng: random.Random,
+    end: datetime,
+    projects: int,
+    skills: int,
+    experiences: int,
+    certifications: int,
+    achievements: int,
+) -> PortfolioData:
+    """A PortfolioData of the requested size with plausible, searchable text"""
+    skill_categories = [SkillCategory(category=category, items=[]) for category in SKILL_CATEGORIES]
+    for index in range(skills):
+        # Numbered once the technology list runs out, so skill names stay unique
+        base = TECHNOLOGIES[index % len(TECHNOLOGIES)]
+        name = base if index < len(TECHNOLOGIES) else f"{base} {index // len(TECHNOLOGIES) + 1}"
+        skill_categories[index % len(skill_categories)].items.append(
+            SkillItem(name=name, level=rng.randint(40, 98), icon=base.lower())
+        )
+
+    return PortfolioData(
+        id=_uuid(rng),
+        personal=PersonalInfo(
+            name=f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+            title="Synthetic Portfolio | Load Testing Fixture",
+            tagline="Generated by seed_synthetic.py",
+            description=" ".join(_sentence(rng) for _ in range(3)),
+            email="synthetic@example.com",
+            phone="+00 0000000000",
+            location="Internet",
+            avatar="https://example.com/avatar.png",
+        ),
+        socialLinks=SocialLinks(
+            github="https://github.com/synthetic",
+            linkedin="https://linkedin.com/in/synthetic",
+            geeksforgeeks="https://auth.geeksforgeeks.org/user/synthetic",
+            leetcode="https://leetcode.com/synthetic",
+        ),
+        skills=[category for category in skill_categories if category.items],
+        projects=[
+            Project(
+                id=index + 1,
+                title=f"{rng.choice(ADJECTIVES)} {rng.choice(SUBJECTS)} {rng.choice(PRODUCTS)}",
+                description=_sentence(rng),
+                longDescription=" ".join(_sentence(rng) for _ in range(rng.randint(3, 8))),
+                image=f"https://example.com/projects/{index + 1}.png",
+                tags=rng.sample(TECHNOLOGIES, rng.randint(2, 6)),
+                liveUrl=f"https://example.com/projects/{index + 1}",
+                githubUrl=f"https://github.com/synthetic/project-{index + 1}",
+                featured=rng.random() < 0.1,
+            )
+            for index in range(projects)
+        ],
+        experience=[
+            Experience(
+                id=index + 1,
+                title=rng.choice(ROLES),
+                company=rng.choice(COMPANIES),
+                duration=f"{2010 + index % 15} - {2011 + index % 15}",
+                location=rng.choice(["Remote", "Bengaluru", "Berlin", "New York", "London"]),
+                description=_sentence(rng),
+                achievements=[_sentence(rng) for _ in range(rng.randint(2, 5))],
+            )
+            for index in range(experiences)
+        ],
+        certifications=[
+            Certification(
+                id=index + 1,
+                title=f"{rng.choice(TECHNOLOGIES)} {rng.choice(['Professional', 'Associate', 'Specialization', 'Fundamentals'])}",
+                issuer=rng.choice(ISSUERS),
+                date=str(2015 + index % 10),
+                image=f"https://example.com/certifications/{index + 1}.png",
+                credentialId=f"CERT-{rng.getrandbits(32):08X}",
+            )
+            for index in range(certifications)
+        ],
+        achievements=[
+            Achievement(
+                id=index + 1,
+                title=f"{rng.choice(['Winner', 'Finalist', 'Speaker', 'Top Contributor'])}: {rng.choice(SUBJECTS)} {rng.choice(['Hackathon', 'Summit', 'Challenge'])}",
+                description=_sentence(rng),
+                icon=rng.choice(["trophy", "star", "award", "mic"]),
+                date=str(2015 + index % 10),
+            )
+            for index in range(achievements)
+        ],
+        codingProfiles=[
+            CodingProfile(
+                platform="GitHub",
+                username="synthetic",
+                stats=CodingProfileStats(repositories=projects, stars=rng.randint(0, 5000), followers=rng.randint(0, 2000)),
+                icon="github",
+                url="https://github.com/synthetic",
+            )
+        ],
+        createdAt=end,
+        updatedAt=end,
+    )
+
+
+def _recent_timestamp(rng: random.Random, end: datetime, days: int) -> datetime:
+    """Skewed towards recent days, with a daily cycle"""
+    day = int(days * rng.random() ** 1.5)
+    hour = rng.choices(range(24), cum_weights=HOUR_CUM_WEIGHTS)[0]
+    moment = (end - timedelta(days=day)).replace(hour=hour, minute=0, second=0, microsecond=0)
+    moment += timedelta(seconds=rng.randrange(3600), milliseconds=rng.randrange(1000))
+    # Today's later hours have not happened yet
+    return moment if moment <= end else moment - timedelta(days=1)
+
+
+def generate_contacts(rng: random.Random, end: datetime, days: int, count: int) -> Iterator[Dict[str, Any]]:
+    for index in range(count):
+        submitted_at = _recent_timestamp(rng, end, days)
+        age_days = (end - submitted_at).total_seconds() / 86400
+        # New mail is mostly unread; old mail has mostly been handled
+        if rng.random() < 0.02 + 0.9 * math.exp(-age_days / 3):
+            status = "new"
+        else:
+            status = "responded" if rng.random() < 0.6 else "read"
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        yield ContactSubmission(
+            id=_uuid(rng),
+            name=f"{first} {last}",
+            email=f"{first.lower()}.{last.lower()}{index}@example.com",
+            subject=rng.choice(CONTACT_SUBJECTS),
+            message=" ".join(_sentence(rng) for _ in range(rng.randint(1, 4))),
+            submittedAt=submitted_at,
+            status=status,
+        ).dict()
+
+
+def generate_status_checks(rng: random.Random, end: datetime, days: int, count: int, clients: int) -> Iterator[Dict[str, Any]]:
+    # A few clients report far more often than the rest
+    names = [f"client-{index}" for index in range(clients)]
+    cum_weights = list(accumulate(1 / (rank + 1) for rank in range(clients)))
+    span = days * 86400
+    for _ in range(count):
+        yield StatusCheck(
+            id=_uuid(rng),
+            client_name=rng.choices(names, cum_weights=cum_weights)[0],
+            timestamp=end - timedelta(seconds=rng.random() * span),
+        ).dict()
+
+
+async def insert_batches(collection, documents: Iterator[Dict[str, Any]], total: int, batch_size: int, concurrency: int) -> int:
+    """insert_many in fixed-size batches with a bounded number in flight"""
+    inserted = 0
+    pending: List[asyncio.Task] = []
+    started = time.perf_counter()
+
+    async def write(batch: List[Dict[str, Any]]) -> None:
+        nonlocal inserted
+        await collection.insert_many(batch, ordered=False)
+        inserted += len(batch)
+
+    batch: List[Dict[str, Any]] = []
+    for document in documents:
+        batch.append(document)
+        if len(batch) < batch_size:
+            continue
+        pending.append(asyncio.create_task(write(batch)))
+        batch = []
+        if len(pending) >= concurrency:
+            done, still_pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                task.result()
+            pending = list(still_pending)
+            print(f"  {collection.name}: {inserted}/{total}", end="\r", flush=True)
+    if batch:
+        pending.append(asyncio.create_task(write(batch)))
+    for task in pending:
+        await task
+
+    elapsed = time.perf_counter() - started
+    print(f"  {collection.name}: {inserted} documents in {elapsed:.1f}s ({inserted / elapsed if elapsed else 0:.0f}/s)")
+    return inserted
+
+
+async def main(args: argparse.Namespace) -> None:
+    db = await get_database()
+    end = args.end.replace(microsecond=args.end.microsecond // 1000 * 1000)
+    # Separate streams, so changing one size does not reshuffle the other datasets
+    portfolio_rng, contact_rng, status_rng = (random.Random(f"{args.seed}:{name}") for name in ("portfolio", "contacts", "status"))
+
+    if args.drop:
+        for name in ("portfolio", "contact_submissions", "contact_stats", "status_checks", "status_rollups"):
+            await db[name].delete_many({})
+        print("Cleared existing data")
+
+    if not args.skip_portfolio:
+        portfolio = build_portfolio(
+            portfolio_rng, end, args.projects, args.skills, args.experience, args.certifications, args.achievements
+        )
+        document = portfolio_document(portfolio)
+        size = len(BSON.encode(document))
+        if size > MAX_BSON_SIZE:
+            raise SystemExit(f"Portfolio would be {size / 1024 / 1024:.1f} MiB, above MongoDB's 16 MiB document limit")
+        await db.portfolio.insert_one(document)
+        print(f"  portfolio: {portfolio.id} ({size / 1024:.0f} KiB, {args.projects} projects)")
+
+    if args.contacts:
+        await insert_batches(
+            db.contact_submissions, generate_contacts(contact_rng, end, args.days, args.contacts),
+            args.contacts, args.batch_size, args.concurrency
+        )
+        report = await rebuild_counters(db)
+        print(f"  contact_stats: rebuilt from {report['total']} submissions")
+
+    if args.status_checks:
+        await insert_batches(
+            db.status_checks, generate_status_checks(status_rng, end, args.days, args.status_checks, args.status_clients),
+            args.status_checks, args.batch_size, args.concurrency
+        )
+        report = await rebuild_rollups(db, since=end - timedelta(days=args.days), until=end + timedelta(milliseconds=1))
+        print(f"  status_rollups: {report['minutes']} minute and {report['hours']} hour buckets")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Seed MongoDB with a deterministic synthetic dataset")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--end", type=datetime.fromisoformat, default=datetime.utcnow().replace(minute=0, second=0, microsecond=0),
+                        help="latest generated timestamp, UTC (default: start of the current hour)")
+    parser.add_argument("--days", type=int, default=90, help="days of history for contacts and status checks")
+    parser.add_argument("--projects", type=int, default=100)
+    parser.add_argument("--skills", type=int, default=60)
+    parser.add_argument("--experience", type=int, default=20)
+    parser.add_argument("--certifications", type=int, default=30)
+    parser.add_argument("--achievements", type=int, default=30)
+    parser.add_argument("--contacts", type=int, default=10000)
+    parser.add_argument("--status-checks", type=int, default=0)
+    parser.add_argument("--status-clients", type=int, default=50)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=4, help="insert_many batches in flight")
+    parser.add_argument("--skip-portfolio", action="store_true", help="only seed contacts and status checks")
+    parser.add_argument("--drop", action="store_true", help="delete existing portfolio, contact and status data first")
+    asyncio.run(main(parser.parse_args()))
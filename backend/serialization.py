@@ -0,0 +1,29 @@
+import json
+from typing import Any, Dict, Optional
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import Response
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is listed in requirements.txt
+    orjson = None
+
+
+def _encode_model(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        return value.model_dump()
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def to_json_bytes(data: Any) -> bytes:
+    """Encode already-validated models (or lists of them) to JSON bytes"""
+    if orjson is not None:
+        return orjson.dumps(data, default=_encode_model)
+    return json.dumps(jsonable_encoder(data), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def json_response(body: bytes, status_code: int = 200, headers: Optional[Dict[str, str]] = None) -> Response:
+    """Return pre-serialized JSON as-is, bypassing response_model validation"""
+    return Response(content=body, status_code=status_code, headers=headers, media_type="application/json")
@@ -1,60 +1,78 @@
 from fastapi import FastAPI, APIRouter
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
-from motor.motor_asyncio import AsyncIOMotorClient
-import os
+from contextlib import asynccontextmanager
 import logging
 from pathlib import Path
-from pydantic import BaseModel, Field
-from typing import List
-import uuid
-from datetime import datetime
+
+# Load settings before importing modules that read them at import time
+ROOT_DIR = Path(__file__).parent
+load_dotenv(ROOT_DIR / '.env')
 
 # Import portfolio routes
 from routes.portfolio import router as portfolio_router
+from routes.portfolio_items import router as portfolio_items_router
+from routes.metrics import router as metrics_router
+from routes.assets import router as assets_router
+from routes.status import router as status_router
+from routes.tenants import router as tenants_router
+from indexes import bootstrap_indexes
+from contact_stats import bootstrap_counters
+from status_rollups import bootstrap_rollups
+from routes.portfolio import load_latest_portfolio
+from cache import portfolio_cache
+from snapshot import portfolio_snapshot
+from contact_buffer import contact_write_buffer
+from compression import CompressionMiddleware
+from metrics import MetricsMiddleware
+import database
 
-ROOT_DIR = Path(__file__).parent
-load_dotenv(ROOT_DIR / '.env')
+logger = logging.getLogger(__name__)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # One MongoDB client (and connection pool) for the whole process
+    db = database.connect()
+    try:
+        await database.warm_up()
+        await bootstrap_indexes(db)
+        await bootstrap_counters(db)
+        await bootstrap_rollups(db)
+    except Exception as e:
+        # Keep serving; requests will surface the database error until it recovers
+        logger.error(f"MongoDB startup tasks failed: {str(e)}")
+    try:
+        # Reads the snapshot from disk, so serving mode comes up even if Mongo is not reachable yet
+        await portfolio_snapshot.start(portfolio_cache, lambda: load_latest_portfolio(db))
+    except Exception as e:
+        logger.error(f"Portfolio snapshot startup failed: {str(e)}")
+    contact_write_buffer.start(db)
+
+    yield
 
-# MongoDB connection
-mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
-db = client[os.environ.get('DB_NAME', 'portfolio_db')]
+    await portfolio_snapshot.stop()
+    # Flush queued contact submissions before the connection goes away
+    await contact_write_buffer.stop()
+    database.close()
 
 # Create the main app without a prefix
-app = FastAPI(title="Portfolio API", version="1.0.0")
+app = FastAPI(title="Portfolio API", version="1.0.0", lifespan=lifespan)
 
 # Create a router with the /api prefix
 api_router = APIRouter(prefix="/api")
 
-# Define Models
-class StatusCheck(BaseModel):
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
-    client_name: str
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
-
-class StatusCheckCreate(BaseModel):
-    client_name: str
-
 # Add your routes to the router instead of directly to app
 @api_router.get("/")
 async def root():
     return {"message": "Portfolio API is running!"}
 
-@api_router.post("/status", response_model=StatusCheck)
-async def create_status_check(input: StatusCheckCreate):
-    status_dict = input.dict()
-    status_obj = StatusCheck(**status_dict)
-    _ = await db.status_checks.insert_one(status_obj.dict())
-    return status_obj
-
-@api_router.get("/status", response_model=List[StatusCheck])
-async def get_status_checks():
-    status_checks = await db.status_checks.find().to_list(1000)
-    return [StatusCheck(**status_check) for status_check in status_checks]
-
 # Include portfolio routes
 api_router.include_router(portfolio_router)
+api_router.include_router(portfolio_items_router)
+api_router.include_router(status_router)
+api_router.include_router(tenants_router)
+api_router.include_router(assets_router)
+api_router.include_router(metrics_router)
 
 # Include the router in the main app
 app.include_router(api_router)
@@ -65,15 +83,18 @@ app.add_middleware(
     allow_origins=["*"],
     allow_methods=["*"],
     allow_headers=["*"],
+    # Let the admin UI read validators to send back as If-Match
+    expose_headers=["ETag", "Last-Modified"],
 )
 
+# Compress large dynamic responses; precompressed payloads pass straight through
+app.add_middleware(CompressionMiddleware)
+
+# Outermost, so timings cover compression and every other middleware
+app.add_middleware(MetricsMiddleware)
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
-logger = logging.getLogger(__name__)
-
-@app.on_event("shutdown")
-async def shutdown_db_client():
-    client.close()
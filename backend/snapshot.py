@@ -0,0 +1,245 @@
+import argparse
+import asyncio
+import json
+import logging
+import os
+import shutil
+from datetime import timezone
+from pathlib import Path
+from typing import Awaitable, Callable, Optional
+
+from cache import CachedPortfolio, PortfolioCache
+from compression import SUPPORTED_ENCODINGS
+from database import get_database
+from models.portfolio import DEFAULT_PORTFOLIO_FILTER, PORTFOLIO_SECTIONS, PortfolioData
+
+logger = logging.getLogger(__name__)
+
+# Directory for the prerendered portfolio; empty disables snapshots
+PORTFOLIO_SNAPSHOT_DIR = os.environ.get('PORTFOLIO_SNAPSHOT_DIR', '')
+# Serve portfolio reads from the snapshot instead of Mongo
+PORTFOLIO_SNAPSHOT_SERVE = os.environ.get('PORTFOLIO_SNAPSHOT_SERVE', 'false').lower() == 'true'
+# How often serving workers look for a snapshot written by another process
+PORTFOLIO_SNAPSHOT_POLL_SECONDS = float(os.environ.get('PORTFOLIO_SNAPSHOT_POLL_SECONDS', '5'))
+# Older versions are kept briefly so readers mid-way through one are not cut off
+PORTFOLIO_SNAPSHOT_KEEP_VERSIONS = 3
+
+ENCODING_EXTENSIONS = {"gzip": ".gz", "br": ".br"}
+
+# Layout, with `current` switched atomically to the newest complete version:
+#   current -> versions/<millis>
+#   versions/<millis>/manifest.json
+#   versions/<millis>/portfolio.json, portfolio.json.gz, portfolio.json.br
+#   versions/<millis>/sections/<section>.json (+ .gz, .br)
+
+
+def _version_name(entry: CachedPortfolio) -> str:
+    return str(int(entry.version.replace(tzinfo=timezone.utc).timestamp() * 1000))
+
+
+def _write_variants(path: Path, body: bytes, encoded: Callable[[str], bytes]) -> None:
+    path.write_bytes(body)
+    for encoding in SUPPORTED_ENCODINGS:
+        path.with_name(path.name + ENCODING_EXTENSIONS[encoding]).write_bytes(encoded(encoding))
+
+
+def _current_version(root: Path) -> Optional[str]:
+    try:
+        return os.path.basename(os.readlink(root / "current"))
+    except OSError:
+        return None
+
+
+def write_snapshot(entry: CachedPortfolio, directory: str) -> Path:
+    """Render a portfolio version to static files and make it current
+
+    Files are written to a staging directory that is renamed into place, then the
+    `current` symlink is swapped with os.replace, so readers only ever see a
+    complete version. An older version never replaces a newer one.
+    """
+    root = Path(directory)
+    versions = root / "versions"
+    versions.mkdir(parents=True, exist_ok=True)
+    name = _version_name(entry)
+    target = versions / name
+
+    if not target.exists():
+        staging = versions / f".{name}.{os.getpid()}.tmp"
+        shutil.rmtree(staging, ignore_errors=True)
+        (staging / "sections").mkdir(parents=True)
+
+        _write_variants(staging / "portfolio.json", entry.body, entry.encoded_body)
+        for section in PORTFOLIO_SECTIONS:
+            _write_variants(
+                staging / "sections" / f"{section}.json",
+                entry.section_body(section),
+                lambda encoding: entry.encoded_body(encoding, section)
+            )
+        manifest = {
+            "id": entry.portfolio.id,
+            "version": entry.version.isoformat(),
+            "etag": entry.etag,
+            "lastModified": entry.last_modified,
+            "encodings": list(SUPPORTED_ENCODINGS),
+            "sections": list(PORTFOLIO_SECTIONS),
+        }
+        (staging / "manifest.json").write_text(json.dumps(manifest, indent=2))
+
+        try:
+            os.rename(staging, target)
+        except OSError:
+            # Another process finished the same version first
+            shutil.rmtree(staging, ignore_errors=True)
+
+    current = _current_version(root)
+    if current is None or int(current) <= int(name):
+        link = root / f".current.{os.getpid()}.tmp"
+        if link.is_symlink():
+            link.unlink()
+        os.symlink(os.path.join("versions", name), link)
+        os.replace(link, root / "current")
+
+    # Drop superseded versions beyond the few kept for in-flight readers
+    complete = sorted((path for path in versions.iterdir() if path.name.isdigit()), key=lambda path: int(path.name))
+    for stale in complete[:-PORTFOLIO_SNAPSHOT_KEEP_VERSIONS]:
+        shutil.rmtree(stale, ignore_errors=True)
+
+    return target
+
+
+def read_snapshot(directory: str) -> Optional[CachedPortfolio]:
+    """Load the current snapshot into a cache entry, reusing its precompressed files"""
+    try:
+        version_dir = (Path(directory) / "current").resolve(strict=True)
+    except (OSError, RuntimeError):
+        return None
+
+    manifest = json.loads((version_dir / "manifest.json").read_bytes())
+    body = (version_dir / "portfolio.json").read_bytes()
+    entry = CachedPortfolio(PortfolioData(**json.loads(body)))
+    if entry.etag != manifest["etag"]:
+        raise ValueError(f"Snapshot {version_dir} does not match its manifest")
+
+    encodings = [encoding for encoding in manifest["encodings"] if encoding in SUPPORTED_ENCODINGS]
+    for encoding in encodings:
+        entry.encoded_bodies[(None, encoding)] = (version_dir / f"portfolio.json{ENCODING_EXTENSIONS[encoding]}").read_bytes()
+    for section in manifest["sections"]:
+        section_path = version_dir / "sections" / f"{section}.json"
+        entry.section_bodies[section] = section_path.read_bytes()
+        for encoding in encodings:
+            entry.encoded_bodies[(section, encoding)] = section_path.with_name(section_path.name + ENCODING_EXTENSIONS[encoding]).read_bytes()
+    return entry
+
+
+class PortfolioSnapshot:
+    """Keeps a static prerender of the portfolio in step with writes, and optionally serves from it"""
+
+    def __init__(
+        self,
+        directory: str = PORTFOLIO_SNAPSHOT_DIR,
+        serve: bool = PORTFOLIO_SNAPSHOT_SERVE,
+        poll_seconds: float = PORTFOLIO_SNAPSHOT_POLL_SECONDS,
+    ):
+        self.directory = directory
+        self.serve = serve
+        self.poll_seconds = poll_seconds
+        self.lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._cache: Optional[PortfolioCache] = None
+        self._loaded_version: Optional[str] = None
+        self.writes = 0
+        self.failures = 0
+        self.reloads = 0
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.directory)
+
+    async def publish(self, entry: CachedPortfolio) -> None:
+        """Regenerate the snapshot for a newly written version; failures are logged, not raised"""
+        if not self.enabled:
+            return
+        try:
+            # Compressing every variant is CPU-bound, so keep it off the event loop
+            await entry.precompress()
+            async with self.lock:
+                await asyncio.to_thread(write_snapshot, entry, self.directory)
+            self.writes += 1
+            self._loaded_version = _version_name(entry)
+        except Exception as e:
+            self.failures += 1
+            logger.error(f"Failed to write portfolio snapshot: {str(e)}")
+
+    async def start(self, cache: PortfolioCache, load_latest: Callable[[], Awaitable[CachedPortfolio]]) -> None:
+        """Startup mode: make sure a snapshot exists and, when serving, pin it into the cache"""
+        if not self.enabled:
+            return
+        entry = await asyncio.to_thread(read_snapshot, self.directory)
+        if entry is None:
+            entry = await load_latest()
+            await self.publish(entry)
+        logger.info(f"Portfolio snapshot at {self.directory} (version {entry.version.isoformat()})")
+
+        if self.serve:
+            self._cache = cache
+            self._loaded_version = _version_name(entry)
+            cache.pin(entry)
+            self._task = asyncio.create_task(self._poll())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _poll(self) -> None:
+        """Pick up snapshots published by other workers; one readlink per interval"""
+        root = Path(self.directory)
+        while True:
+            await asyncio.sleep(self.poll_seconds)
+            current = _current_version(root)
+            if current is None or current == self._loaded_version:
+                continue
+            try:
+                entry = await asyncio.to_thread(read_snapshot, self.directory)
+            except Exception as e:
+                logger.error(f"Failed to reload portfolio snapshot: {str(e)}")
+                continue
+            if entry is not None:
+                self._loaded_version = _version_name(entry)
+                self._cache.pin(entry)
+                self.reloads += 1
+
+    def stats(self):
+        return {
+            "enabled": self.enabled,
+            "serving": self.serve and self._task is not None,
+            "version": self._loaded_version,
+            "writes": self.writes,
+            "failures": self.failures,
+            "reloads": self.reloads,
+        }
+
+
+portfolio_snapshot = PortfolioSnapshot()
+
+
+async def main(directory: str) -> None:
+    db = await get_database()
+    portfolio_data = await db.portfolio.find_one(DEFAULT_PORTFOLIO_FILTER, sort=[("updatedAt", -1)])
+    if not portfolio_data:
+        raise SystemExit("Portfolio data not found")
+    entry = CachedPortfolio(PortfolioData(**portfolio_data))
+    await entry.precompress()
+    target = write_snapshot(entry, directory)
+    print(target)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Prerender the latest portfolio to static JSON files")
+    parser.add_argument("--dir", default=PORTFOLIO_SNAPSHOT_DIR or None, required=not PORTFOLIO_SNAPSHOT_DIR, help="snapshot directory (default: $PORTFOLIO_SNAPSHOT_DIR)")
+    args = parser.parse_args()
+    asyncio.run(main(args.dir))
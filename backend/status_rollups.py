@@ -0,0 +1,192 @@
+import logging
+import os
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Literal, Optional, Set, Tuple
+
+from pymongo import UpdateOne
+
+from database import claim_startup_task, release_startup_task
+
+logger = logging.getLogger(__name__)
+
+# Raw status checks are removed by a TTL index after this long; 0 keeps them forever
+STATUS_CHECK_TTL_SECONDS = int(os.environ.get('STATUS_CHECK_TTL_SECONDS', str(7 * 24 * 3600)))
+# Rollups outlive the raw checks; 0 keeps them forever
+STATUS_ROLLUP_TTL_SECONDS = {
+    "minute": int(os.environ.get('STATUS_ROLLUP_MINUTE_TTL_SECONDS', str(30 * 24 * 3600))),
+    "hour": int(os.environ.get('STATUS_ROLLUP_HOUR_TTL_SECONDS', '0')),
+}
+
+# Rebuilds regroup the raw checks this much at a time
+ROLLUP_REBUILD_CHUNK = timedelta(days=1)
+# Stale bucket ids removed per delete
+ROLLUP_DELETE_BATCH_SIZE = 1000
+
+Granularity = Literal["minute", "hour"]
+
+GRANULARITIES = ("minute", "hour")
+BUCKET_FORMATS = {"minute": "%Y-%m-%dT%H:%M", "hour": "%Y-%m-%dT%H:00"}
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+def bucket_start(timestamp: datetime, granularity: Granularity) -> datetime:
+    if granularity == "hour":
+        return timestamp.replace(minute=0, second=0, microsecond=0)
+    return timestamp.replace(second=0, microsecond=0)
+
+
+def _rollup_id(granularity: Granularity, bucket: datetime, client_name: str) -> str:
+    return f"{granularity}:{bucket.strftime(BUCKET_FORMATS[granularity])}:{client_name}"
+
+
+def _rollup_fields(granularity: Granularity, client_name: str, bucket: datetime) -> Dict[str, Any]:
+    fields = {"granularity": granularity, "client_name": client_name, "bucket": bucket}
+    ttl = STATUS_ROLLUP_TTL_SECONDS[granularity]
+    if ttl:
+        fields["expireAt"] = bucket + timedelta(seconds=ttl)
+    return fields
+
+
+def _rollup_update(granularity: Granularity, client_name: str, bucket: datetime, count: int, first: datetime, last: datetime) -> UpdateOne:
+    """Count checks into a bucket"""
+    return UpdateOne(
+        {"_id": _rollup_id(granularity, bucket, client_name)},
+        {"$inc": {"count": count}, "$min": {"first": first}, "$max": {"last": last}, "$setOnInsert": _rollup_fields(granularity, client_name, bucket)},
+        upsert=True
+    )
+
+
+def _rollup_set(granularity: Granularity, client_name: str, bucket: datetime, count: int, first: datetime, last: datetime) -> UpdateOne:
+    """Overwrite a bucket with recomputed values; running it twice changes nothing"""
+    return UpdateOne(
+        {"_id": _rollup_id(granularity, bucket, client_name)},
+        {"$set": {"count": count, "first": first, "last": last, **_rollup_fields(granularity, client_name, bucket)}},
+        upsert=True
+    )
+
+
+async def record_status_check(db, check: Dict[str, Any]) -> None:
+    """Count a stored status check into its per-client minute and hour rollups
+
+    Best-effort like the contact counters: the raw check is already stored, so a
+    failure is logged and can be corrected with `rebuild_rollups` while the raw
+    checks are still retained.
+    """
+    timestamp = check["timestamp"]
+    operations = [
+        _rollup_update(granularity, check["client_name"], bucket_start(timestamp, granularity), 1, timestamp, timestamp)
+        for granularity in GRANULARITIES
+    ]
+    try:
+        await db.status_rollups.bulk_write(operations, ordered=False)
+    except Exception as e:
+        logger.error(f"Failed to update status rollups: {str(e)}")
+
+
+def _retained_since(now: datetime) -> datetime:
+    """Start of the first hour whose raw checks have not started expiring"""
+    if not STATUS_CHECK_TTL_SECONDS:
+        return _EPOCH
+    return bucket_start(now - timedelta(seconds=STATUS_CHECK_TTL_SECONDS), "hour") + timedelta(hours=1)
+
+
+async def _first_bucket(db, since: datetime, until: datetime) -> Optional[datetime]:
+    """Start of the first hour in [since, until) holding either a raw check or a rollup"""
+    candidates = []
+    check = await db.status_checks.find_one({"timestamp": {"$gte": since, "$lt": until}}, {"timestamp": 1}, sort=[("timestamp", 1)])
+    if check is not None:
+        candidates.append(check["timestamp"])
+    for granularity in GRANULARITIES:
+        rollup = await db.status_rollups.find_one(
+            {"granularity": granularity, "bucket": {"$gte": since, "$lt": until}}, {"bucket": 1}, sort=[("bucket", 1)]
+        )
+        if rollup is not None:
+            candidates.append(rollup["bucket"])
+    return max(since, bucket_start(min(candidates), "hour")) if candidates else None
+
+
+async def _rebuild_chunk(db, since: datetime, until: datetime) -> Tuple[int, int]:
+    """Recompute the buckets of one chunk and remove the ones left without checks"""
+    groups = await db.status_checks.aggregate([
+        {"$match": {"timestamp": {"$gte": since, "$lt": until}}},
+        {"$group": {
+            "_id": {"client": "$client_name", "minute": {"$dateToString": {"format": BUCKET_FORMATS["minute"], "date": "$timestamp"}}},
+            "count": {"$sum": 1},
+            "first": {"$min": "$timestamp"},
+            "last": {"$max": "$timestamp"},
+        }},
+    ]).to_list(None)
+
+    operations: List[Any] = []
+    rebuilt: Set[str] = set()
+    hours: Dict[tuple, Dict[str, Any]] = {}
+    for group in groups:
+        client_name = group["_id"]["client"]
+        minute = datetime.strptime(group["_id"]["minute"], BUCKET_FORMATS["minute"])
+        operations.append(_rollup_set("minute", client_name, minute, group["count"], group["first"], group["last"]))
+        rebuilt.add(_rollup_id("minute", minute, client_name))
+        hour = hours.setdefault((client_name, bucket_start(minute, "hour")), {"count": 0, "first": group["first"], "last": group["last"]})
+        hour["count"] += group["count"]
+        hour["first"] = min(hour["first"], group["first"])
+        hour["last"] = max(hour["last"], group["last"])
+    for (client_name, bucket), hour in hours.items():
+        operations.append(_rollup_set("hour", client_name, bucket, hour["count"], hour["first"], hour["last"]))
+        rebuilt.add(_rollup_id("hour", bucket, client_name))
+    if operations:
+        await db.status_rollups.bulk_write(operations, ordered=False)
+
+    # Only buckets wholly inside the chunk can be known to be empty
+    for granularity in GRANULARITIES:
+        existing = db.status_rollups.find({"granularity": granularity, "bucket": {"$gte": since, "$lt": bucket_start(until, granularity)}}, {"_id": 1})
+        stale = [doc["_id"] async for doc in existing if doc["_id"] not in rebuilt]
+        for offset in range(0, len(stale), ROLLUP_DELETE_BATCH_SIZE):
+            await db.status_rollups.delete_many({"_id": {"$in": stale[offset:offset + ROLLUP_DELETE_BATCH_SIZE]}})
+    return len(groups), len(hours)
+
+
+async def rebuild_rollups(db, since: Optional[datetime] = None, until: Optional[datetime] = None) -> Dict[str, int]:
+    """Recompute rollups from the raw status checks timestamped in [since, until)
+
+    `since` defaults to the first hour the raw checks still fully cover and
+    `until` to the start of the current hour, so only closed buckets are
+    rebuilt and live counting into the open ones is left alone. Buckets are
+    overwritten with $set, and those left without checks are removed, so
+    concurrent or repeated rebuilds give the same result. The range is worked
+    through a day at a time, which bounds both the buckets held in memory and
+    the size of every write sent to Mongo.
+    """
+    now = datetime.utcnow()
+    since = bucket_start(since or _retained_since(now), "hour")
+    until = until or bucket_start(now, "hour")
+
+    minutes = hours = 0
+    chunk_start = await _first_bucket(db, since, until)
+    while chunk_start is not None and chunk_start < until:
+        chunk_end = min(chunk_start + ROLLUP_REBUILD_CHUNK, until)
+        chunk_minutes, chunk_hours = await _rebuild_chunk(db, chunk_start, chunk_end)
+        minutes += chunk_minutes
+        hours += chunk_hours
+        chunk_start = chunk_end
+    return {"minutes": minutes, "hours": hours}
+
+
+async def bootstrap_rollups(db) -> None:
+    """Backfill the rollups on first start so they cover checks written before they existed
+
+    Only the worker that claims the task rebuilds, and only closed hours: the
+    open ones are already being counted into live with $inc, which a rebuild's
+    $set would overwrite. Checks from the open hour that predate the rollups
+    are folded in by the next rebuild after it closes.
+    """
+    if await db.status_rollups.find_one({}, {"_id": 1}) is not None:
+        return
+    if not await claim_startup_task(db, "status_rollups"):
+        return
+    try:
+        report = await rebuild_rollups(db, since=_EPOCH)
+    except Exception:
+        await release_startup_task(db, "status_rollups")
+        raise
+    if report["minutes"]:
+        logger.info(f"Built status rollups: {report['minutes']} minute and {report['hours']} hour buckets")
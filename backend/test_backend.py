@@ -10,7 +10,7 @@ sys.path.append('/app/backend')
 
 from models.portfolio import PortfolioData, ContactSubmissionCreate
 from database import get_database
-from routes.portfolio import get_portfolio_data, submit_contact_form, get_contact_submissions
+from routes.portfolio import load_latest_portfolio, submit_contact_form, get_contact_submissions
 
 async def test_backend_functionality():
     """Test all backend functionality"""
@@ -24,7 +24,7 @@ async def test_backend_functionality():
         
         # Test 1: Portfolio Data Retrieval
         print("\n1. Testing Portfolio Data Retrieval...")
-        portfolio_data = await get_portfolio_data(db)
+        portfolio_data = (await load_latest_portfolio(db)).portfolio
         if portfolio_data:
             print(f"✅ Portfolio data retrieved successfully!")
             print(f"   - Name: {portfolio_data.personal.name}")
@@ -44,24 +44,24 @@ async def test_backend_functionality():
             message="This is a test message from the backend test script."
         )
         
-        contact_result = await submit_contact_form(test_contact, db)
+        contact_result = json.loads((await submit_contact_form(test_contact, db)).body)
         if contact_result:
             print(f"✅ Contact form submission successful!")
-            print(f"   - ID: {contact_result.id}")
-            print(f"   - Name: {contact_result.name}")
-            print(f"   - Status: {contact_result.status}")
+            print(f"   - ID: {contact_result['id']}")
+            print(f"   - Name: {contact_result['name']}")
+            print(f"   - Status: {contact_result['status']}")
         else:
             print("❌ Failed to submit contact form")
             return False
         
         # Test 3: Contact Submissions Retrieval
         print("\n3. Testing Contact Submissions Retrieval...")
-        submissions = await get_contact_submissions(db=db)
+        submissions = json.loads((await get_contact_submissions(db=db)).body)
         if submissions:
             print(f"✅ Contact submissions retrieved successfully!")
             print(f"   - Total submissions: {len(submissions)}")
             for i, submission in enumerate(submissions[:3]):  # Show first 3
-                print(f"   - Submission {i+1}: {submission.name} - {submission.subject}")
+                print(f"   - Submission {i+1}: {submission['name']} - {submission['subject']}")
         else:
             print("❌ Failed to retrieve contact submissions")
             return False
@@ -2,7 +2,7 @@ import React, { useState, useEffect } from 'react';
 import { Card, CardContent, CardHeader, CardTitle } from './ui/card';
 import { Button } from './ui/button';
 import { Badge } from './ui/badge';
-import { portfolioService } from '../services/api';
+import { portfolioService, subscribeContactEvents } from '../services/api';
 import { LoadingSection, ErrorMessage } from './Loading';
 import { Mail, Clock, User, Eye, ArrowLeft, Home, RefreshCw, MessageSquare, TrendingUp, Users, Activity, Filter } from 'lucide-react';
 
@@ -17,6 +17,19 @@ const AdminDashboard = () => {
     fetchSubmissions();
   }, []);
 
+  // Pushed updates instead of polling the list
+  useEffect(() => {
+    return subscribeContactEvents({
+      onCreated: (submission) => setSubmissions(prev =>
+        prev.some(s => s.id === submission.id) ? prev : [submission, ...prev]
+      ),
+      onStatus: ({ id, status }) => setSubmissions(prev =>
+        prev.map(s => (s.id === id ? { ...s, status } : s))
+      ),
+      onReload: () => fetchSubmissions()
+    });
+  }, []);
+
   const fetchSubmissions = async () => {
     try {
       setLoading(true);
@@ -33,7 +46,7 @@ const AdminDashboard = () => {
   const updateStatus = async (submissionId, status) => {
     try {
       await portfolioService.updateContactStatus(submissionId, status);
-      await fetchSubmissions(); // Refresh the list
+      setSubmissions(prev => prev.map(s => (s.id === submissionId ? { ...s, status } : s)));
     } catch (err) {
       console.error('Error updating status:', err);
     }
@@ -38,6 +38,7 @@ import {
 } from 'lucide-react';
 
 import { usePortfolioData, useContactSubmission } from '../hooks/usePortfolio';
+import { assetUrl } from '../services/api';
 import { LoadingSection, ErrorMessage, SkeletonGrid } from './Loading';
 import ProjectModal from './ProjectModal';
 import TypewriterEffect from './TypewriterEffect';
@@ -168,7 +169,7 @@ const Portfolio = () => {
           <AnimatedSection delay={200}>
             <div className="relative inline-block mb-8">
               <img
-                src={portfolioData.personal.avatar}
+                src={portfolioData.personal.avatarAssetId ? assetUrl(portfolioData.personal.avatarAssetId, 320) : portfolioData.personal.avatar}
                 alt="Sahil Kayastha"
                 className="w-36 h-36 rounded-full mx-auto border-4 border-teal-500/40 shadow-2xl shadow-teal-500/20 hover:shadow-teal-500/40 transition-all duration-500 hover:scale-105"
               />
@@ -409,7 +410,7 @@ const Portfolio = () => {
                 >
                   <div className="relative overflow-hidden">
                     <img
-                      src={project.image}
+                      src={project.imageAssetId ? assetUrl(project.imageAssetId, 640) : project.image}
                       alt={project.title}
                       className="w-full h-52 object-cover transition-transform duration-500 group-hover:scale-110"
                     />
@@ -3,6 +3,7 @@ import { Dialog, DialogContent, DialogHeader, DialogTitle } from './ui/dialog';
 import { Badge } from './ui/badge';
 import { Button } from './ui/button';
 import { ExternalLink, Github, X } from 'lucide-react';
+import { assetUrl } from '../services/api';
 
 const ProjectModal = ({ project, isOpen, onClose }) => {
   if (!project) return null;
@@ -28,7 +29,7 @@ const ProjectModal = ({ project, isOpen, onClose }) => {
           {/* Project Image */}
           <div className="relative overflow-hidden rounded-lg">
             <img
-              src={project.image}
+              src={project.imageAssetId ? assetUrl(project.imageAssetId, 1280) : project.image}
               alt={project.title}
               className="w-full h-64 object-cover transition-transform duration-300 hover:scale-105"
             />
@@ -16,6 +16,40 @@ export const portfolioService = {
     }
   },
 
+  // Search portfolio content on the server instead of filtering the full download
+  searchPortfolio: async (query, { section = null, limit = 20 } = {}) => {
+    try {
+      const params = { q: query, limit, ...(section ? { section } : {}) };
+      const response = await axios.get(`${API}/portfolio/search`, { params });
+      return response.data;
+    } catch (error) {
+      console.error('Error searching portfolio:', error);
+      throw error;
+    }
+  },
+
+  // Get a hosted portfolio by its slug
+  getTenantPortfolio: async (slug) => {
+    try {
+      const response = await axios.get(`${API}/portfolios/${slug}`);
+      return response.data;
+    } catch (error) {
+      console.error(`Error fetching portfolio ${slug}:`, error);
+      throw error;
+    }
+  },
+
+  // Submit a contact form to a hosted portfolio
+  submitTenantContactForm: async (slug, formData) => {
+    try {
+      const response = await axios.post(`${API}/portfolios/${slug}/contact`, formData);
+      return response.data;
+    } catch (error) {
+      console.error(`Error submitting contact form to ${slug}:`, error);
+      throw error;
+    }
+  },
+
   // Submit contact form
   submitContactForm: async (formData) => {
     try {
@@ -39,10 +73,24 @@ export const portfolioService = {
     }
   },
 
+  // Get one page of contact submissions using cursor pagination (admin)
+  getContactSubmissionsPage: async ({ status = null, cursor = '', limit = 50 } = {}) => {
+    try {
+      const params = { cursor, limit, ...(status ? { status } : {}) };
+      const response = await axios.get(`${API}/contact`, { params });
+      return response.data;
+    } catch (error) {
+      console.error('Error fetching contact submissions page:', error);
+      throw error;
+    }
+  },
+
   // Update portfolio data (admin)
-  updatePortfolioData: async (updateData) => {
+  // Pass the ETag of the version being edited to get a 409 instead of overwriting newer changes
+  updatePortfolioData: async (updateData, etag = null) => {
     try {
-      const response = await axios.put(`${API}/portfolio`, updateData);
+      const headers = etag ? { 'If-Match': etag } : {};
+      const response = await axios.put(`${API}/portfolio`, updateData, { headers });
       return response.data;
     } catch (error) {
       console.error('Error updating portfolio data:', error);
@@ -50,6 +98,37 @@ export const portfolioService = {
     }
   },
 
+  // Add, update or remove a single projects/experience/certifications/achievements entry (admin)
+  addPortfolioItem: async (section, item) => {
+    try {
+      const response = await axios.post(`${API}/portfolio/${section}/items`, item);
+      return response.data;
+    } catch (error) {
+      console.error(`Error adding ${section} item:`, error);
+      throw error;
+    }
+  },
+
+  updatePortfolioItem: async (section, itemId, changes) => {
+    try {
+      const response = await axios.patch(`${API}/portfolio/${section}/items/${itemId}`, changes);
+      return response.data;
+    } catch (error) {
+      console.error(`Error updating ${section} item:`, error);
+      throw error;
+    }
+  },
+
+  deletePortfolioItem: async (section, itemId) => {
+    try {
+      const response = await axios.delete(`${API}/portfolio/${section}/items/${itemId}`);
+      return response.data;
+    } catch (error) {
+      console.error(`Error deleting ${section} item:`, error);
+      throw error;
+    }
+  },
+
   // Update contact submission status (admin)
   updateContactStatus: async (submissionId, status) => {
     try {
@@ -59,9 +138,52 @@ export const portfolioService = {
       console.error('Error updating contact status:', error);
       throw error;
     }
+  },
+
+  // Update many contact submission statuses at once (admin)
+  // updates: [{ id, status }] or pass { filter, status } instead
+  bulkUpdateContactStatus: async (payload) => {
+    try {
+      const response = await axios.post(`${API}/contact/bulk-status`, payload);
+      return response.data;
+    } catch (error) {
+      console.error('Error bulk updating contact status:', error);
+      throw error;
+    }
+  },
+
+  // Upload an image to the asset store (admin); returns its id and widths
+  uploadAsset: async (file) => {
+    try {
+      const formData = new FormData();
+      formData.append('file', file);
+      const response = await axios.post(`${API}/assets`, formData);
+      return response.data;
+    } catch (error) {
+      console.error('Error uploading asset:', error);
+      throw error;
+    }
   }
 };
 
+// Live contact submission events (admin). handlers: { onCreated, onStatus, onReload }
+// onReload fires when the server cannot replay what was missed; refetch the list then.
+// EventSource reconnects and resumes with Last-Event-ID on its own. Returns a close function.
+export const subscribeContactEvents = ({ onCreated, onStatus, onReload } = {}) => {
+  const source = new EventSource(`${API}/contact/events`);
+  const parse = (handler) => (event) => handler && handler(JSON.parse(event.data));
+  source.addEventListener('contact.created', parse(onCreated));
+  source.addEventListener('contact.status', parse(onStatus));
+  source.addEventListener('contact.bulk_status', parse(onReload));
+  source.addEventListener('reset', parse(onReload));
+  source.onerror = (error) => console.error('Contact event stream error:', error);
+  return () => source.close();
+};
+
+// URL for a stored asset, optionally the closest variant at least `width` pixels wide
+export const assetUrl = (assetId, width = null) =>
+  `${API}/assets/${assetId}${width ? `?w=${width}` : ''}`;
+
 // Health check
 export const healthCheck = async () => {
   try {
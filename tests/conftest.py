@@ -0,0 +1,85 @@
+import os
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / "backend"
+sys.path.insert(0, str(BACKEND_DIR))
+
+# Never reached: every test swaps in an in-memory mongomock-motor client
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+
+import httpx
+from mongomock_motor import AsyncMongoMockClient
+
+import database
+import seed_data
+from indexes import ensure_indexes
+from cache import portfolio_cache, tenant_cache
+from dedupe import RecentFingerprints, contact_dedupe
+from models.portfolio import ContactSubmission
+from ratelimit import contact_rate_limit, mongo_latency
+from server import app
+
+CONTACT_FORM = {
+    "name": "Ada Lovelace",
+    "email": "ada@example.com",
+    "subject": "Project enquiry",
+    "message": "I would like to talk about a project together.",
+}
+
+
+async def insert_submissions(db, count, start=None, **fields):
+    """Store `count` submissions directly, one minute apart from `start`; returns their documents"""
+    start = start or datetime(2024, 1, 1, 12, 0)
+    documents = [
+        ContactSubmission(**{**CONTACT_FORM, "message": f"{CONTACT_FORM['message']} #{n}", "submittedAt": start + timedelta(minutes=n), **fields}).dict()
+        for n in range(count)
+    ]
+    await db.contact_submissions.insert_many(documents)
+    return documents
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+def _reset_process_state():
+    # Caches, buckets and fingerprints are process-wide; each test starts from empty
+    portfolio_cache.invalidate()
+    for slug in list(tenant_cache._entries):
+        tenant_cache.invalidate(slug)
+    contact_dedupe.recent = RecentFingerprints(contact_dedupe.recent.size, contact_dedupe.window_seconds)
+    for limiter in (contact_rate_limit.per_ip, contact_rate_limit.global_bucket):
+        if limiter:
+            limiter.buckets.clear()
+    mongo_latency.ewma_ms = 0.0
+    mongo_latency.samples = 0
+
+
+@pytest.fixture
+async def db():
+    """Fresh in-memory database with the declared indexes and the default portfolio seeded"""
+    _reset_process_state()
+    database.close()
+    mock_db = database.connect(AsyncMongoMockClient())
+    await ensure_indexes(mock_db)
+    await seed_data.seed_portfolio_data()
+    yield mock_db
+    database.close()
+    _reset_process_state()
+
+
+@pytest.fixture
+async def client(db):
+    """HTTP client calling the app in-process; the lifespan hooks are not run"""
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://testserver") as http_client:
+        yield http_client
+
+
+@pytest.fixture
+def contact_form():
+    return dict(CONTACT_FORM)
@@ -0,0 +1,141 @@
+import io
+import os
+import stat
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+import pytest
+from PIL import Image
+
+import assets
+from assets import IMMUTABLE_CACHE_CONTROL, AssetMetadataCache, RangeNotSatisfiable, parse_range, write_blob
+
+pytestmark = pytest.mark.anyio
+
+SVG = b'<svg xmlns="http://www.w3.org/2000/svg" width="10" height="10"><rect width="10" height="10"/></svg>'
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    import routes.assets
+
+    monkeypatch.setattr(routes.assets, "store_asset", partial(assets.store_asset, root=tmp_path))
+    monkeypatch.setattr(routes.assets, "blob_path", partial(assets.blob_path, root=tmp_path))
+    monkeypatch.setattr(routes.assets, "asset_metadata", AssetMetadataCache())
+    return tmp_path
+
+
+def _png(width: int = 700, height: int = 350) -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", (width, height), (200, 40, 40)).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+async def _upload(client, data: bytes, filename: str = "photo.png", content_type: str = "image/png"):
+    return await client.post("/api/assets", files={"file": (filename, data, content_type)})
+
+
+def test_parse_range():
+    assert parse_range(None, 100) is None
+    assert parse_range("bytes=0-9", 100) == (0, 9)
+    assert parse_range("bytes=90-", 100) == (90, 99)
+    assert parse_range("bytes=-10", 100) == (90, 99)
+    assert parse_range("bytes=50-500", 100) == (50, 99)
+    # Unknown units and multi-range requests get the whole file
+    assert parse_range("items=0-1", 100) is None
+    assert parse_range("bytes=0-1,5-6", 100) is None
+    for header in ("bytes=100-", "bytes=9-3", "bytes=-0"):
+        with pytest.raises(RangeNotSatisfiable):
+            parse_range(header, 100)
+
+
+def test_write_blob_is_content_addressed_and_leaves_no_temporaries(tmp_path):
+    digest, path = write_blob(b"hello", tmp_path)
+    assert write_blob(b"hello", tmp_path) == (digest, path)
+    assert path.read_bytes() == b"hello"
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o644
+
+    # Concurrent writers of the same bytes each use their own temporary file
+    with ThreadPoolExecutor(8) as pool:
+        results = set(pool.map(lambda _: write_blob(b"shared", tmp_path), range(32)))
+    [(_, shared_path)] = results
+    assert shared_path.read_bytes() == b"shared"
+    assert [name for name in os.listdir(shared_path.parent) if name.endswith(".tmp")] == []
+
+
+async def test_upload_stores_width_variants(client, store):
+    response = await _upload(client, _png())
+
+    assert response.status_code == 201
+    info = response.json()
+    assert info["contentType"] == "image/png"
+    assert (info["width"], info["height"]) == (700, 350)
+    assert [variant["width"] for variant in info["variants"]] == [320, 640]
+
+    assert (await client.get(f"/api/assets/{info['id']}/info")).json()["variants"] == info["variants"]
+    # The same bytes again reuse what is stored
+    assert (await _upload(client, _png())).status_code == 200
+
+
+async def test_upload_rejects_what_is_not_an_image(client, store):
+    assert (await _upload(client, b"#!/bin/sh\n", "run.sh", "image/png")).status_code == 415
+    assert (await _upload(client, b"", "empty.png")).status_code == 415
+
+
+async def test_asset_is_served_immutable_with_the_closest_width(client, store):
+    data = _png()
+    info = (await _upload(client, data)).json()
+
+    response = await client.get(f"/api/assets/{info['id']}")
+    assert response.status_code == 200
+    assert response.content == data
+    assert response.headers["cache-control"] == IMMUTABLE_CACHE_CONTROL
+    assert response.headers["etag"] == f'"{info["id"]}"'
+
+    narrow = await client.get(f"/api/assets/{info['id']}", params={"w": 300})
+    assert Image.open(io.BytesIO(narrow.content)).width == 320
+    assert narrow.headers["etag"] == f'"{info["variants"][0]["sha256"]}"'
+
+    revalidated = await client.get(f"/api/assets/{info['id']}", headers={"If-None-Match": response.headers["etag"]})
+    assert revalidated.status_code == 304
+    assert (await client.get(f"/api/assets/{'0' * 64}")).status_code == 404
+    assert (await client.get("/api/assets/not-a-digest")).status_code == 404
+
+
+async def test_range_requests(client, store):
+    data = _png()
+    info = (await _upload(client, data)).json()
+    url = f"/api/assets/{info['id']}"
+
+    partial_content = await client.get(url, headers={"Range": "bytes=0-9"})
+    assert partial_content.status_code == 206
+    assert partial_content.headers["content-range"] == f"bytes 0-9/{len(data)}"
+    assert partial_content.content == data[:10]
+
+    suffix = await client.get(url, headers={"Range": "bytes=-5"})
+    assert suffix.content == data[-5:]
+
+    head = await client.head(url, headers={"Range": "bytes=10-19"})
+    assert head.status_code == 206
+    assert head.headers["content-length"] == "10"
+    assert head.content == b""
+
+    unsatisfiable = await client.get(url, headers={"Range": f"bytes={len(data)}-"})
+    assert unsatisfiable.status_code == 416
+    assert unsatisfiable.headers["content-range"] == f"bytes */{len(data)}"
+
+    # A partial copy of some other version gets the whole asset
+    stale = await client.get(url, headers={"Range": "bytes=0-9", "If-Range": '"something-else"'})
+    assert stale.status_code == 200
+    assert stale.content == data
+
+
+async def test_svg_cannot_run_script_in_our_origin(client, store):
+    info = (await _upload(client, SVG, "icon.svg", "image/svg+xml")).json()
+    assert info["contentType"] == "image/svg+xml"
+    assert info["variants"] == []
+
+    response = await client.get(f"/api/assets/{info['id']}")
+    assert response.content == SVG
+    assert "sandbox" in response.headers["content-security-policy"]
+    assert response.headers["x-content-type-options"] == "nosniff"
@@ -0,0 +1,68 @@
+from datetime import datetime
+
+import pytest
+
+from contact_stats import rebuild_counters
+from tests.conftest import insert_submissions
+
+pytestmark = pytest.mark.anyio
+
+
+async def _statuses(db):
+    return {doc["id"]: doc["status"] async for doc in db.contact_submissions.find({}, {"id": 1, "status": 1})}
+
+
+async def test_explicit_updates_report_each_item(client, db):
+    first, second, third = await insert_submissions(db, 3)
+    await db.contact_submissions.update_one({"id": second["id"]}, {"$set": {"status": "read"}})
+
+    response = await client.post("/api/contact/bulk-status", json={"updates": [
+        {"id": first["id"], "status": "read"},
+        {"id": second["id"], "status": "read"},
+        {"id": "missing", "status": "read"},
+        {"id": third["id"], "status": "read"},
+        # The last update for an id wins
+        {"id": third["id"], "status": "responded"},
+    ]})
+
+    assert response.status_code == 200
+    result = response.json()
+    assert (result["matched"], result["modified"]) == (3, 2)
+    items = {item["id"]: item for item in result["items"]}
+    assert (items[first["id"]]["matched"], items[first["id"]]["modified"]) == (True, True)
+    assert (items[second["id"]]["matched"], items[second["id"]]["modified"]) == (True, False)
+    assert items["missing"]["matched"] is False
+    assert await _statuses(db) == {first["id"]: "read", second["id"]: "read", third["id"]: "responded"}
+
+
+async def test_filter_moves_matching_submissions(client, db):
+    documents = await insert_submissions(db, 4, start=datetime(2024, 1, 1))
+    await rebuild_counters(db)
+
+    response = await client.post("/api/contact/bulk-status", json={
+        "filter": {"status": "new", "submittedBefore": "2024-01-01T00:02:00"},
+        "status": "read",
+    })
+
+    assert response.json() == {"matched": 2, "modified": 2, "items": None}
+    statuses = await _statuses(db)
+    assert [statuses[doc["id"]] for doc in documents] == ["read", "read", "new", "new"]
+    stats = (await client.get("/api/contact/stats")).json()
+    assert stats["byStatus"] == {"new": 2, "read": 2}
+
+
+@pytest.mark.parametrize("payload", [
+    {},
+    {"status": "read"},
+    {"filter": {}, "status": "read"},
+    {"updates": [], "filter": {"status": "new"}, "status": "read"},
+    {"updates": [{"id": str(n), "status": "read"} for n in range(1001)]},
+])
+async def test_invalid_requests_are_rejected(client, payload):
+    assert (await client.post("/api/contact/bulk-status", json=payload)).status_code == 400
+
+
+async def test_unknown_status_is_a_validation_error(client, db):
+    (document,) = await insert_submissions(db, 1)
+    response = await client.post("/api/contact/bulk-status", json={"updates": [{"id": document["id"], "status": "archived"}]})
+    assert response.status_code == 422
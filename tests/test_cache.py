@@ -0,0 +1,63 @@
+import asyncio
+
+import pytest
+
+from cache import portfolio_cache
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_repeat_reads_are_cache_hits(client):
+    first = await client.get("/api/portfolio")
+    misses = portfolio_cache.misses
+    hits = portfolio_cache.hits
+
+    second = await client.get("/api/portfolio")
+
+    assert second.content == first.content
+    assert portfolio_cache.misses == misses
+    assert portfolio_cache.hits == hits + 1
+
+
+async def test_expired_entry_is_revalidated_by_version(client):
+    await client.get("/api/portfolio")
+    entry = portfolio_cache.peek()
+    entry.loaded_at -= portfolio_cache.ttl_seconds + 1
+    misses = portfolio_cache.misses
+
+    await client.get("/api/portfolio")
+
+    # Same version in Mongo: the entry is kept, only its age is reset
+    assert portfolio_cache.peek() is entry
+    assert portfolio_cache.revalidations == 1
+    assert portfolio_cache.misses == misses
+
+
+async def test_expired_entry_is_replaced_when_a_newer_version_exists(client, db):
+    body = (await client.get("/api/portfolio")).json()
+    await db.portfolio.update_one({"id": body["id"]}, {"$set": {"personal.title": "Changed elsewhere"}})
+    await db.portfolio.update_one({"id": body["id"]}, {"$currentDate": {"updatedAt": True}})
+    portfolio_cache.peek().loaded_at -= portfolio_cache.ttl_seconds + 1
+
+    assert (await client.get("/api/portfolio")).json()["personal"]["title"] == "Changed elsewhere"
+
+
+async def test_writes_go_through_the_cache(client):
+    body = (await client.get("/api/portfolio")).json()
+    personal = {**body["personal"], "title": "Staff Engineer"}
+
+    updated = await client.put("/api/portfolio", json={"personal": personal})
+
+    assert portfolio_cache.peek().version.isoformat() in updated.json()["updatedAt"]
+    assert (await client.get("/api/portfolio")).json()["personal"]["title"] == "Staff Engineer"
+
+
+async def test_disabled_cache_reads_without_the_refill_lock(client, monkeypatch):
+    monkeypatch.setattr(portfolio_cache, "ttl_seconds", 0)
+    portfolio_cache.invalidate()
+
+    async with portfolio_cache.lock:
+        response = await asyncio.wait_for(client.get("/api/portfolio"), timeout=5)
+
+    assert response.status_code == 200
+    assert portfolio_cache.peek() is None
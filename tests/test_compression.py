@@ -0,0 +1,80 @@
+import gzip
+
+import httpx
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse, Response
+from starlette.routing import Route
+
+from cache import CachedPortfolio, portfolio_cache
+from compression import SUPPORTED_ENCODINGS, CompressionMiddleware, compress, negotiate_encoding
+
+pytestmark = pytest.mark.anyio
+
+
+def test_negotiation_prefers_the_best_accepted_coding():
+    assert negotiate_encoding("gzip, br", 4096) == SUPPORTED_ENCODINGS[0]
+    assert negotiate_encoding("gzip", 4096) == "gzip"
+    assert negotiate_encoding("*", 4096) == SUPPORTED_ENCODINGS[0]
+    assert negotiate_encoding("identity", 4096) is None
+
+
+def test_negotiation_honours_zero_quality_and_minimum_size():
+    assert negotiate_encoding("br;q=0, gzip;q=0", 4096) is None
+    assert negotiate_encoding("*;q=0, gzip", 4096) == "gzip"
+    assert negotiate_encoding("gzip", 100, minimum_size=1024) is None
+    assert negotiate_encoding(None, 4096) is None
+
+
+def test_gzip_output_is_deterministic():
+    body = b'{"hello": "world"}' * 200
+    assert compress(body, "gzip") == compress(body, "gzip")
+    assert gzip.decompress(compress(body, "gzip", precompressed=True)) == body
+
+
+async def test_portfolio_is_served_compressed_with_its_own_etag(client):
+    plain = await client.get("/api/portfolio", headers={"Accept-Encoding": "identity"})
+    zipped = await client.get("/api/portfolio", headers={"Accept-Encoding": "gzip"})
+
+    assert "content-encoding" not in plain.headers
+    assert zipped.headers["content-encoding"] == "gzip"
+    assert zipped.content == plain.content
+    assert zipped.headers["etag"] == plain.headers["etag"][:-1] + '-gzip"'
+    assert "Accept-Encoding" in zipped.headers["vary"]
+
+    revalidated = await client.get("/api/portfolio", headers={"Accept-Encoding": "gzip", "If-None-Match": zipped.headers["etag"]})
+    assert revalidated.status_code == 304
+    assert "content-encoding" not in revalidated.headers
+
+
+async def test_precompress_builds_every_variant(client):
+    await client.get("/api/portfolio")
+    entry: CachedPortfolio = portfolio_cache.peek()
+    await entry.precompress()
+
+    for encoding in SUPPORTED_ENCODINGS:
+        assert (None, encoding) in entry.encoded_bodies
+        assert ("projects", encoding) in entry.encoded_bodies
+    assert gzip.decompress(entry.encoded_body("gzip")) == entry.body
+    # Shared: a second call does not compress again
+    assert entry.precompress() is entry.precompress()
+
+
+async def test_middleware_compresses_large_responses_only():
+    async def large(request):
+        return PlainTextResponse("x" * 4096)
+
+    async def small(request):
+        return PlainTextResponse("x")
+
+    async def stream(request):
+        return Response("data: x\n\n" * 500, media_type="text/event-stream")
+
+    app = CompressionMiddleware(Starlette(routes=[Route("/large", large), Route("/small", small), Route("/stream", stream)]))
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://testserver") as http_client:
+        headers = {"Accept-Encoding": "gzip"}
+        large_response = await http_client.get("/large", headers=headers)
+        assert large_response.headers["content-encoding"] == "gzip"
+        assert large_response.text == "x" * 4096
+        assert "content-encoding" not in (await http_client.get("/small", headers=headers)).headers
+        assert "content-encoding" not in (await http_client.get("/stream", headers=headers)).headers
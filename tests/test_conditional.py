@@ -0,0 +1,68 @@
+from datetime import datetime
+
+import pytest
+from starlette.datastructures import Headers
+
+from conditional import encoded_etag, is_not_modified, make_etag, parse_etag
+
+pytestmark = pytest.mark.anyio
+
+
+async def _latest(client):
+    response = await client.get("/api/portfolio")
+    assert response.status_code == 200
+    return response
+
+
+def test_etag_round_trip():
+    version = datetime(2024, 3, 1, 9, 30, 0, 250000)
+    etag = make_etag("portfolio-id", version)
+    assert parse_etag(etag) == ("portfolio-id", version)
+    assert parse_etag(encoded_etag(etag, "br")) == ("portfolio-id", version)
+    assert parse_etag("nonsense") is None
+
+
+def test_if_none_match_uses_weak_comparison():
+    version = datetime(2024, 3, 1)
+    etag = make_etag("p", version)
+    assert is_not_modified(Headers({"if-none-match": f'"other", W/{etag}'}), etag, version)
+    assert is_not_modified(Headers({"if-none-match": encoded_etag(etag, "gzip")}), etag, version)
+    assert not is_not_modified(Headers({"if-none-match": '"other"'}), etag, version)
+
+
+def test_if_modified_since_is_ignored_when_if_none_match_is_present():
+    version = datetime(2024, 3, 1)
+    etag = make_etag("p", version)
+    headers = Headers({"if-none-match": '"other"', "if-modified-since": "Sat, 01 Jan 2050 00:00:00 GMT"})
+    assert not is_not_modified(headers, etag, version)
+
+
+async def test_get_revalidates_with_etag(client):
+    response = await _latest(client)
+    etag = response.headers["etag"]
+    assert response.headers["cache-control"] == "no-cache"
+
+    not_modified = await client.get("/api/portfolio", headers={"If-None-Match": etag})
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+    assert not_modified.headers["etag"] == etag
+
+    changed = await client.get("/api/portfolio", headers={"If-None-Match": '"something-else"'})
+    assert changed.status_code == 200
+
+
+async def test_get_revalidates_with_last_modified(client):
+    response = await _latest(client)
+    last_modified = response.headers["last-modified"]
+
+    assert (await client.get("/api/portfolio", headers={"If-Modified-Since": last_modified})).status_code == 304
+    assert (await client.get("/api/portfolio", headers={"If-Modified-Since": "Mon, 01 Jan 2001 00:00:00 GMT"})).status_code == 200
+
+
+async def test_write_changes_the_etag(client):
+    response = await _latest(client)
+    etag = response.headers["etag"]
+    personal = {**response.json()["personal"], "title": "Principal Engineer"}
+    assert (await client.put("/api/portfolio", json={"personal": personal})).status_code == 200
+
+    assert (await client.get("/api/portfolio", headers={"If-None-Match": etag})).status_code == 200
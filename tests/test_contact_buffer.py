@@ -0,0 +1,76 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+
+import routes.portfolio
+from contact_buffer import ContactBufferFull, ContactWriteBuffer
+from models.portfolio import ContactSubmission
+
+pytestmark = pytest.mark.anyio
+
+
+def _submission(n: int) -> dict:
+    return ContactSubmission(
+        name="Ada", email=f"ada{n}@example.com", subject="Hello", message=f"Message number {n}",
+        submittedAt=datetime.utcnow()
+    ).dict()
+
+
+def _buffer() -> ContactWriteBuffer:
+    # The interval is long enough that only a full batch or stop() flushes
+    return ContactWriteBuffer(enabled=True, batch_size=100, flush_interval_ms=60_000, queue_size=10)
+
+
+async def test_stop_flushes_queued_submissions(db):
+    buffer = _buffer()
+    buffer.start(db)
+    for n in range(3):
+        await buffer.enqueue(_submission(n))
+    assert await db.contact_submissions.count_documents({}) == 0
+
+    await buffer.stop()
+
+    assert await db.contact_submissions.count_documents({}) == 3
+    assert buffer.flushed == 3
+    assert buffer.depth == 0
+    assert (await db.contact_stats.find_one({"_id": "totals"}))["total"] == 3
+
+
+async def test_full_batch_flushes_without_waiting(db):
+    buffer = ContactWriteBuffer(enabled=True, batch_size=2, flush_interval_ms=60_000, queue_size=10)
+    buffer.start(db)
+    try:
+        await buffer.enqueue(_submission(0))
+        await buffer.enqueue(_submission(1))
+        for _ in range(100):
+            if buffer.flushed:
+                break
+            await asyncio.sleep(0.01)
+        assert await db.contact_submissions.count_documents({}) == 2
+    finally:
+        await buffer.stop()
+
+
+async def test_enqueue_after_stop_is_refused(db):
+    buffer = _buffer()
+    buffer.start(db)
+    await buffer.stop()
+    assert not buffer.running
+    with pytest.raises(ContactBufferFull):
+        await buffer.enqueue(_submission(0))
+
+
+async def test_submission_is_answered_before_it_is_written(client, db, contact_form, monkeypatch):
+    buffer = _buffer()
+    buffer.start(db)
+    monkeypatch.setattr(routes.portfolio, "contact_write_buffer", buffer)
+
+    response = await client.post("/api/contact", json=contact_form)
+    assert response.status_code == 200
+    assert await db.contact_submissions.find_one({"id": response.json()["id"]}) is None
+
+    await buffer.stop()
+    stored = await db.contact_submissions.find_one({"id": response.json()["id"]})
+    assert stored is not None
+    assert stored["email"] == contact_form["email"]
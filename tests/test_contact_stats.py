@@ -0,0 +1,92 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+import contact_stats
+from contact_stats import aggregate_stats, bootstrap_counters, read_counters, rebuild_counters
+from tests.conftest import insert_submissions
+
+pytestmark = pytest.mark.anyio
+
+
+def _comparable(stats: dict) -> dict:
+    return {key: value for key, value in stats.items() if key not in ("source", "backlog")}
+
+
+@pytest.fixture
+async def spread(db):
+    """Six submissions two hours apart ending an hour ago, two of them read"""
+    start = datetime.utcnow().replace(minute=0, second=0, microsecond=0) - timedelta(hours=11)
+    documents = []
+    for n in range(6):
+        documents += await insert_submissions(db, 1, start=start + timedelta(hours=2 * n), status="read" if n % 3 == 0 else "new")
+    return documents
+
+
+@pytest.mark.parametrize("granularity", ["day", "hour"])
+async def test_counters_agree_with_the_aggregation(db, spread, granularity):
+    await rebuild_counters(db)
+
+    counters = await read_counters(db, granularity=granularity)
+    aggregated = await aggregate_stats(db, granularity=granularity)
+
+    assert _comparable(counters) == _comparable(aggregated)
+    assert counters["total"] == 6
+    assert counters["byStatus"] == {"new": 4, "read": 2}
+    assert sum(bucket["count"] for bucket in counters["buckets"]) == 6
+
+
+async def test_stats_fall_back_to_the_aggregation_until_counters_exist(client, db, spread):
+    stats = (await client.get("/api/contact/stats")).json()
+    assert stats["source"] == "aggregate"
+    assert stats["total"] == 6
+
+    assert (await client.post("/api/contact/stats/rebuild")).json() == {"total": 6, "days": len({doc["submittedAt"].date() for doc in spread})}
+    assert (await client.get("/api/contact/stats")).json()["source"] == "counters"
+
+
+async def test_backlog_reports_the_oldest_unread_submission(db, spread):
+    await rebuild_counters(db)
+    backlog = (await read_counters(db))["backlog"]
+    oldest_new = min(doc["submittedAt"] for doc in spread if doc["status"] == "new")
+    assert backlog["count"] == 4
+    assert backlog["oldestSubmittedAt"] == oldest_new
+
+
+async def test_submissions_and_status_changes_move_the_counters(client, db, contact_form):
+    await rebuild_counters(db)
+    submission = (await client.post("/api/contact", json=contact_form)).json()
+    assert (await read_counters(db))["byStatus"] == {"new": 1}
+
+    assert (await client.put(f"/api/contact/{submission['id']}", params={"status": "responded"})).status_code == 200
+    assert (await read_counters(db))["byStatus"] == {"responded": 1}
+
+
+async def test_single_status_update_rejects_unknown_statuses(client, db):
+    (document,) = await insert_submissions(db, 1)
+    response = await client.put(f"/api/contact/{document['id']}", params={"status": "archived"})
+    assert response.status_code == 422
+    assert (await db.contact_submissions.find_one({"id": document["id"]}))["status"] == "new"
+
+
+async def test_rebuild_drops_counters_for_days_without_submissions(db, spread):
+    await db.contact_stats.insert_one({"_id": "day:2000-01-01", "day": "2000-01-01", "total": 5, "hours": {}})
+    await rebuild_counters(db)
+    assert await db.contact_stats.find_one({"_id": "day:2000-01-01"}) is None
+
+
+async def test_bootstrap_rebuilds_once_across_workers(db, spread, monkeypatch):
+    rebuilds = []
+    original = contact_stats.rebuild_counters
+
+    async def counting_rebuild(target):
+        rebuilds.append(1)
+        return await original(target)
+
+    monkeypatch.setattr(contact_stats, "rebuild_counters", counting_rebuild)
+    await asyncio.gather(bootstrap_counters(db), bootstrap_counters(db))
+    await bootstrap_counters(db)
+
+    assert len(rebuilds) == 1
+    assert (await read_counters(db))["total"] == 6
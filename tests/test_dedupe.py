@@ -0,0 +1,123 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+import dedupe
+from dedupe import ContactDeduplicator, RecentFingerprints, contact_dedupe, fingerprint
+
+pytestmark = pytest.mark.anyio
+
+
+def test_fingerprint_ignores_case_and_whitespace():
+    assert fingerprint("Ada@Example.com", "Hello", "Hi  there\n") == fingerprint("ada@example.com", "hello", "hi there")
+    assert fingerprint("ada@example.com", "hello", "hi there") != fingerprint("ada@example.com", "hello", "hi there!")
+
+
+def test_fingerprint_is_scoped_to_tenant():
+    assert fingerprint("a@b.co", "s", "m") != fingerprint("a@b.co", "s", "m", tenant="acme")
+
+
+def test_claim_within_window_returns_original(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(dedupe.time, "monotonic", lambda: clock[0])
+    deduplicator = ContactDeduplicator(window_seconds=60)
+    original = {"id": "first", "submittedAt": datetime(2024, 1, 1)}
+
+    assert deduplicator.claim("key", original) is None
+    clock[0] += 59
+    assert deduplicator.claim("key", {"id": "second", "submittedAt": datetime(2024, 1, 1)})["id"] == "first"
+
+    # Once the window has passed the same content is a new submission
+    clock[0] += 2
+    assert deduplicator.claim("key", {"id": "third", "submittedAt": datetime(2024, 1, 1)}) is None
+    assert deduplicator.suppressed_memory == 1
+
+
+def test_release_lets_a_retry_through():
+    deduplicator = ContactDeduplicator(window_seconds=60)
+    deduplicator.claim("key", {"id": "first", "submittedAt": datetime(2024, 1, 1)})
+    deduplicator.release("key")
+    assert deduplicator.claim("key", {"id": "retry", "submittedAt": datetime(2024, 1, 1)}) is None
+
+
+def test_storage_key_is_shared_within_a_window():
+    deduplicator = ContactDeduplicator(window_seconds=600)
+    start = datetime(2024, 1, 1, 12, 0)
+    assert deduplicator.storage_key("k", start) == deduplicator.storage_key("k", start + timedelta(minutes=9))
+    assert deduplicator.storage_key("k", start) != deduplicator.storage_key("k", start + timedelta(minutes=10))
+
+
+def test_recent_fingerprints_are_bounded():
+    recent = RecentFingerprints(size=2, window_seconds=60)
+    for key in ("a", "b", "c"):
+        recent.add(key, {"id": key})
+    assert recent.get("a") is None
+    assert len(recent) == 2
+
+
+async def test_repeat_submission_gets_the_original(client, db, contact_form):
+    first = await client.post("/api/contact", json=contact_form)
+    repeat = await client.post("/api/contact", json={**contact_form, "message": contact_form["message"].upper()})
+
+    assert first.status_code == repeat.status_code == 200
+    assert repeat.json()["id"] == first.json()["id"]
+    assert await db.contact_submissions.count_documents({}) == 1
+
+
+async def test_repeat_submission_rejected_under_reject_policy(client, contact_form, monkeypatch):
+    monkeypatch.setattr(contact_dedupe, "policy", "reject")
+    assert (await client.post("/api/contact", json=contact_form)).status_code == 200
+    assert (await client.post("/api/contact", json=contact_form)).status_code == 409
+
+
+async def test_repeat_seen_by_another_worker_is_refused_by_the_insert(client, db, contact_form):
+    first = await client.post("/api/contact", json=contact_form)
+    # Another worker has its own memory; only the stored dedupeKey knows about the first one
+    contact_dedupe.recent = RecentFingerprints(contact_dedupe.recent.size, contact_dedupe.window_seconds)
+
+    repeat = await client.post("/api/contact", json=contact_form)
+    assert repeat.json()["id"] == first.json()["id"]
+    assert await db.contact_submissions.count_documents({}) == 1
+
+
+async def test_same_message_to_another_portfolio_is_kept(client, db, contact_form):
+    body = (await client.get("/api/portfolio")).json()
+    document = {key: value for key, value in body.items() if key not in ("id", "slug", "createdAt", "updatedAt")}
+    assert (await client.post("/api/portfolios", json={**document, "slug": "acme"})).status_code == 201
+
+    default = await client.post("/api/contact", json=contact_form)
+    tenant = await client.post("/api/portfolios/acme/contact", json=contact_form)
+    assert default.json()["id"] != tenant.json()["id"]
+    assert await db.contact_submissions.count_documents({}) == 2
+
+
+def _fingerprint(form: dict) -> str:
+    return fingerprint(form["email"], form["subject"], form["message"])
+
+
+async def test_refused_insert_without_a_stored_original_releases_the_claim(client, db, contact_form, monkeypatch):
+    assert (await client.post("/api/contact", json=contact_form)).status_code == 200
+    contact_dedupe.recent = RecentFingerprints(contact_dedupe.recent.size, contact_dedupe.window_seconds)
+
+    # The insert is refused, but the submission it collided with cannot be found
+    async def no_original(db, storage_key):
+        return None
+
+    monkeypatch.setattr(contact_dedupe, "stored_original", no_original)
+    assert (await client.post("/api/contact", json=contact_form)).status_code == 500
+    assert contact_dedupe.recent.get(_fingerprint(contact_form)) is None
+
+
+async def test_failed_insert_releases_the_claim(client, db, contact_form, monkeypatch):
+    insert_one = type(db.contact_submissions).insert_one
+
+    async def failing_insert(collection, document, *args, **kwargs):
+        raise RuntimeError("connection reset")
+
+    monkeypatch.setattr(type(db.contact_submissions), "insert_one", failing_insert)
+    assert (await client.post("/api/contact", json=contact_form)).status_code == 500
+    assert contact_dedupe.recent.get(_fingerprint(contact_form)) is None
+
+    monkeypatch.setattr(type(db.contact_submissions), "insert_one", insert_one)
+    assert (await client.post("/api/contact", json=contact_form)).status_code == 200
+    assert await db.contact_submissions.count_documents({}) == 1
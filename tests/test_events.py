@@ -0,0 +1,116 @@
+import json
+
+import pytest
+
+from broadcast import EventBroadcaster, TooManySubscribers, contact_events, format_event
+
+pytestmark = pytest.mark.anyio
+
+
+def _parse(message: bytes) -> dict:
+    fields = dict(line.split(": ", 1) for line in message.decode().strip().split("\n"))
+    if "data" in fields:
+        fields["data"] = json.loads(fields["data"])
+    return fields
+
+
+def test_format_event():
+    assert format_event("e-1", "contact.created", b'{"a":1}') == b'id: e-1\nevent: contact.created\ndata: {"a":1}\n\n'
+    assert format_event(None, "ping", b"{}") == b"event: ping\ndata: {}\n\n"
+
+
+async def test_publish_reaches_every_subscriber():
+    events = EventBroadcaster()
+    first, _ = events.subscribe()
+    second, _ = events.subscribe()
+
+    events.publish("contact.created", {"id": "a"})
+
+    for subscriber in (first, second):
+        message = _parse(subscriber.queue.get_nowait())
+        assert message == {"id": f"{events.epoch}-1", "event": "contact.created", "data": {"id": "a"}}
+
+
+async def test_resume_replays_only_what_was_missed():
+    events = EventBroadcaster()
+    for n in range(3):
+        events.publish("contact.created", {"n": n})
+
+    _, backlog = events.subscribe(f"{events.epoch}-1")
+
+    assert [_parse(message)["data"]["n"] for message in backlog] == [1, 2]
+    assert events.stats()["resumed"] == 1
+    assert events.subscribe(f"{events.epoch}-3")[1] == []
+
+
+@pytest.mark.parametrize("last_event_id", ["1-1", "garbage", "{epoch}-99", "{epoch}-1"])
+async def test_gaps_that_cannot_be_replayed_reset(last_event_id):
+    events = EventBroadcaster(history=2)
+    for n in range(4):
+        events.publish("contact.created", {"n": n})
+
+    # Another epoch, an unparseable id, one from the future, or one older than the history
+    _, backlog = events.subscribe(last_event_id.format(epoch=events.epoch))
+
+    assert [_parse(message)["event"] for message in backlog] == ["reset"]
+    assert events.resets == 1
+
+
+async def test_slow_subscriber_is_disconnected_not_buffered():
+    events = EventBroadcaster(queue_size=2)
+    slow, _ = events.subscribe()
+    for n in range(3):
+        events.publish("contact.created", {"n": n})
+
+    assert events.stats()["subscribers"] == 0
+    assert events.dropped == 1
+    chunks = [chunk async for chunk in events.stream(slow, [])]
+    assert chunks == [b"retry: 3000\n\n"]
+
+
+async def test_subscriber_limit():
+    events = EventBroadcaster(max_subscribers=1)
+    subscriber, _ = events.subscribe()
+    with pytest.raises(TooManySubscribers):
+        events.subscribe()
+    events.unsubscribe(subscriber)
+    events.subscribe()
+
+
+async def test_stream_sends_backlog_then_heartbeats_then_live_events():
+    events = EventBroadcaster(heartbeat_seconds=0.01)
+    events.publish("contact.created", {"n": 0})
+    subscriber, backlog = events.subscribe(f"{events.epoch}-0")
+    stream = events.stream(subscriber, backlog)
+
+    assert await stream.__anext__() == b"retry: 3000\n\n"
+    assert _parse(await stream.__anext__())["data"] == {"n": 0}
+    assert await stream.__anext__() == b": heartbeat\n\n"
+    events.publish("contact.created", {"n": 1})
+    assert _parse(await stream.__anext__())["data"] == {"n": 1}
+
+    await stream.aclose()
+    assert events.stats()["subscribers"] == 0
+
+
+async def test_submissions_and_status_changes_are_published(client, contact_form):
+    subscriber, _ = contact_events.subscribe()
+    try:
+        created = (await client.post("/api/contact", json=contact_form)).json()
+        await client.put(f"/api/contact/{created['id']}", params={"status": "read"})
+        # Setting the same status again is not a change
+        await client.put(f"/api/contact/{created['id']}", params={"status": "read"})
+
+        messages = [_parse(subscriber.queue.get_nowait()) for _ in range(subscriber.queue.qsize())]
+        assert [message["event"] for message in messages] == ["contact.created", "contact.status"]
+        assert messages[0]["data"]["id"] == created["id"]
+        assert messages[1]["data"] == {"id": created["id"], "status": "read", "previousStatus": "new"}
+    finally:
+        contact_events.unsubscribe(subscriber)
+
+
+async def test_event_stream_refuses_subscribers_past_the_limit(client, monkeypatch):
+    monkeypatch.setattr(contact_events, "max_subscribers", 0)
+    response = await client.get("/api/contact/events")
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "5"
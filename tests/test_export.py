@@ -0,0 +1,60 @@
+import csv
+import io
+import json
+from datetime import datetime
+
+import pytest
+
+from routes.portfolio import CONTACT_EXPORT_FIELDS, _stream_contact_export
+from tests.conftest import insert_submissions
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_ndjson_export_is_oldest_first(client, db):
+    documents = await insert_submissions(db, 5)
+
+    response = await client.get("/api/contact/export", params={"batch_size": 2})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert 'filename="contact_submissions.ndjson"' in response.headers["content-disposition"]
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["id"] for row in rows] == [doc["id"] for doc in documents]
+    assert set(rows[0]) == set(CONTACT_EXPORT_FIELDS)
+
+
+async def test_csv_export_has_a_header_row(client, db):
+    documents = await insert_submissions(db, 3)
+
+    response = await client.get("/api/contact/export", params={"format": "csv"})
+
+    assert response.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [row["id"] for row in rows] == [doc["id"] for doc in documents]
+    assert rows[0]["submittedAt"] == documents[0]["submittedAt"].isoformat()
+
+
+async def test_export_filters(client, db):
+    documents = await insert_submissions(db, 4, start=datetime(2024, 1, 1))
+    await db.contact_submissions.update_one({"id": documents[3]["id"]}, {"$set": {"status": "read"}})
+
+    by_status = await client.get("/api/contact/export", params={"status": "read"})
+    assert [json.loads(line)["id"] for line in by_status.text.splitlines()] == [documents[3]["id"]]
+
+    by_range = await client.get("/api/contact/export", params={"since": "2024-01-01T00:01:00Z", "until": "2024-01-01T00:03:00Z"})
+    assert [json.loads(line)["id"] for line in by_range.text.splitlines()] == [documents[1]["id"], documents[2]["id"]]
+
+
+async def test_export_is_encoded_one_batch_at_a_time(db):
+    await insert_submissions(db, 5)
+    cursor = db.contact_submissions.find({}, {"_id": 0}).sort("submittedAt", 1)
+
+    chunks = [chunk async for chunk in _stream_contact_export(cursor, "ndjson", batch_size=2)]
+
+    assert [chunk.count(b"\n") for chunk in chunks] == [2, 2, 1]
+
+
+async def test_csv_header_is_sent_even_without_rows(client):
+    response = await client.get("/api/contact/export", params={"format": "csv"})
+    assert response.text.strip() == ",".join(CONTACT_EXPORT_FIELDS)
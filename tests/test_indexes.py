@@ -0,0 +1,45 @@
+import pytest
+from mongomock_motor import AsyncMongoMockClient
+
+from indexes import INDEXES, ensure_indexes
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def empty_db():
+    return AsyncMongoMockClient()["indexes_test"]
+
+
+async def test_creates_every_declared_index_once(empty_db):
+    report = await ensure_indexes(empty_db)
+    for collection_name, declared in INDEXES.items():
+        assert report[collection_name]["created"] == [index.document["name"] for index in declared]
+
+    again = await ensure_indexes(empty_db)
+    assert all(not any(result.values()) for result in again.values())
+
+
+async def test_check_only_reports_without_creating(empty_db):
+    report = await ensure_indexes(empty_db, create=False)
+    assert "id_unique" in report["portfolio"]["missing"]
+    assert report["portfolio"]["created"] == []
+    assert "id_unique" not in await empty_db.portfolio.index_information()
+
+
+async def test_reports_an_index_that_differs_from_its_declaration(empty_db):
+    await empty_db.assets.create_index("id", name="id_unique")
+    report = await ensure_indexes(empty_db)
+    assert report["assets"]["conflicting"] == ["id_unique"]
+
+
+async def test_undeclared_indexes_are_reported_or_dropped(empty_db):
+    await empty_db.portfolio.create_index("personal.name", name="by_name")
+
+    report = await ensure_indexes(empty_db)
+    assert report["portfolio"]["extra"] == ["by_name"]
+    assert "by_name" in await empty_db.portfolio.index_information()
+
+    report = await ensure_indexes(empty_db, drop_extra=True)
+    assert report["portfolio"]["dropped"] == ["by_name"]
+    assert "by_name" not in await empty_db.portfolio.index_information()
@@ -0,0 +1,86 @@
+from types import SimpleNamespace
+
+import pytest
+
+from metrics import Histogram, HistogramFamily, MongoCommandMetrics, mongo_command_duration, request_duration
+
+pytestmark = pytest.mark.anyio
+
+
+def _sample(text: str, line_start: str) -> float:
+    (line,) = [line for line in text.splitlines() if line.startswith(line_start)]
+    return float(line.rsplit(" ", 1)[1])
+
+
+def test_histogram_buckets_are_cumulative_when_rendered():
+    family = HistogramFamily("demo_seconds", "Demo", ("kind",), bounds=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        family.labels("a").observe(value)
+
+    lines = family.render()
+
+    assert 'demo_seconds_bucket{kind="a",le="0.1"} 2' in lines
+    assert 'demo_seconds_bucket{kind="a",le="1.0"} 3' in lines
+    assert 'demo_seconds_bucket{kind="a",le="+Inf"} 4' in lines
+    assert 'demo_seconds_count{kind="a"} 4' in lines
+    assert family.labels("a").total == pytest.approx(3.65)
+
+
+def test_histogram_puts_values_on_a_bound_in_that_bucket():
+    histogram = Histogram(bounds=(1.0, 2.0))
+    histogram.observe(1.0)
+    histogram.observe(2.5)
+    assert histogram.counts == [1, 0, 1]
+
+
+def test_label_values_are_escaped():
+    family = HistogramFamily("demo_seconds", "Demo", ("route",), bounds=(1.0,))
+    family.labels('/a"b\\c').observe(0.5)
+    assert 'demo_seconds_count{route="/a\\"b\\\\c"} 1' in family.render()
+
+
+async def test_requests_are_timed_by_route_template(client):
+    label = 'http_request_duration_seconds_count{method="GET",route="/api/portfolios/{slug}",status="404"}'
+    before = request_duration.labels("GET", "/api/portfolios/{slug}", "404").counts[:]
+
+    for slug in ("nobody", "no-one"):
+        assert (await client.get(f"/api/portfolios/{slug}")).status_code == 404
+
+    response = await client.get("/api/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert _sample(response.text, label) == sum(before) + 2
+    assert "/api/portfolios/nobody" not in response.text
+    assert _sample(response.text, "http_requests_in_flight ") == 1
+
+
+async def test_metrics_include_in_process_state(client):
+    await client.get("/api/portfolio")
+    text = (await client.get("/api/metrics")).text
+
+    assert _sample(text, 'portfolio_cache_events_total{event="misses"}') >= 1
+    assert "# TYPE contact_buffer_depth gauge" in text
+    assert "# TYPE rate_limit_decisions_total counter" in text
+
+
+def test_mongo_commands_are_timed_per_collection():
+    listener = MongoCommandMetrics()
+    before = sum(mongo_command_duration.labels("find", "metrics_probe", "success").counts)
+
+    started = SimpleNamespace(request_id=1, connection_id=("localhost", 27017), command_name="find", command={"find": "metrics_probe"})
+    listener.started(started)
+    listener.succeeded(SimpleNamespace(request_id=1, connection_id=("localhost", 27017), command_name="find", duration_micros=2500))
+
+    histogram = mongo_command_duration.labels("find", "metrics_probe", "success")
+    assert sum(histogram.counts) == before + 1
+    assert listener._pending == {}
+
+
+def test_get_more_is_attributed_to_its_collection():
+    listener = MongoCommandMetrics()
+    before = sum(mongo_command_duration.labels("getMore", "metrics_probe", "failure").counts)
+
+    listener.started(SimpleNamespace(request_id=2, connection_id=1, command_name="getMore", command={"getMore": 99, "collection": "metrics_probe"}))
+    listener.failed(SimpleNamespace(request_id=2, connection_id=1, command_name="getMore", duration_micros=1000))
+
+    assert sum(mongo_command_duration.labels("getMore", "metrics_probe", "failure").counts) == before + 1
@@ -0,0 +1,59 @@
+import base64
+import json
+from datetime import datetime
+
+import pytest
+from fastapi import HTTPException
+
+from pagination import NEXT, PREV, decode_cursor, encode_cursor
+
+pytestmark = pytest.mark.anyio
+
+
+def test_cursor_round_trip():
+    timestamp = datetime(2024, 5, 1, 12, 30, 15, 123000)
+    cursor = encode_cursor(timestamp, "abc", PREV)
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == (timestamp, "abc", PREV)
+
+
+def test_cursor_keeps_millisecond_precision():
+    # Mongo stores milliseconds; anything finer would make the keyset skip items
+    timestamp, _, _ = decode_cursor(encode_cursor(datetime(2024, 5, 1, 0, 0, 0, 999999), "x", NEXT))
+    assert timestamp == datetime(2024, 5, 1, 0, 0, 0, 999000)
+
+
+@pytest.mark.parametrize("cursor", [
+    "not-a-cursor",
+    base64.urlsafe_b64encode(b"[1, 2]").decode(),
+    base64.urlsafe_b64encode(json.dumps({"t": 0, "id": "x", "d": "sideways"}).encode()).decode(),
+    base64.urlsafe_b64encode(json.dumps({"id": "x", "d": "next"}).encode()).decode(),
+])
+def test_bad_cursor_is_rejected(cursor):
+    with pytest.raises(HTTPException) as excinfo:
+        decode_cursor(cursor)
+    assert excinfo.value.status_code == 400
+
+
+async def test_contact_list_rejects_bad_cursor(client):
+    response = await client.get("/api/contact", params={"cursor": "garbage"})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid cursor"
+
+
+async def test_contact_list_pages_forward_and_back(client, contact_form):
+    for n in range(5):
+        response = await client.post("/api/contact", json={**contact_form, "message": f"{contact_form['message']} #{n}"}, headers={"X-Forwarded-For": f"10.0.0.{n}"})
+        assert response.status_code == 200
+
+    first = (await client.get("/api/contact", params={"cursor": "", "limit": 2})).json()
+    second = (await client.get("/api/contact", params={"cursor": first["next_cursor"], "limit": 2})).json()
+    third = (await client.get("/api/contact", params={"cursor": second["next_cursor"], "limit": 2})).json()
+
+    ids = [item["id"] for page in (first, second, third) for item in page["items"]]
+    newest_first = [item["id"] for item in (await client.get("/api/contact")).json()]
+    assert ids == newest_first
+    assert third["next_cursor"] is None
+
+    back = (await client.get("/api/contact", params={"cursor": second["prev_cursor"], "limit": 2})).json()
+    assert [item["id"] for item in back["items"]] == [item["id"] for item in first["items"]]
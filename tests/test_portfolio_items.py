@@ -0,0 +1,110 @@
+import pytest
+
+from cache import portfolio_cache
+
+pytestmark = pytest.mark.anyio
+
+
+async def _latest(client):
+    response = await client.get("/api/portfolio", headers={"Accept-Encoding": "identity"})
+    assert response.status_code == 200
+    return response
+
+
+def _document(body: dict) -> dict:
+    return {key: value for key, value in body.items() if key not in ("id", "slug", "createdAt", "updatedAt")}
+
+
+async def test_add_update_and_delete_an_item(client):
+    project = {**(await _latest(client)).json()["projects"][0], "id": 9001}
+
+    added = await client.post("/api/portfolio/projects/items", json=project)
+    assert added.status_code == 201
+    updated = await client.patch("/api/portfolio/projects/items/9001", json={"title": "Renamed"})
+    assert updated.status_code == 200
+    assert updated.json()["title"] == "Renamed"
+    assert updated.headers["etag"] == (await _latest(client)).headers["etag"]
+
+    projects = (await _latest(client)).json()["projects"]
+    assert [item["title"] for item in projects if item["id"] == 9001] == ["Renamed"]
+
+    assert (await client.delete("/api/portfolio/projects/items/9001")).status_code == 200
+    assert all(item["id"] != 9001 for item in (await _latest(client)).json()["projects"])
+
+
+async def test_item_errors(client):
+    project = (await _latest(client)).json()["projects"][0]
+
+    assert (await client.post("/api/portfolio/projects/items", json=project)).status_code == 409
+    assert (await client.patch("/api/portfolio/projects/items/424242", json={"title": "x"})).status_code == 404
+    assert (await client.delete("/api/portfolio/projects/items/424242")).status_code == 404
+    assert (await client.patch(f"/api/portfolio/projects/items/{project['id']}", json={"id": 5})).status_code == 422
+    assert (await client.patch(f"/api/portfolio/projects/items/{project['id']}", json={"colour": "red"})).status_code == 422
+    assert (await client.post("/api/portfolio/secrets/items", json=project)).status_code == 404
+
+
+async def test_item_routes_honour_if_match(client):
+    response = await _latest(client)
+    project = {**response.json()["projects"][0], "id": 9001}
+
+    added = await client.post("/api/portfolio/projects/items", json=project, headers={"If-Match": response.headers["etag"]})
+    assert added.status_code == 201
+
+    stale = await client.post("/api/portfolio/projects/items", json={**project, "id": 9002}, headers={"If-Match": response.headers["etag"]})
+    assert stale.status_code == 409
+    fresh = await client.post("/api/portfolio/projects/items", json={**project, "id": 9002}, headers={"If-Match": added.headers["etag"]})
+    assert fresh.status_code == 201
+
+
+async def test_edit_after_a_newer_version_lands_on_the_newer_version(client, db):
+    version_a = (await _latest(client)).json()
+    project_id = version_a["projects"][0]["id"]
+    # The cached copy still points at version A, as it would within its TTL or on another worker
+    cached = portfolio_cache.peek()
+    stored = await db.portfolio.find_one({"id": version_a["id"]}, {"_id": 0})
+    await db.portfolio.insert_one({**stored, "id": "version-b", "updatedAt": stored["updatedAt"].replace(year=2099)})
+    assert portfolio_cache.get() is cached
+
+    response = await client.patch(f"/api/portfolio/projects/items/{project_id}", json={"title": "Edited"})
+
+    assert response.status_code == 200
+    assert (await db.portfolio.find_one({"id": "version-b"}))["projects"][0]["title"] == "Edited"
+    assert (await db.portfolio.find_one({"id": version_a["id"]}))["projects"][0]["title"] != "Edited"
+    assert (await _latest(client)).json()["id"] == "version-b"
+
+
+async def test_edit_with_an_older_versions_etag_conflicts(client, db):
+    version_a = await _latest(client)
+    project_id = version_a.json()["projects"][0]["id"]
+    assert (await client.post("/api/portfolio", json=_document(version_a.json()))).status_code == 200
+
+    response = await client.patch(f"/api/portfolio/projects/items/{project_id}", json={"title": "Edited"}, headers={"If-Match": version_a.headers["etag"]})
+
+    assert response.status_code == 409
+    assert (await db.portfolio.find_one({"id": version_a.json()["id"]}))["projects"][0]["title"] != "Edited"
+
+
+async def test_item_missing_from_the_latest_version_is_not_found(client, db):
+    version_a = (await _latest(client)).json()
+    project_id = version_a["projects"][0]["id"]
+    document = _document(version_a)
+    document["projects"] = document["projects"][1:]
+    assert (await client.post("/api/portfolio", json=document)).status_code == 200
+
+    # Version A still has the item, but it is not the latest
+    response = await client.patch(f"/api/portfolio/projects/items/{project_id}", json={"title": "Edited"})
+
+    assert response.status_code == 404
+    assert (await db.portfolio.find_one({"id": version_a["id"]}))["projects"][0]["title"] != "Edited"
+
+
+async def test_tenant_etag_does_not_edit_default_items(client):
+    body = (await _latest(client)).json()
+    tenant = await client.post("/api/portfolios", json={**_document(body), "slug": "acme"})
+    assert tenant.status_code == 201
+
+    project = {**body["projects"][0], "id": 9003}
+    response = await client.post("/api/portfolio/projects/items", json=project, headers={"If-Match": tenant.headers["etag"]})
+    assert response.status_code == 409
+    tenant_projects = (await client.get("/api/portfolios/acme")).json()["projects"]
+    assert all(item["id"] != 9003 for item in tenant_projects)
@@ -0,0 +1,74 @@
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+async def _latest(client):
+    response = await client.get("/api/portfolio")
+    assert response.status_code == 200
+    return response
+
+
+def _document(body: dict) -> dict:
+    return {key: value for key, value in body.items() if key not in ("id", "slug", "createdAt", "updatedAt")}
+
+
+async def test_put_with_current_if_match_succeeds(client):
+    response = await _latest(client)
+    personal = {**response.json()["personal"], "title": "Principal Engineer"}
+
+    updated = await client.put("/api/portfolio", json={"personal": personal}, headers={"If-Match": response.headers["etag"]})
+    assert updated.status_code == 200
+    assert updated.json()["personal"]["title"] == "Principal Engineer"
+    assert updated.headers["etag"] != response.headers["etag"]
+
+
+async def test_put_with_stale_if_match_conflicts(client):
+    response = await _latest(client)
+    stale = response.headers["etag"]
+    personal = response.json()["personal"]
+
+    assert (await client.put("/api/portfolio", json={"personal": personal}, headers={"If-Match": stale})).status_code == 200
+    conflict = await client.put("/api/portfolio", json={"personal": {**personal, "title": "Lost update"}}, headers={"If-Match": stale})
+    assert conflict.status_code == 409
+    assert (await _latest(client)).json()["personal"]["title"] != "Lost update"
+
+
+async def test_put_for_an_older_version_that_still_exists_conflicts(client, db):
+    version_a = await _latest(client)
+    version_b = await client.post("/api/portfolio", json={**_document(version_a.json()), "personal": {**version_a.json()["personal"], "title": "Version B"}})
+    assert version_b.status_code == 200
+
+    conflict = await client.put(
+        "/api/portfolio",
+        json={"personal": {**version_a.json()["personal"], "title": "Edit of A"}},
+        headers={"If-Match": version_a.headers["etag"]}
+    )
+
+    assert conflict.status_code == 409
+    latest = (await _latest(client)).json()
+    assert latest["id"] == version_b.json()["id"]
+    assert latest["personal"]["title"] == "Version B"
+    assert (await db.portfolio.find_one({"id": version_a.json()["id"]}))["personal"]["title"] != "Edit of A"
+
+
+async def test_put_without_if_match_edits_the_latest_version(client):
+    version_a = await _latest(client)
+    version_b = await client.post("/api/portfolio", json=_document(version_a.json()))
+
+    updated = await client.put("/api/portfolio", json={"personal": {**version_a.json()["personal"], "title": "Unconditional"}})
+
+    assert updated.json()["id"] == version_b.json()["id"]
+
+
+async def test_put_with_unparseable_if_match(client):
+    personal = (await _latest(client)).json()["personal"]
+    response = await client.put("/api/portfolio", json={"personal": personal}, headers={"If-Match": "nonsense"})
+    assert response.status_code == 400
+
+
+async def test_put_with_tenant_etag_conflicts(client):
+    body = (await _latest(client)).json()
+    tenant = await client.post("/api/portfolios", json={**_document(body), "slug": "acme"})
+    response = await client.put("/api/portfolio", json={"personal": body["personal"]}, headers={"If-Match": tenant.headers["etag"]})
+    assert response.status_code == 409
@@ -0,0 +1,116 @@
+import httpx
+import pytest
+from starlette.requests import Request
+
+import ratelimit
+from ratelimit import TokenBucketLimiter, client_ip, contact_rate_limit, mongo_latency, parse_limit
+from server import app
+
+pytestmark = pytest.mark.anyio
+
+
+def _peer_client(peer: str) -> httpx.AsyncClient:
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app, client=(peer, 1234)), base_url="http://testserver")
+
+
+def _request(peer: str, forwarded_for: str = "") -> Request:
+    headers = [(b"x-forwarded-for", forwarded_for.encode())] if forwarded_for else []
+    return Request({"type": "http", "headers": headers, "client": (peer, 1234)})
+
+
+def test_parse_limit():
+    assert parse_limit("5/60") == (5 / 60, 5)
+    assert parse_limit("20") == (20, 20)
+    assert parse_limit("off") is None
+
+
+def test_bucket_refills_over_time():
+    limiter = TokenBucketLimiter(rate=1, capacity=2)
+    assert limiter.acquire("a", now=0) == 0
+    assert limiter.acquire("a", now=0) == 0
+    assert limiter.acquire("a", now=0) == pytest.approx(1)
+    assert limiter.acquire("a", now=1) == 0
+    # Other clients have their own bucket
+    assert limiter.acquire("b", now=1) == 0
+
+
+def test_bucket_evicts_least_recent_client():
+    limiter = TokenBucketLimiter(rate=1, capacity=1, max_keys=2)
+    for key in ("a", "b", "c"):
+        limiter.acquire(key, now=0)
+    assert list(limiter.buckets) == ["b", "c"]
+    assert limiter.evicted == 1
+
+
+def test_client_ip_trusts_only_the_proxy_hops():
+    # The client can prepend anything; the proxy appends the address it saw
+    request = _request("10.0.0.1", "6.6.6.6, 203.0.113.7")
+    assert client_ip(request, trusted_proxies=1) == "203.0.113.7"
+    assert client_ip(request, trusted_proxies=2) == "6.6.6.6"
+    assert client_ip(request, trusted_proxies=0) == "10.0.0.1"
+    assert client_ip(_request("10.0.0.1"), trusted_proxies=1) == "10.0.0.1"
+
+
+async def test_contact_form_is_rate_limited_per_client(db, contact_form, monkeypatch):
+    monkeypatch.setattr(contact_rate_limit, "per_ip", TokenBucketLimiter(rate=0.01, capacity=2))
+
+    async with _peer_client("203.0.113.7") as client:
+        for n in range(2):
+            response = await client.post("/api/contact", json={**contact_form, "message": f"{contact_form['message']} {n}"})
+            assert response.status_code == 200
+
+        limited = await client.post("/api/contact", json=contact_form)
+        assert limited.status_code == 429
+        assert int(limited.headers["retry-after"]) >= 1
+
+    async with _peer_client("203.0.113.8") as client:
+        other = await client.post("/api/contact", json={**contact_form, "message": "From someone else entirely"})
+        assert other.status_code == 200
+
+
+async def test_forwarded_for_is_ignored_by_default(client, contact_form, monkeypatch):
+    monkeypatch.setattr(contact_rate_limit, "per_ip", TokenBucketLimiter(rate=0.01, capacity=2))
+
+    # A client rotating spoofed addresses still drains the bucket of its socket peer
+    for n in range(2):
+        response = await client.post("/api/contact", json={**contact_form, "message": f"{contact_form['message']} {n}"}, headers={"X-Forwarded-For": f"198.51.100.{n}"})
+        assert response.status_code == 200
+    spoofed = await client.post("/api/contact", json=contact_form, headers={"X-Forwarded-For": "198.51.100.99"})
+    assert spoofed.status_code == 429
+    assert list(contact_rate_limit.per_ip.buckets) == ["127.0.0.1"]
+
+
+async def test_forwarded_for_is_used_behind_trusted_proxies(client, contact_form, monkeypatch):
+    monkeypatch.setattr(contact_rate_limit, "per_ip", TokenBucketLimiter(rate=0.01, capacity=1))
+    monkeypatch.setattr(ratelimit, "client_ip", lambda request: client_ip(request, trusted_proxies=1))
+
+    for n in range(2):
+        response = await client.post("/api/contact", json={**contact_form, "message": f"{contact_form['message']} {n}"}, headers={"X-Forwarded-For": f"203.0.113.{n}"})
+        assert response.status_code == 200
+    assert list(contact_rate_limit.per_ip.buckets) == ["203.0.113.0", "203.0.113.1"]
+
+
+def test_proxy_trust_is_opt_in():
+    assert client_ip(_request("10.0.0.1", "6.6.6.6")) == "10.0.0.1"
+
+
+async def test_contact_form_is_shed_when_mongo_is_slow(client, db, contact_form):
+    mongo_latency.observe(mongo_latency.threshold_ms * 10)
+    assert mongo_latency.overloaded
+
+    response = await client.post("/api/contact", json=contact_form)
+    assert response.status_code == 503
+    assert "retry-after" in response.headers
+    assert await db.contact_submissions.count_documents({}) == 0
+
+
+def test_reads_that_stream_do_not_count_as_overload():
+    class Event:
+        def __init__(self, command_name, duration_ms):
+            self.command_name = command_name
+            self.duration_micros = duration_ms * 1000
+
+    before = mongo_latency.samples
+    mongo_latency.succeeded(Event("getMore", 60_000))
+    mongo_latency.succeeded(Event("aggregate", 60_000))
+    assert mongo_latency.samples == before
@@ -0,0 +1,74 @@
+from datetime import datetime
+
+import pytest
+
+from models.portfolio import PortfolioData
+from search import PortfolioSearchIndex, tokenize
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def portfolio(client):
+    return PortfolioData(**(await client.get("/api/portfolio")).json())
+
+
+def _index(portfolio: PortfolioData) -> PortfolioSearchIndex:
+    index = PortfolioSearchIndex()
+    index.sync(portfolio, portfolio.updatedAt)
+    return index
+
+
+def test_tokenize_keeps_language_names_whole():
+    assert tokenize("C++, C# and Node.js.") == ["c++", "c#", "and", "node.js"]
+
+
+async def test_title_matches_rank_first(portfolio):
+    hits = _index(portfolio).search("chatbot")
+    assert hits[0]["section"] == "projects"
+    assert hits[0]["title"] == "AI-Powered Chatbot with RAG"
+
+
+async def test_last_term_matches_as_a_prefix(portfolio):
+    index = _index(portfolio)
+    assert any(hit["title"] == "AI-Powered Chatbot with RAG" for hit in index.search("chatb"))
+    # Earlier terms must match whole tokens
+    assert index.search("chatb rag") and index.search("chatb rag")[0]["title"] == "AI-Powered Chatbot with RAG"
+
+
+async def test_section_filter_and_limit(portfolio):
+    index = _index(portfolio)
+    hits = index.search("python", section="projects", limit=2)
+    assert len(hits) == 2
+    assert all(hit["section"] == "projects" for hit in hits)
+    assert index.search("zzzz-nothing") == []
+
+
+async def test_sync_only_reindexes_changed_entries(portfolio):
+    index = _index(portfolio)
+    project = portfolio.projects[0]
+    untouched = index.items[("projects", portfolio.projects[1].id)]
+    title_weight = index.postings["chatbot"][("projects", project.id)]
+
+    changed = portfolio.model_copy(deep=True)
+    changed.projects[0].title = "Quantum Teapot"
+    changed.projects = changed.projects[:-1]
+    index.sync(changed, datetime(2099, 1, 1))
+
+    assert index.search("teapot")[0]["id"] == project.id
+    assert ("projects", portfolio.projects[-1].id) not in index.items
+    assert index.items[("projects", portfolio.projects[1].id)] is untouched
+    # Only the title lost the word; the description still has it
+    assert index.postings["chatbot"].get(("projects", project.id), 0) < title_weight
+
+
+async def test_search_endpoint_sees_writes(client):
+    body = (await client.get("/api/portfolio")).json()
+    project = {**body["projects"][0], "id": 9100, "title": "Orbital Greenhouse"}
+    assert (await client.post("/api/portfolio/projects/items", json=project)).status_code == 201
+
+    response = await client.get("/api/portfolio/search", params={"q": "greenhouse"})
+
+    assert response.status_code == 200
+    assert response.json()["hits"][0]["id"] == 9100
+    assert (await client.get("/api/portfolio/search", params={"q": ""})).status_code == 422
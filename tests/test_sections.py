@@ -0,0 +1,39 @@
+import json
+
+import pytest
+
+from cache import portfolio_cache
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.mark.parametrize("cached", [True, False])
+async def test_section_matches_the_full_document(client, cached):
+    full = (await client.get("/api/portfolio")).json()
+    if not cached:
+        # Uncached sections are projected out of the latest document
+        portfolio_cache.invalidate()
+
+    for section in ("personal", "projects", "skills"):
+        response = await client.get(f"/api/portfolio/{section}")
+        assert response.status_code == 200
+        assert json.loads(response.content) == full[section]
+
+
+async def test_cached_and_projected_sections_share_an_etag(client):
+    cached = await client.get("/api/portfolio/projects")
+    portfolio_cache.invalidate()
+    projected = await client.get("/api/portfolio/projects")
+    assert cached.headers["etag"] == projected.headers["etag"]
+    assert (await client.get("/api/portfolio/projects", headers={"If-None-Match": cached.headers["etag"]})).status_code == 304
+
+
+async def test_sections_have_their_own_etag(client):
+    etag = (await client.get("/api/portfolio")).headers["etag"]
+    projects = (await client.get("/api/portfolio/projects")).headers["etag"]
+    skills = (await client.get("/api/portfolio/skills")).headers["etag"]
+    assert len({etag, projects, skills}) == 3
+
+
+async def test_unknown_section_is_not_found(client):
+    assert (await client.get("/api/portfolio/passwords")).status_code == 404
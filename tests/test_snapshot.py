@@ -0,0 +1,119 @@
+import asyncio
+import gzip
+import json
+import os
+from datetime import timedelta
+
+import pytest
+
+import snapshot
+from cache import CachedPortfolio, portfolio_cache
+from models.portfolio import DEFAULT_PORTFOLIO_FILTER, PortfolioData
+from snapshot import PortfolioSnapshot, read_snapshot, write_snapshot
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def entry(db):
+    document = await db.portfolio.find_one(DEFAULT_PORTFOLIO_FILTER, sort=[("updatedAt", -1)])
+    return CachedPortfolio(PortfolioData(**document))
+
+
+def _newer(entry: CachedPortfolio, minutes: int = 1) -> CachedPortfolio:
+    portfolio = entry.portfolio.model_copy(deep=True)
+    portfolio.updatedAt = portfolio.updatedAt + timedelta(minutes=minutes)
+    return CachedPortfolio(portfolio)
+
+
+async def test_write_renders_every_variant_and_switches_current(entry, tmp_path):
+    target = write_snapshot(entry, str(tmp_path))
+
+    assert os.readlink(tmp_path / "current") == os.path.join("versions", target.name)
+    assert (target / "portfolio.json").read_bytes() == entry.body
+    assert gzip.decompress((target / "portfolio.json.gz").read_bytes()) == entry.body
+    assert (target / "sections" / "skills.json").read_bytes() == entry.section_body("skills")
+    assert json.loads((target / "manifest.json").read_text())["etag"] == entry.etag
+    # Nothing is left behind from staging the version or the link
+    assert [path.name for path in (tmp_path / "versions").iterdir()] == [target.name]
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["current", "versions"]
+
+
+async def test_read_round_trips_with_the_precompressed_files(entry, tmp_path):
+    write_snapshot(entry, str(tmp_path))
+
+    loaded = read_snapshot(str(tmp_path))
+
+    assert loaded.etag == entry.etag
+    assert loaded.body == entry.body
+    assert loaded.encoded_bodies[(None, "br")] == entry.encoded_body("br")
+    assert loaded.section_bodies["projects"] == entry.section_body("projects")
+    assert read_snapshot(str(tmp_path / "missing")) is None
+
+
+async def test_failed_write_leaves_the_current_version_in_place(entry, tmp_path, monkeypatch):
+    first = write_snapshot(entry, str(tmp_path))
+
+    def fail_part_way(path, body, encoded):
+        path.write_bytes(body[:10])
+        raise OSError("disk full")
+
+    monkeypatch.setattr(snapshot, "_write_variants", fail_part_way)
+    newer = _newer(entry)
+    with pytest.raises(OSError):
+        write_snapshot(newer, str(tmp_path))
+
+    assert os.readlink(tmp_path / "current") == os.path.join("versions", first.name)
+    assert read_snapshot(str(tmp_path)).etag == entry.etag
+    assert not (tmp_path / "versions" / snapshot._version_name(newer)).exists()
+
+
+async def test_older_version_never_replaces_a_newer_one(entry, tmp_path):
+    newer = _newer(entry)
+    write_snapshot(newer, str(tmp_path))
+    write_snapshot(entry, str(tmp_path))
+    assert read_snapshot(str(tmp_path)).etag == newer.etag
+
+
+async def test_only_a_few_versions_are_kept(entry, tmp_path):
+    for minutes in range(5):
+        write_snapshot(_newer(entry, minutes), str(tmp_path))
+    assert len(list((tmp_path / "versions").iterdir())) == snapshot.PORTFOLIO_SNAPSHOT_KEEP_VERSIONS
+
+
+async def test_writes_publish_a_new_snapshot(client, tmp_path, monkeypatch):
+    monkeypatch.setattr(snapshot.portfolio_snapshot, "directory", str(tmp_path))
+    body = (await client.get("/api/portfolio")).json()
+
+    response = await client.put("/api/portfolio", json={"personal": {**body["personal"], "title": "Snapshot title"}})
+
+    assert response.status_code == 200
+    assert read_snapshot(str(tmp_path)).portfolio.personal.title == "Snapshot title"
+
+
+async def test_serving_mode_reads_from_the_snapshot(client, db, entry, tmp_path, monkeypatch):
+    monkeypatch.setattr(portfolio_cache, "pinned", False)
+    write_snapshot(entry, str(tmp_path))
+    serving = PortfolioSnapshot(directory=str(tmp_path), serve=True, poll_seconds=0.01)
+
+    async def load_latest():
+        raise AssertionError("an existing snapshot should not need Mongo")
+
+    await serving.start(portfolio_cache, load_latest)
+    try:
+        await db.portfolio.delete_many({})
+        response = await client.get("/api/portfolio", headers={"Accept-Encoding": "identity"})
+        assert response.status_code == 200
+        assert response.headers["etag"] == entry.etag
+
+        # Another worker publishes a newer version; the poller picks it up
+        newer = _newer(entry)
+        write_snapshot(newer, str(tmp_path))
+        for _ in range(100):
+            if serving.reloads:
+                break
+            await asyncio.sleep(0.01)
+        assert serving.reloads == 1
+        assert portfolio_cache.get().etag == newer.etag
+    finally:
+        await serving.stop()
@@ -0,0 +1,119 @@
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+
+import status_rollups
+from status_rollups import bootstrap_rollups, bucket_start, rebuild_rollups, record_status_check
+
+pytestmark = pytest.mark.anyio
+
+
+async def _insert_checks(db, client_name: str, timestamps):
+    documents = [{"id": str(uuid.uuid4()), "client_name": client_name, "timestamp": timestamp} for timestamp in timestamps]
+    await db.status_checks.insert_many([dict(document) for document in documents])
+    return documents
+
+
+async def _counts(db, granularity: str) -> dict:
+    rollups = await db.status_rollups.find({"granularity": granularity}).to_list(None)
+    return {(rollup["client_name"], rollup["bucket"]): rollup["count"] for rollup in rollups}
+
+
+@pytest.fixture
+def closed_hour():
+    """Start of an hour two days back, well inside the raw-check retention"""
+    return bucket_start(datetime.utcnow() - timedelta(days=2), "hour")
+
+
+async def test_checks_are_counted_as_they_arrive(client, db):
+    for client_name in ("web", "web", "worker"):
+        assert (await client.post("/api/status", json={"client_name": client_name})).status_code == 200
+
+    page = (await client.get("/api/status/rollups", params={"granularity": "minute", "client_name": "web"})).json()
+    assert sum(item["count"] for item in page["items"]) == 2
+    assert sum((await _counts(db, "hour")).values()) == 3
+
+
+async def test_rebuild_matches_live_counting_across_chunks(db, closed_hour):
+    # Three days of checks for two clients, so the rebuild spans several chunks
+    timestamps = [closed_hour - timedelta(days=day, minutes=minute) for day in range(3) for minute in (1, 2, 2, 90)]
+    live = await _insert_checks(db, "web", timestamps) + await _insert_checks(db, "worker", timestamps[:3])
+    for document in live:
+        await record_status_check(db, document)
+    counted = {granularity: await _counts(db, granularity) for granularity in ("minute", "hour")}
+
+    await db.status_rollups.delete_many({})
+    report = await rebuild_rollups(db)
+
+    assert report == {"minutes": len(counted["minute"]), "hours": len(counted["hour"])}
+    for granularity in ("minute", "hour"):
+        assert await _counts(db, granularity) == counted[granularity]
+    # Repeating it changes nothing
+    assert await rebuild_rollups(db) == report
+    assert await _counts(db, "hour") == counted["hour"]
+
+
+async def test_rebuild_removes_stale_buckets_in_batches(db, closed_hour, monkeypatch):
+    monkeypatch.setattr(status_rollups, "ROLLUP_DELETE_BATCH_SIZE", 2)
+    await _insert_checks(db, "web", [closed_hour + timedelta(minutes=5)])
+    for minute in range(5):
+        await record_status_check(db, {"client_name": "gone", "timestamp": closed_hour - timedelta(hours=3) + timedelta(minutes=minute)})
+    deletes = []
+    delete_many = type(db.status_rollups).delete_many
+
+    async def counting_delete_many(collection, query_filter, *args, **kwargs):
+        deletes.append(len(query_filter["_id"]["$in"]))
+        return await delete_many(collection, query_filter, *args, **kwargs)
+
+    monkeypatch.setattr(type(db.status_rollups), "delete_many", counting_delete_many)
+    await rebuild_rollups(db)
+
+    assert set(await _counts(db, "minute")) == {("web", closed_hour + timedelta(minutes=5))}
+    assert set(await _counts(db, "hour")) == {("web", closed_hour)}
+    # Five stale minutes and one stale hour, never more than two ids per delete
+    assert sorted(deletes) == [1, 1, 2, 2]
+
+
+async def test_rebuild_leaves_the_open_hour_to_live_counting(db):
+    now = datetime.utcnow()
+    (counted,) = await _insert_checks(db, "web", [now])
+    await record_status_check(db, counted)
+    # Stored, but its rollup update has not landed yet
+    await _insert_checks(db, "web", [now])
+
+    await rebuild_rollups(db)
+
+    assert (await _counts(db, "hour"))[("web", bucket_start(now, "hour"))] == 1
+
+
+async def test_bootstrap_rebuilds_closed_hours_once(db, closed_hour):
+    now = datetime.utcnow()
+    await _insert_checks(db, "web", [closed_hour, now])
+
+    await bootstrap_rollups(db)
+
+    assert set(await _counts(db, "hour")) == {("web", closed_hour)}
+    assert await db.startup_tasks.find_one({"_id": "status_rollups"}) is not None
+
+    # Later checks are counted live; running bootstrap again does not touch them
+    await record_status_check(db, {"client_name": "web", "timestamp": now})
+    await _insert_checks(db, "web", [closed_hour + timedelta(minutes=1)])
+    await bootstrap_rollups(db)
+    hours = await _counts(db, "hour")
+    assert hours[("web", closed_hour)] == 1
+    assert hours[("web", bucket_start(now, "hour"))] == 1
+
+
+async def test_rollups_page_through_buckets(client, db, closed_hour):
+    await _insert_checks(db, "web", [closed_hour - timedelta(hours=hours) for hours in range(3)])
+    await rebuild_rollups(db)
+
+    seen, cursor = [], ""
+    while cursor is not None:
+        page = (await client.get("/api/status/rollups", params={"limit": 2, "cursor": cursor})).json()
+        seen += [item["bucket"] for item in page["items"]]
+        cursor = page["next_cursor"]
+
+    assert len(seen) == 3
+    assert seen == sorted(seen, reverse=True)
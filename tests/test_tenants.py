@@ -0,0 +1,108 @@
+import pytest
+
+from cache import TenantPortfolioCache, tenant_cache
+from indexes import ensure_indexes
+from models.portfolio import PortfolioData
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def portfolio_document(client):
+    body = (await client.get("/api/portfolio")).json()
+    return {key: value for key, value in body.items() if key not in ("id", "slug", "createdAt", "updatedAt")}
+
+
+def _tenant(document: dict, slug: str) -> PortfolioData:
+    return PortfolioData(**document, slug=slug)
+
+
+async def test_cache_evicts_least_recently_used_tenant(portfolio_document):
+    cache = TenantPortfolioCache(max_entries=2, ttl_seconds=60)
+    for slug in ("a", "b"):
+        cache.set(_tenant(portfolio_document, slug))
+    assert cache.get("a") is not None
+
+    cache.set(_tenant(portfolio_document, "c"))
+
+    assert cache.peek("b") is None
+    assert cache.peek("a") is not None and cache.peek("c") is not None
+    assert cache.evictions == 1
+
+
+async def test_cache_stays_within_its_byte_budget(portfolio_document):
+    probe = TenantPortfolioCache(ttl_seconds=60)
+    size = probe.set(_tenant(portfolio_document, "probe")).size
+    cache = TenantPortfolioCache(max_bytes=int(size * 2.5), ttl_seconds=60)
+
+    for slug in ("a", "b", "c", "d"):
+        cache.set(_tenant(portfolio_document, slug))
+        assert cache.bytes <= cache.max_bytes
+
+    assert cache.peek("d") is not None
+    assert cache.peek("a") is None
+    assert cache.evicted_bytes > 0
+
+
+async def test_oversized_portfolio_is_not_cached(portfolio_document):
+    cache = TenantPortfolioCache(max_bytes=10, ttl_seconds=60)
+    entry = cache.set(_tenant(portfolio_document, "big"))
+    assert entry.body
+    assert cache.peek("big") is None
+    assert cache.bytes == 0
+
+
+async def test_update_and_delete_refresh_the_cache(client, portfolio_document):
+    created = await client.post("/api/portfolios", json={**portfolio_document, "slug": "acme"})
+    assert created.status_code == 201
+    assert tenant_cache.peek("acme") is not None
+
+    personal = {**portfolio_document["personal"], "title": "Founder"}
+    updated = await client.put("/api/portfolios/acme", json={"personal": personal}, headers={"If-Match": created.headers["etag"]})
+    assert updated.status_code == 200
+    assert tenant_cache.peek("acme").portfolio.personal.title == "Founder"
+    assert (await client.get("/api/portfolios/acme")).json()["personal"]["title"] == "Founder"
+
+    assert (await client.delete("/api/portfolios/acme")).status_code == 200
+    assert tenant_cache.peek("acme") is None
+    assert (await client.get("/api/portfolios/acme")).status_code == 404
+
+
+async def test_duplicate_slug_conflicts(client, portfolio_document):
+    assert (await client.post("/api/portfolios", json={**portfolio_document, "slug": "acme"})).status_code == 201
+    assert (await client.post("/api/portfolios", json={**portfolio_document, "slug": "acme"})).status_code == 409
+
+
+async def test_default_portfolio_versions_do_not_collide_on_slug(client, portfolio_document):
+    for _ in range(2):
+        assert (await client.post("/api/portfolio", json=portfolio_document)).status_code == 200
+
+
+async def test_tenant_submissions_stay_out_of_default_views(client, portfolio_document, contact_form):
+    assert (await client.post("/api/portfolios", json={**portfolio_document, "slug": "acme"})).status_code == 201
+    tenant = (await client.post("/api/portfolios/acme/contact", json=contact_form)).json()
+    default = (await client.post("/api/contact", json={**contact_form, "message": "A different message for the default portfolio"})).json()
+
+    assert [item["id"] for item in (await client.get("/api/contact")).json()] == [default["id"]]
+    assert [item["id"] for item in (await client.get("/api/portfolios/acme/contact")).json()] == [tenant["id"]]
+    assert tenant["id"] not in (await client.get("/api/contact/export")).text
+
+    for source in ("counters", "aggregate"):
+        stats = (await client.get("/api/contact/stats", params={"source": source})).json()
+        assert stats["total"] == 1
+
+    bulk = await client.post("/api/contact/bulk-status", json={"updates": [{"id": tenant["id"], "status": "read"}]})
+    assert bulk.json()["matched"] == 0
+    scoped = await client.post("/api/contact/bulk-status", json={"updates": [{"id": tenant["id"], "status": "read"}], "tenant": "acme"})
+    assert scoped.json()["matched"] == 1
+
+
+async def test_status_queries_are_indexed_per_tenant(db):
+    await db.contact_submissions.create_index([("status", 1), ("submittedAt", -1), ("id", -1)], name="status_submittedAt_id")
+
+    report = await ensure_indexes(db, drop_extra=True)
+
+    indexes = await db.contact_submissions.index_information()
+    assert list(dict(indexes["tenant_status_submittedAt_id"]["key"]).items()) == [("tenant", 1), ("status", 1), ("submittedAt", -1), ("id", -1)]
+    # The status-first index it replaces is no longer declared
+    assert report["contact_submissions"]["dropped"] == ["status_submittedAt_id"]